@@ -16,6 +16,7 @@ pytest_plugins = [
     'pytest_plugins.markers',
     'pytest_plugins.metadata_markers',
     'pytest_plugins.settings_skip',
+    'pytest_plugins.settings_snapshot',
     'pytest_plugins.rerun_rp.rerun_rp',
     'pytest_plugins.fspath_plugins',
     'pytest_plugins.factory_collection',
@@ -26,6 +27,13 @@ pytest_plugins = [
     'pytest_plugins.select_random_tests',
     'pytest_plugins.capsule_n-minus',
     'pytest_plugins.upstream_pr',
+    'pytest_plugins.duration_scheduling',
+    'pytest_plugins.hammer_timing',
+    'pytest_plugins.remote_profiler',
+    'pytest_plugins.manifest_pool',
+    'pytest_plugins.entity_pool',
+    'pytest_plugins.ui_session_pool',
+    'pytest_plugins.entity_tracker',
     # Fixtures
     'pytest_fixtures.core.broker',
     'pytest_fixtures.core.sat_cap_factory',
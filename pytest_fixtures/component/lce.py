@@ -2,6 +2,7 @@
 import pytest
 
 from robottelo.constants import ENVIRONMENT
+from robottelo.utils.entity_pool import pooled_entity
 
 
 @pytest.fixture(scope='session')
@@ -12,13 +13,15 @@ def default_lce(session_target_sat):
 
 
 @pytest.fixture(scope='module')
-def module_lce(module_org, module_target_sat):
-    return module_target_sat.api.LifecycleEnvironment(organization=module_org).create()
+def module_lce(request, module_org, module_target_sat):
+    with pooled_entity(request, module_target_sat, 'lifecycle_environment', module_org) as lce:
+        yield lce
 
 
 @pytest.fixture
-def function_lce(function_org, target_sat):
-    return target_sat.api.LifecycleEnvironment(organization=function_org).create()
+def function_lce(request, function_org, target_sat):
+    with pooled_entity(request, target_sat, 'lifecycle_environment', function_org) as lce:
+        yield lce
 
 
 @pytest.fixture(scope='module')
@@ -1,10 +1,13 @@
 # Repository Fixtures
+from contextlib import ExitStack
+
 from fauxfactory import gen_string
 from nailgun.entity_mixins import call_entity_method_with_timeout
 import pytest
 
 from robottelo.config import settings
 from robottelo.constants import DEFAULT_ARCHITECTURE, DEFAULT_ORG, PRDS, REPOS, REPOSET
+from robottelo.utils.entity_pool import pooled_entity
 
 
 @pytest.fixture(scope='module')
@@ -23,13 +26,15 @@ def module_repo(module_repo_options, module_target_sat):
 
 
 @pytest.fixture
-def function_product(target_sat, function_org):
-    return target_sat.api.Product(organization=function_org).create()
+def function_product(request, target_sat, function_org):
+    with pooled_entity(request, target_sat, 'product', function_org) as product:
+        yield product
 
 
 @pytest.fixture(scope='module')
-def module_product(module_org, module_target_sat):
-    return module_target_sat.api.Product(organization=module_org).create()
+def module_product(request, module_org, module_target_sat):
+    with pooled_entity(request, module_target_sat, 'product', module_org) as product:
+        yield product
 
 
 @pytest.fixture(scope='module')
@@ -49,25 +54,23 @@ def module_rhst_repo(module_target_sat, module_sca_manifest_org, module_promoted
     cv = module_target_sat.api.ContentView(id=module_promoted_cv.id, repository=[rh_repo]).update(
         ["repository"]
     )
-    cv.publish()
-    cv = cv.read()
-    cv.version.sort(key=lambda version: version.id)
-    cv.version[-1].promote(data={'environment_ids': module_lce.id})
+    module_target_sat.api_factory.publish_promote(cv, [module_lce])
     return REPOS['rhst7']['id']
 
 
 @pytest.fixture
-def repo_setup(target_sat):
+def repo_setup(request, target_sat):
     """
     This fixture is used to create an organization, product, repository, and lifecycle environment
     and once the test case gets completed then it performs the teardown of that.
     """
     repo_name = gen_string('alpha')
-    org = target_sat.api.Organization().create()
-    product = target_sat.api.Product(organization=org).create()
-    repo = target_sat.api.Repository(name=repo_name, product=product).create()
-    lce = target_sat.api.LifecycleEnvironment(organization=org).create()
-    return {'org': org, 'product': product, 'repo': repo, 'lce': lce}
+    with ExitStack() as stack:
+        org = stack.enter_context(pooled_entity(request, target_sat, 'organization'))
+        product = stack.enter_context(pooled_entity(request, target_sat, 'product', org))
+        repo = target_sat.api.Repository(name=repo_name, product=product).create()
+        lce = stack.enter_context(pooled_entity(request, target_sat, 'lifecycle_environment', org))
+        yield {'org': org, 'product': product, 'repo': repo, 'lce': lce}
 
 
 @pytest.fixture(scope='module')
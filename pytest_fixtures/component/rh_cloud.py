@@ -1,8 +1,7 @@
-from manifester import Manifester
 import pytest
 
-from robottelo.config import settings
 from robottelo.constants import CAPSULE_REGISTRATION_OPTS
+from robottelo.utils.manifest_pool import get_manifest
 
 
 def enable_insights(host, satellite, org, activation_key):
@@ -44,7 +43,7 @@ def module_els_manifest():
     (golden_ticket) so we get a different allocation/export and avoid the Candlepin error
     'This subscription management application has already been imported by another owner'.
     """
-    with Manifester(manifest_category=settings.manifest.els_rhel_manifest) as manifest:
+    with get_manifest('els_rhel_manifest') as manifest:
         yield manifest
 
 
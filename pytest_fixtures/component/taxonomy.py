@@ -4,6 +4,8 @@ import pytest
 
 from robottelo.config import settings
 from robottelo.constants import DEFAULT_LOC, DEFAULT_ORG
+from robottelo.utils.entity_pool import pooled_entity
+from robottelo.utils.manifest_pool import get_manifest
 
 
 @pytest.fixture(scope='session')
@@ -33,13 +35,15 @@ def current_sat_location(target_sat):
 
 
 @pytest.fixture
-def function_org(target_sat):
-    return target_sat.api.Organization().create()
+def function_org(request, target_sat):
+    with pooled_entity(request, target_sat, 'organization') as org:
+        yield org
 
 
 @pytest.fixture(scope='module')
-def module_org(module_target_sat):
-    return module_target_sat.api.Organization().create()
+def module_org(request, module_target_sat):
+    with pooled_entity(request, module_target_sat, 'organization') as org:
+        yield org
 
 
 @pytest.fixture(scope='class')
@@ -50,8 +54,9 @@ def class_org(class_target_sat):
 
 
 @pytest.fixture(scope='module')
-def module_location(module_target_sat, module_org):
-    return module_target_sat.api.Location(organization=[module_org]).create()
+def module_location(request, module_target_sat, module_org):
+    with pooled_entity(request, module_target_sat, 'location', module_org) as location:
+        yield location
 
 
 @pytest.fixture(scope='class')
@@ -62,8 +67,9 @@ def class_location(class_target_sat, class_org):
 
 
 @pytest.fixture
-def function_location(target_sat):
-    return target_sat.api.Location().create()
+def function_location(request, target_sat):
+    with pooled_entity(request, target_sat, 'location') as location:
+        yield location
 
 
 @pytest.fixture
@@ -132,7 +138,7 @@ def class_els_sca_manifest_org(class_org, class_sca_els_manifest, class_target_s
 def session_sca_manifest():
     """Yields a manifest in entitlement mode with subscriptions determined by the
     `manifest_category.entitlement` setting in conf/manifest.yaml."""
-    with Manifester(manifest_category=settings.manifest.golden_ticket) as manifest:
+    with get_manifest('golden_ticket') as manifest:
         yield manifest
 
 
@@ -140,7 +146,7 @@ def session_sca_manifest():
 def module_extra_rhel_sca_manifest():
     """Yields a manifest in sca mode with subscriptions determined by the
     'manifest_category.extra_rhel_entitlement` setting in conf/manifest.yaml."""
-    with Manifester(manifest_category=settings.manifest.extra_rhel_entitlement) as manifest:
+    with get_manifest('extra_rhel_entitlement') as manifest:
         yield manifest
 
 
@@ -148,7 +154,7 @@ def module_extra_rhel_sca_manifest():
 def module_sca_manifest():
     """Yields a manifest in Simple Content Access mode with subscriptions determined by the
     `manifest_category.golden_ticket` setting in conf/manifest.yaml."""
-    with Manifester(manifest_category=settings.manifest.golden_ticket) as manifest:
+    with get_manifest('golden_ticket') as manifest:
         yield manifest
 
 
@@ -156,7 +162,7 @@ def module_sca_manifest():
 def class_sca_manifest():
     """Yields a manifest in Simple Content Access mode with subscriptions determined by the
     `manifest_category.golden_ticket` setting in conf/manifest.yaml."""
-    with Manifester(manifest_category=settings.manifest.golden_ticket) as manifest:
+    with get_manifest('golden_ticket') as manifest:
         yield manifest
 
 
@@ -164,7 +170,7 @@ def class_sca_manifest():
 def function_sca_manifest():
     """Yields a manifest in Simple Content Access mode with subscriptions determined by the
     `manifest_category.golden_ticket` setting in conf/manifest.yaml."""
-    with Manifester(manifest_category=settings.manifest.golden_ticket) as manifest:
+    with get_manifest('golden_ticket') as manifest:
         yield manifest
 
 
@@ -173,7 +179,7 @@ def second_function_sca_manifest():
     """Yields a manifest in Simple Content Access mode with subscriptions determined by the
     `manifest_category.golden_ticket` setting in conf/manifest.yaml.
     A different one than is used in `function_sca_manifest_org`."""
-    with Manifester(manifest_category=settings.manifest.golden_ticket) as manifest:
+    with get_manifest('golden_ticket') as manifest:
         yield manifest
 
 
@@ -181,7 +187,7 @@ def second_function_sca_manifest():
 def module_sca_els_manifest():
     """Yields a manifest in Simple Content Access mode with subscriptions determined by the
     `manifest_category.els_rhel_manifest` setting in conf/manifest.yaml."""
-    with Manifester(manifest_category=settings.manifest.els_rhel_manifest) as manifest:
+    with get_manifest('els_rhel_manifest') as manifest:
         yield manifest
 
 
@@ -189,7 +195,7 @@ def module_sca_els_manifest():
 def class_sca_els_manifest():
     """Yields a manifest in Simple Content Access mode with subscriptions determined by the
     `manifest_category.els_rhel_manifest` setting in conf/manifest.yaml."""
-    with Manifester(manifest_category=settings.manifest.els_rhel_manifest) as manifest:
+    with get_manifest('els_rhel_manifest') as manifest:
         yield manifest
 
 
@@ -197,7 +203,7 @@ def class_sca_els_manifest():
 def function_sca_els_manifest():
     """Yields a manifest in Simple Content Access mode with subscriptions determined by the
     `manifest_category.els_rhel_manifest` setting in conf/manifest.yaml."""
-    with Manifester(manifest_category=settings.manifest.els_rhel_manifest) as manifest:
+    with get_manifest('els_rhel_manifest') as manifest:
         yield manifest
 
 
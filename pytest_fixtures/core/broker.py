@@ -1,4 +1,5 @@
 from contextlib import contextmanager
+from functools import lru_cache
 
 from box import Box
 from broker import Broker
@@ -21,6 +22,12 @@ def _default_sat(align_to_satellite):
     return None
 
 
+@lru_cache
+def _rebalanced_sat(hostname):
+    """Returns a Satellite object for a worker rebalanced by the load-aware xdist behavior"""
+    return Satellite.get_host_by_hostname(hostname)
+
+
 @contextmanager
 def _target_sat_imp(request, _default_sat, satellite_factory):
     """This is the actual working part of the following target_sat fixtures"""
@@ -35,9 +42,12 @@ def _target_sat_imp(request, _default_sat, satellite_factory):
         settings.set('server.hostname', installer_sat.hostname)
         yield installer_sat
     else:
-        if _default_sat:
-            _default_sat.enable_satellite_ipv6_http_proxy()
-        yield _default_sat
+        sat = _default_sat
+        if sat and settings.server.hostname not in (None, sat.hostname):
+            sat = _rebalanced_sat(settings.server.hostname)
+        if sat:
+            sat.enable_satellite_ipv6_http_proxy()
+        yield sat
 
 
 @pytest.fixture
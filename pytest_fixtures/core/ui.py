@@ -2,8 +2,10 @@ from fauxfactory import gen_string
 import pytest
 from requests.exceptions import HTTPError
 
+from pytest_plugins.ui_session_pool import phase_report_key
 from robottelo.hosts import Satellite
 from robottelo.logging import logger
+from robottelo.utils.ui_session_pool import activate_ui_session_pool, get_ui_session_pool
 
 
 @pytest.fixture(scope='module')
@@ -43,6 +45,28 @@ def ui_user(request, module_org, module_location, module_target_sat):
         logger.warning('Unable to delete session user: %s', str(err))
 
 
+@pytest.fixture(scope='module', autouse=True)
+def ui_session_pool(request):
+    """Reuse the logged-in UI sessions between the tests of the module, when the
+    ``ui.session_pool.enabled`` setting is set.
+
+    The sessions are leased by :meth:`robottelo.hosts.Satellite.ui_session`, and closed at the
+    end of the module.
+    """
+    with activate_ui_session_pool(request.module.__name__) as pool:
+        yield pool
+
+
+def _ui_session(request, target_sat, test_name, ui_user):
+    """Yield the UI session of the module user, the pooled session of a failed test is discarded
+    since the fixture does not see the exception of the test"""
+    with target_sat.ui_session(test_name, ui_user.login, ui_user.password) as session:
+        yield session
+        report = request.node.stash.get(phase_report_key, {}).get('call')
+        if report is not None and report.failed and (pool := get_ui_session_pool()) is not None:
+            pool.discard(session)
+
+
 @pytest.fixture
 def session(target_sat, test_name, ui_user, request):
     """Session fixture which automatically initializes (but does not start!)
@@ -57,8 +81,7 @@ def session(target_sat, test_name, ui_user, request):
                 session.architecture.create({'name': 'bar'})
 
     """
-    with target_sat.ui_session(test_name, ui_user.login, ui_user.password) as session:
-        yield session
+    yield from _ui_session(request, target_sat, test_name, ui_user)
 
 
 @pytest.fixture
@@ -76,8 +99,7 @@ def autosession(target_sat, test_name, ui_user, request):
             autosession.architecture.create({'name': 'bar'})
 
     """
-    with target_sat.ui_session(test_name, ui_user.login, ui_user.password) as started_session:
-        yield started_session
+    yield from _ui_session(request, target_sat, test_name, ui_user)
 
 
 @pytest.fixture(autouse=True)
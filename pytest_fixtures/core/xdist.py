@@ -8,6 +8,37 @@ import pytest
 from robottelo.config import configure_airgun, configure_nailgun, settings
 from robottelo.hosts import ContentHost, Satellite
 from robottelo.logging import logger
+from robottelo.utils.satellite_load import SatelliteLoadBalancer
+
+load_balancer_key = pytest.StashKey[SatelliteLoadBalancer]()
+# the session scoped fixtures set up for the Satellite of the worker, a rebalanced worker would
+# mix them with the entities of another Satellite
+satellite_bound_fixtures_key = pytest.StashKey[set]()
+# the fixture of the Satellite the worker was aligned to
+SATELLITE_FIXTURE = '_default_sat'
+
+
+def _load_aware_hostname(request, worker_id):
+    """Align the worker to the least loaded Satellite, return None if that is not possible"""
+    try:
+        load_balancer = SatelliteLoadBalancer(settings.server.hostnames)
+        hostname = load_balancer.assign(worker_id)
+    except Exception as err:
+        logger.warning(f'{worker_id=}: Unable to align to a Satellite based on load: {err}')
+        return None
+    request.session.stash[load_balancer_key] = load_balancer
+    return hostname
+
+
+def pytest_fixture_setup(fixturedef, request):
+    """Record the session scoped fixtures depending on the Satellite of the worker while they are
+    set up"""
+    if fixturedef.scope not in ('session', 'package'):
+        return
+    bound = request.session.stash.setdefault(satellite_bound_fixtures_key, set())
+    if bound.intersection(fixturedef.argnames) or SATELLITE_FIXTURE in fixturedef.argnames:
+        bound.add(fixturedef.argname)
+        fixturedef.addfinalizer(lambda: bound.discard(fixturedef.argname))
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -46,6 +77,12 @@ def align_to_satellite(request, worker_id, satellite_factory):
         # attempt to align a worker to a satellite
         if settings.server.xdist_behavior == 'run-on-one' and settings.server.hostnames:
             settings.set("server.hostname", settings.server.hostnames[0])
+        elif settings.server.xdist_behavior == 'load-aware' and settings.server.hostnames:
+            hostname = _load_aware_hostname(request, worker_id)
+            if not hostname:
+                logger.info(f'{worker_id=}: Falling back to balance behavior')
+                hostname = random.choice(settings.server.hostnames)
+            settings.set("server.hostname", hostname)
         elif settings.server.hostnames and worker_pos < len(settings.server.hostnames):
             settings.set("server.hostname", settings.server.hostnames[worker_pos])
         elif settings.server.xdist_behavior == 'balance' and settings.server.hostnames:
@@ -67,7 +104,45 @@ def align_to_satellite(request, worker_id, satellite_factory):
             configure_airgun()
             configure_nailgun()
         yield
+        if load_balancer := request.session.stash.get(load_balancer_key, None):
+            load_balancer.release(worker_id)
         if on_demand_sat and settings.server.auto_checkin:
             logger.info(f'{worker_id=}: Checking in on-demand Satellite {on_demand_sat.hostname}')
             on_demand_sat.teardown()
             Broker(hosts=[on_demand_sat]).checkin()
+
+
+@pytest.fixture(scope="module", autouse=True)
+def rebalance_satellite(request, worker_id, align_to_satellite):
+    """Re-align the worker to the least loaded Satellite at the start of each test module
+
+    Only used with the load-aware xdist behavior, when rebalancing per module is enabled, and as
+    long as no session scoped fixture depending on the Satellite of the worker is set up.
+    """
+    load_balancer = request.session.stash.get(load_balancer_key, None)
+    if not load_balancer or not settings.server.load_balancing.rebalance_per_module:
+        return
+    if bound := request.session.stash.get(satellite_bound_fixtures_key, None):
+        logger.debug(
+            f'{worker_id=}: Worker is not rebalanced, the session fixtures '
+            f'{", ".join(sorted(bound))} use {settings.server.hostname}'
+        )
+        return
+    hostname = load_balancer.assign(worker_id)
+    if hostname != settings.server.hostname:
+        logger.info(f'{worker_id=}: Worker was rebalanced to hostname {hostname}')
+        settings.set("server.hostname", hostname)
+        configure_airgun()
+        configure_nailgun()
+
+
+@pytest.fixture(autouse=True)
+def track_satellite_load(request, worker_id, align_to_satellite):
+    """Record the in-flight test of the worker for the load-aware xdist behavior"""
+    load_balancer = request.session.stash.get(load_balancer_key, None)
+    if not load_balancer:
+        yield
+        return
+    load_balancer.test_started(worker_id)
+    yield
+    load_balancer.test_finished(worker_id)
@@ -0,0 +1,148 @@
+"""Pytest plugin ordering the test collection based on recorded test durations.
+
+When enabled, the setup, call and teardown durations of every test are recorded in the pytest
+cache at the end of the session. The setup duration of the first test of a module includes the
+cost of its module scoped fixtures, so the sum of the durations of the tests of a module is a good
+estimate of the module cost.
+
+On the next run, test modules are ordered by decreasing cost (longest processing time first),
+while the tests of a module are kept together and in their original order. Combined with the
+``loadscope`` or ``loadfile`` xdist distribution modes, the longest modules are handed out first
+and the short ones fill the gaps at the end of the run, which reduces the total run time.
+
+Usage:
+    pytest tests/foreman -n 8 --dist loadfile --duration-scheduling
+"""
+
+from collections import defaultdict
+import heapq
+from statistics import median
+
+import pytest
+
+from robottelo.logging import collection_logger as logger
+
+DURATIONS_CACHE_KEY = 'robottelo/durations'
+# weight of the latest run when merging it with the recorded durations
+SMOOTHING_FACTOR = 0.5
+
+
+def pytest_addoption(parser):
+    """Add --duration-scheduling option to order tests by their recorded durations"""
+    parser.addoption(
+        '--duration-scheduling',
+        action='store_true',
+        default=False,
+        help='Record test durations in the pytest cache and order the test modules by '
+        'decreasing recorded duration, to reduce the run time when used with xdist.',
+    )
+
+
+def module_id(nodeid):
+    """Return the module part of a test node id"""
+    return nodeid.split('::', 1)[0]
+
+
+def item_duration(durations, nodeid, default):
+    """Return the total recorded duration of a test, or the default when it was never recorded"""
+    if phases := durations.get(nodeid):
+        return sum(phases.values())
+    return default
+
+
+def order_items(items, durations):
+    """Order test items by decreasing module duration, keeping modules together
+
+    Tests without recorded durations are estimated with the median of the recorded ones.
+
+    :param list items: the collected test items
+    :param dict durations: recorded phase durations per node id
+    :return: a tuple of the ordered items and a dict of the module costs
+    """
+    recorded = [sum(phases.values()) for phases in durations.values() if phases]
+    default = median(recorded) if recorded else 0
+    modules = defaultdict(list)
+    for item in items:
+        modules[module_id(item.nodeid)].append(item)
+    costs = {
+        module: sum(item_duration(durations, item.nodeid, default) for item in module_items)
+        for module, module_items in modules.items()
+    }
+    # sorted() is stable, modules with the same cost keep their collection order
+    ordered = sorted(modules, key=lambda module: costs[module], reverse=True)
+    return [item for module in ordered for item in modules[module]], costs
+
+
+def estimate_makespan(costs, workers):
+    """Estimate the run time of modules handed out in order to the first free worker"""
+    loads = [0.0] * max(workers, 1)
+    for cost in costs:
+        heapq.heappush(loads, heapq.heappop(loads) + cost)
+    return max(loads)
+
+
+def merge_durations(recorded, latest):
+    """Merge the durations of the latest run into the recorded ones"""
+    merged = dict(recorded)
+    for nodeid, phases in latest.items():
+        previous = recorded.get(nodeid, {})
+        merged[nodeid] = {
+            phase: (
+                SMOOTHING_FACTOR * duration + (1 - SMOOTHING_FACTOR) * previous[phase]
+                if phase in previous
+                else duration
+            )
+            for phase, duration in phases.items()
+        }
+    return merged
+
+
+class DurationRecorder:
+    """Record the duration of each test phase and store them at the end of the session
+
+    With xdist, the reports of the workers are also processed by the controller, so this is only
+    registered on the controller.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.durations = {}
+
+    def pytest_runtest_logreport(self, report):
+        self.durations.setdefault(report.nodeid, {})[report.when] = report.duration
+
+    def pytest_sessionfinish(self, session):
+        if not self.durations:
+            return
+        recorded = self.config.cache.get(DURATIONS_CACHE_KEY, {})
+        self.config.cache.set(DURATIONS_CACHE_KEY, merge_durations(recorded, self.durations))
+        logger.info(f'Recorded the durations of {len(self.durations)} tests')
+
+
+def pytest_configure(config):
+    """Register the duration recorder on the controller when duration scheduling is enabled"""
+    if (
+        config.getoption('duration_scheduling', False)
+        and config.cache is not None
+        and not hasattr(config, 'workerinput')
+    ):
+        config.pluginmanager.register(DurationRecorder(config), 'duration_recorder')
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(session, items, config):
+    """Order the collected tests by decreasing recorded module duration"""
+    if not config.getoption('duration_scheduling') or config.cache is None:
+        return
+    if not (durations := config.cache.get(DURATIONS_CACHE_KEY, {})):
+        logger.info('No recorded test durations, the collection order is kept')
+        return
+    ordered, costs = order_items(items, durations)
+    items[:] = ordered
+    workers = getattr(config.option, 'numprocesses', None) or 1
+    if isinstance(workers, int):
+        makespan = estimate_makespan(sorted(costs.values(), reverse=True), workers)
+        logger.info(
+            f'Ordered {len(costs)} test modules by recorded duration, '
+            f'estimated run time with {workers} worker(s): {makespan:.0f}s'
+        )
@@ -0,0 +1,24 @@
+"""Pytest plugin deleting the entities of :mod:`robottelo.utils.entity_pool` at the end of the
+session.
+
+Enabled by ``performance.entity_pool.enabled``. Every process deletes the organizations and
+locations created by its pools, in bulk, and logs how many leases were served by recycled
+entities.
+"""
+
+from robottelo.config import settings
+from robottelo.logging import logger
+from robottelo.utils.entity_pool import collect_entity_pools
+
+
+def pytest_sessionfinish(session):
+    """Garbage-collect the pooled entities of this process"""
+    if not settings.performance.entity_pool.enabled:
+        return
+    for hostname, report in collect_entity_pools().items():
+        for kind, stats in report['kinds'].items():
+            logger.info(
+                f'Entity pool of {hostname}: {stats["recycled"]} of {stats["leases"]} {kind} '
+                f'leases recycled, {stats["discarded"]} discarded'
+            )
+        logger.info(f'Entity pool of {hostname}: {report["deleted"]} entities deleted')
@@ -0,0 +1,116 @@
+"""Pytest plugin deleting the entities recorded by :mod:`robottelo.utils.entity_tracker`.
+
+Enabled by ``performance.entity_tracker.enabled``. Every process deletes the entities created by
+a test module after its last test, or at the end of the session for the entities of the session
+fixtures and with ``performance.entity_tracker.scope: session``, then removes the orphaned content
+of its Satellites. The xdist controller reports the entities created and deleted by every module.
+"""
+
+from contextlib import nullcontext
+
+import pytest
+from xdist import is_xdist_worker
+
+from robottelo.config import settings
+from robottelo.logging import logger
+from robottelo.utils.entity_tracker import (
+    fixture_scope,
+    get_entity_trackers,
+    get_report_state,
+    set_module,
+    untracked,
+)
+
+REPORT_COUNTS = ('created', 'deleted', 'gone', 'failed')
+
+
+def _module(item):
+    return item.nodeid.split('::')[0]
+
+
+def _keeps_entities(item):
+    """Whether the entities created by the test are used after the session, by the post upgrade
+    tests"""
+    return item.get_closest_marker('pre_upgrade') is not None or 'save_test_data' in getattr(
+        item, 'fixturenames', ()
+    )
+
+
+def _save_reports(reports):
+    with get_report_state().update() as data:
+        for module, report in reports.items():
+            saved = data.setdefault(module, {**dict.fromkeys(REPORT_COUNTS, 0), 'db_growth': None})
+            for count in REPORT_COUNTS:
+                saved[count] += report[count]
+            if report['db_growth'] is not None:
+                saved['db_growth'] = (saved['db_growth'] or 0) + report['db_growth']
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_fixture_setup(fixturedef, request):
+    """Record the entities created by the fixture for its scope"""
+    with fixture_scope(fixturedef.scope):
+        yield
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item, nextitem):
+    """Delete the entities of the module after its last test"""
+    module = _module(item)
+    set_module(module)
+    with untracked() if _keeps_entities(item) else nullcontext():
+        yield
+    if (
+        not settings.performance.entity_tracker.enabled
+        or settings.performance.entity_tracker.scope != 'module'
+        or (nextitem is not None and _module(nextitem) == module)
+    ):
+        return
+    reports = {}
+    for tracker in get_entity_trackers():
+        tracker.collect(module)
+        if report := tracker.report(module):
+            reports[module] = report
+    if reports:
+        _save_reports(reports)
+
+
+def pytest_sessionfinish(session):
+    """Delete the remaining entities, and the orphaned content of the Satellites"""
+    if not settings.performance.entity_tracker.enabled:
+        return
+    reports = {}
+    for tracker in get_entity_trackers():
+        tracker.collect()
+        for module in list(tracker.stats):
+            reports[module] = tracker.report(module)
+        if settings.performance.entity_tracker.orphan_cleanup:
+            try:
+                tracker.satellite.run_orphan_cleanup()
+            except Exception as err:
+                logger.warning(
+                    f'Unable to clean up the orphaned content of {tracker.hostname}: {err}'
+                )
+    if reports:
+        _save_reports(reports)
+
+
+def pytest_terminal_summary(terminalreporter):
+    """Report the entities created and deleted by every module"""
+    if not settings.performance.entity_tracker.enabled or is_xdist_worker(terminalreporter):
+        return
+    state = get_report_state()
+    reports = state.read()
+    # the reports of a run without xdist share the same run id, they must not leak to the next run
+    state.clear()
+    if not reports:
+        return
+    terminalreporter.section('entity tracker')
+    for module, report in sorted(reports.items()):
+        line = (
+            f'{module}: {report["created"]} created, {report["deleted"]} deleted, '
+            f'{report["gone"]} already deleted, {report["failed"]} failed'
+        )
+        if report['db_growth'] is not None:
+            line += f', database growth {report["db_growth"] / 2**20:.1f} MiB'
+        terminalreporter.write_line(line)
@@ -0,0 +1,22 @@
+"""Pytest plugin reporting the timings of hammer commands.
+
+Enabled by ``settings.performance.time_hammer``. The timings recorded by
+:mod:`robottelo.cli.timing` in each xdist worker are aggregated by the controller at the end of the
+session, and written to ``logs/hammer_timing.json`` and ``logs/hammer_timing.html``.
+"""
+
+from xdist import is_xdist_worker
+
+from robottelo.cli import timing
+from robottelo.config import settings
+from robottelo.logging import robottelo_log_dir
+
+
+def pytest_sessionfinish(session):
+    """Share the timings of this process and write the report on the controller"""
+    if not settings.performance.time_hammer:
+        return
+    timing.dump_records()
+    if not is_xdist_worker(session):
+        summary = timing.summarize(timing.load_records())
+        timing.write_report(summary, robottelo_log_dir.joinpath('hammer_timing'))
@@ -7,7 +7,10 @@ from xdist import is_xdist_worker
 
 from robottelo.logging import (
     DEFAULT_DATE_FORMAT,
+    disable_queue_logging,
+    enable_queue_logging,
     logger,
+    logging_yaml,
     robottelo_log_dir,
     robottelo_log_file,
 )
@@ -25,6 +28,8 @@ def configure_logging(request, worker_id):
     a logfile named 'robottelo_gw{worker_id}.log' will be created.
 
     Add a handler for ReportPortal logging
+
+    When enabled in logging.yaml, move the handlers behind a queue written by a background thread
     """
     worker_formatter = logzero.LogFormatter(
         fmt=f'%(asctime)s - {worker_id} - %(name)s - %(levelname)s - %(message)s',
@@ -59,6 +64,15 @@ def configure_logging(request, worker_id):
             rp_handler.setFormatter(worker_formatter)
             # logger.addHandler(rp_handler)
 
+    if (logging_yaml.get('queue') or {}).get('enabled'):
+        enable_queue_logging()
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_sessionfinish(session):
+    """Write the queued log records before the session ends"""
+    disable_queue_logging()
+
 
 def pytest_runtest_logstart(nodeid, location):
     logger.info(f'Started Test: {nodeid}')
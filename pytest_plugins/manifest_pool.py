@@ -0,0 +1,39 @@
+"""Pytest plugin maintaining the manifest pool of :mod:`robottelo.utils.manifest_pool`.
+
+Enabled by ``manifest.pool.enabled``. Every process waits for its background refills at the end of
+the session, then the xdist controller retires the expired manifests of the pool and reports the
+hit rate and the wait time of the leases of the run.
+"""
+
+from xdist import is_xdist_worker
+
+from robottelo.config import settings
+from robottelo.utils.manifest_pool import get_manifest_pool
+
+
+def pytest_sessionfinish(session):
+    """Wait for the manifests generated in background, so they are not left half written"""
+    if settings.manifest.pool.enabled:
+        get_manifest_pool().join()
+
+
+def pytest_terminal_summary(terminalreporter):
+    """Retire the expired manifests and report the manifest leases of the run"""
+    if not settings.manifest.pool.enabled or is_xdist_worker(terminalreporter):
+        return
+    pool = get_manifest_pool()
+    retired = pool.retire_expired()
+    report = pool.report()
+    # the stats of a run without xdist share the same run id, they must not leak to the next run
+    pool.stats.clear()
+    if not report and not retired:
+        return
+    terminalreporter.section('manifest pool')
+    for category, stats in sorted(report.items()):
+        terminalreporter.write_line(
+            f'{category}: {stats["leases"]} leases, hit rate {stats["hit_rate"]:.0%}, '
+            f'{stats["generated"]} generated, wait mean {stats["wait_mean"]:.1f}s '
+            f'max {stats["wait_max"]:.1f}s'
+        )
+    if retired:
+        terminalreporter.write_line(f'{retired} expired manifests retired')
@@ -26,6 +26,7 @@ def pytest_configure(config):
         "no_compose : Skip the marked sanity test for nightly compose",
         "network: Restrict test to specific network environments",
         "foremanctl: Tests that require foremanctl",
+        "fresh_entities: Create new entities instead of leasing recycled ones from the entity pool",
     ]
     markers.extend(module_markers())
     for marker in markers:
@@ -0,0 +1,203 @@
+"""Pytest plugin profiling the remote calls made by each test.
+
+With ``--profile-remote-calls``, the following entry points are wrapped, and the number of calls,
+the cumulative latency and the bytes received are accounted per test and per channel:
+
+* ``ssh``: :meth:`robottelo.hosts.ContentHost.execute` and :func:`robottelo.ssh.command`
+* ``hammer``: :meth:`robottelo.cli.base.Base.execute`
+* ``rest``: the request functions of :mod:`nailgun.client`
+* ``broker``: :meth:`broker.Broker.checkout` and :meth:`broker.Broker.checkin`
+
+Nested calls are only accounted to the outermost channel, e.g. the SSH command run by a hammer
+call counts as ``hammer``. The results are published as ``remote_<channel>_<metric>`` entries of
+``item.user_properties``, so they show up in junit and ReportPortal, and the slowest tests of each
+channel are listed at the end of the session.
+
+Usage:
+    pytest tests/foreman/api/test_host.py --profile-remote-calls
+"""
+
+import functools
+import inspect
+import threading
+import time
+
+import pytest
+
+CHANNELS = ('ssh', 'hammer', 'rest', 'broker')
+METRICS = ('count', 'time', 'bytes')
+NAILGUN_REQUEST_FUNCTIONS = ('request', 'head', 'get', 'post', 'put', 'patch', 'delete')
+SUMMARY_SIZE = 10
+
+
+def pytest_addoption(parser):
+    """Add --profile-remote-calls option to profile SSH, hammer, REST and Broker calls"""
+    parser.addoption(
+        '--profile-remote-calls',
+        action='store_true',
+        default=False,
+        help='Record the count, cumulative latency and bytes of the SSH, hammer, REST and '
+        'Broker calls of each test in the test user properties, and report the slowest tests.',
+    )
+
+
+def result_size(result):
+    """Return the number of bytes received for a remote call result, None if unknown"""
+    if isinstance(result, str | bytes):
+        return len(result)
+    if isinstance(content := getattr(result, 'content', None), bytes):
+        return len(content)
+    stdout, stderr = getattr(result, 'stdout', None), getattr(result, 'stderr', None)
+    if isinstance(stdout, str | bytes):
+        return len(stdout) + (len(stderr) if isinstance(stderr, str | bytes) else 0)
+    return None
+
+
+class RemoteCallProfiler:
+    """Account the remote calls made through the wrapped functions"""
+
+    def __init__(self):
+        self.stats = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._patches = []
+
+    def _stack(self):
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    def _add(self, channel, elapsed, size):
+        with self._lock:
+            stats = self.stats.setdefault(channel, dict.fromkeys(METRICS, 0))
+            stats['count'] += 1
+            stats['time'] += elapsed
+            stats['bytes'] += size
+
+    def reset(self):
+        """Return the stats accounted since the last reset, and start again from scratch"""
+        with self._lock:
+            stats, self.stats = self.stats, {}
+        return stats
+
+    def wrap(self, channel, func):
+        """Return a wrapper accounting the calls of ``func`` to ``channel``"""
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            stack = self._stack()
+            # bytes received by the nested profiled calls
+            stack.append(0)
+            result = None
+            start = time.monotonic()
+            try:
+                result = func(*args, **kwargs)
+            finally:
+                elapsed = time.monotonic() - start
+                nested_size = stack.pop()
+                size = result_size(result)
+                size = nested_size if size is None else size
+                if stack:
+                    stack[-1] += size
+                else:
+                    self._add(channel, elapsed, size)
+            return result
+
+        return wrapper
+
+    def patch(self, owner, name, channel):
+        """Replace ``owner.name`` with a profiled wrapper, keeping classmethods as such"""
+        original = inspect.getattr_static(owner, name)
+        if isinstance(original, classmethod):
+            wrapped = classmethod(self.wrap(channel, original.__func__))
+        else:
+            wrapped = self.wrap(channel, original)
+        self._patches.append((owner, name, original, name in vars(owner)))
+        setattr(owner, name, wrapped)
+
+    def install(self):
+        """Wrap all the supported remote call entry points"""
+        from broker import Broker
+        from nailgun import client
+
+        from robottelo import ssh
+        from robottelo.cli.base import Base
+        from robottelo.hosts import ContentHost
+
+        self.patch(ContentHost, 'execute', 'ssh')
+        self.patch(ssh, 'command', 'ssh')
+        self.patch(Base, 'execute', 'hammer')
+        for name in NAILGUN_REQUEST_FUNCTIONS:
+            self.patch(client, name, 'rest')
+        self.patch(Broker, 'checkout', 'broker')
+        self.patch(Broker, 'checkin', 'broker')
+
+    def uninstall(self):
+        """Restore all the wrapped functions"""
+        while self._patches:
+            owner, name, original, owned = self._patches.pop()
+            if owned:
+                setattr(owner, name, original)
+            else:
+                delattr(owner, name)
+
+
+def stats_to_properties(stats):
+    """Convert the stats of a test to user properties"""
+    return [
+        (f'remote_{channel}_{metric}', round(stats[channel][metric], 3))
+        for channel in CHANNELS
+        if channel in stats
+        for metric in METRICS
+    ]
+
+
+class RemoteCallProfilerPlugin:
+    """Attach the remote call stats to each test and summarize them at the end of the session"""
+
+    def __init__(self, profiler):
+        self.profiler = profiler
+        # channel -> list of (time, count, nodeid)
+        self.results = {channel: [] for channel in CHANNELS}
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item):
+        self.profiler.reset()
+        yield
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        # properties must be set before the teardown report is made, junit reads them from it
+        if call.when == 'teardown':
+            item.user_properties.extend(stats_to_properties(self.profiler.reset()))
+        yield
+
+    def pytest_runtest_logreport(self, report):
+        # with xdist, the stats of the workers are received through the reports properties
+        if report.when != 'teardown':
+            return
+        properties = dict(report.user_properties)
+        for channel in CHANNELS:
+            if (elapsed := properties.get(f'remote_{channel}_time')) is not None:
+                count = properties[f'remote_{channel}_count']
+                self.results[channel].append((elapsed, count, report.nodeid))
+
+    def pytest_terminal_summary(self, terminalreporter):
+        terminalreporter.write_sep('=', 'slowest tests by remote call channel')
+        for channel, results in self.results.items():
+            if not results:
+                continue
+            terminalreporter.write_line(f'{channel} (total {sum(r[0] for r in results):.2f}s):')
+            for elapsed, count, nodeid in sorted(results, reverse=True)[:SUMMARY_SIZE]:
+                terminalreporter.write_line(f'  {elapsed:10.2f}s {count:6} calls  {nodeid}')
+
+    def pytest_unconfigure(self, config):
+        self.profiler.uninstall()
+
+
+def pytest_configure(config):
+    """Install the remote call profiler when --profile-remote-calls is used"""
+    if config.getoption('profile_remote_calls', False):
+        profiler = RemoteCallProfiler()
+        profiler.install()
+        config.pluginmanager.register(RemoteCallProfilerPlugin(profiler), 'remote_call_profiler')
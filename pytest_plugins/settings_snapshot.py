@@ -0,0 +1,45 @@
+"""Pytest plugin sharing the settings validated by the xdist controller with its workers.
+
+Resolving the settings (YAML files, includes, environment variables, vault secrets and hooks) and
+validating them is slow, and would otherwise be done again by every xdist worker. The controller
+writes its validated settings to a snapshot file before the workers are started, and the workers
+load it on the first access of ``robottelo.config.settings``. The settings of each worker remain
+independent afterwards, so per-worker overrides like ``server.hostname`` still work.
+
+The snapshot can be disabled with ``robottelo.settings.share_snapshot``.
+"""
+
+import os
+from pathlib import Path
+import tempfile
+
+import pytest
+
+from robottelo.config import SETTINGS_SNAPSHOT_ENV, settings
+from robottelo.logging import logger
+from robottelo.utils.shared_state import get_state_dir
+
+snapshot_path_key = pytest.StashKey[Path]()
+
+
+def pytest_configure(config):
+    """Write the settings snapshot on the xdist controller, before the workers are started"""
+    if hasattr(config, 'workerinput') or not getattr(config.option, 'numprocesses', None):
+        return
+    if not settings.robottelo.settings.get('share_snapshot', True):
+        return
+    # the snapshot holds secrets, mkstemp makes it readable by the current user only
+    fd, path = tempfile.mkstemp(prefix='settings_snapshot-', suffix='.pickle', dir=get_state_dir())
+    os.close(fd)
+    path = Path(path)
+    settings.write_snapshot(path)
+    os.environ[SETTINGS_SNAPSHOT_ENV] = str(path)
+    config.stash[snapshot_path_key] = path
+    logger.info(f'Settings snapshot for the xdist workers written to {path}')
+
+
+def pytest_unconfigure(config):
+    """Remove the settings snapshot at the end of the run"""
+    if path := config.stash.get(snapshot_path_key, None):
+        os.environ.pop(SETTINGS_SNAPSHOT_ENV, None)
+        path.unlink(missing_ok=True)
@@ -0,0 +1,45 @@
+"""Pytest plugin reporting the reuses of the UI session pool of
+:mod:`robottelo.utils.ui_session_pool`.
+
+Enabled by ``ui.session_pool.enabled``. The reports of every test phase are stashed on the test
+item, for the UI session fixtures to discard the pooled session of a failed test. The xdist
+controller reports, by test module, how many UI sessions were reused and the browser startup and
+login time saved.
+"""
+
+import pytest
+from xdist import is_xdist_worker
+
+from robottelo.config import settings
+from robottelo.utils.ui_session_pool import get_report_state
+
+# the reports of the phases of a test item, by phase
+phase_report_key = pytest.StashKey[dict]()
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """Stash the report of the test phase on the item"""
+    outcome = yield
+    report = outcome.get_result()
+    item.stash.setdefault(phase_report_key, {})[report.when] = report
+
+
+def pytest_terminal_summary(terminalreporter):
+    """Report the UI session reuses of the run"""
+    if not settings.ui.session_pool.enabled or is_xdist_worker(terminalreporter):
+        return
+    state = get_report_state()
+    reports = state.read()
+    # the reports of a run without xdist share the same run id, they must not leak to the next run
+    state.clear()
+    if not reports:
+        return
+    terminalreporter.section('UI session pool')
+    for module, report in sorted(reports.items()):
+        terminalreporter.write_line(
+            f'{module}: {report["reuses"]} of {report["leases"]} sessions reused, '
+            f'{report["recycled"]} recycled, {report["saved_time"]:.1f}s saved'
+        )
+    saved = sum(report['saved_time'] for report in reports.values())
+    terminalreporter.write_line(f'total startup and login time saved: {saved:.1f}s')
@@ -8,34 +8,33 @@ Usage:
 
 Configuration:
     Requires settings.github_repos configuration with repository mappings and file-to-component rules.
+
+The files of a PR are cached in robottelo.tmp_dir by repository, PR number and head commit, so
+collecting the tests again does not list them again until the PR changes.
 """
 
+from concurrent.futures import ThreadPoolExecutor
+import json
+import os
+from pathlib import Path
 import re
 
 from github import Auth, Github
 from github.GithubException import GithubException
 
-from robottelo.config import settings
+from robottelo.config import get_robottelo_tmp_dir, settings
 from robottelo.logging import collection_logger as logger
 
+CACHE_DIR = 'upstream_pr'
+# files listed per request, the maximum of the GitHub API
+FILES_PER_PAGE = 100
+# PRs fetched at the same time
+MAX_WORKERS = 8
+# numbered and named backreferences, their groups are shifted or shared in the combined regex
+BACKREFERENCE_REGEX = re.compile(r'\\[1-9]|\(\?P=')
 
-def match_file_to_rule(filename, rule):
-    """File matching using regex patterns only.
-
-    Args:
-        filename: The filename to match against
-        rule: Rule object with 'path' attribute containing the regex pattern
-
-    Returns:
-        bool: True if filename matches the rule pattern
-    """
-    path_pattern = rule.path
-
-    try:
-        return bool(re.search(path_pattern, filename, flags=re.IGNORECASE))
-    except re.error as e:
-        logger.error(f"Invalid regex pattern '{path_pattern}': {e}")
-        return False
+# the compiled rules, by repository key
+_matchers = {}
 
 
 def component_match(item, components, base_marker):
@@ -54,16 +53,184 @@ def component_match(item, components, base_marker):
         bool: True if item matches component and base marker requirements
     """
     # Check for base marker match, if one was specified
-    if base_marker and not any(base_marker == marker.name for marker in item.iter_markers()):
+    if base_marker and item.get_closest_marker(base_marker) is None:
         return False
 
     # Check for component marker matching any of the specified components
     return any(
-        marker.name == 'component' and any(component in marker.args for component in components)
-        for marker in item.iter_markers()
+        not components.isdisjoint(marker.args) for marker in item.iter_markers(name='component')
     )
 
 
+class RuleMatcher:
+    """The path rules of a repository, compiled into a single regex
+
+    Every file is mapped to the component of the first rule whose pattern matches it. The rules
+    are matched one by one when their patterns can not be combined, like patterns with
+    backreferences or with the same group names.
+
+    Args:
+        repo_key: The repository key, for the log messages
+        rules: Rule objects with 'path' and 'component' attributes
+    """
+
+    def __init__(self, repo_key, rules):
+        self.rules = rules
+        self.components = []
+        self.patterns = []
+        alternatives = []
+        for rule in rules:
+            if not hasattr(rule, 'path') or not hasattr(rule, 'component'):
+                logger.warning(
+                    f"Invalid rule in {repo_key}: missing 'path' or 'component' attribute"
+                )
+                continue
+            try:
+                self.patterns.append(re.compile(rule.path, flags=re.IGNORECASE))
+            except re.error as e:
+                logger.error(f"Invalid regex pattern '{rule.path}': {e}")
+                continue
+            # a lookahead per rule keeps the search semantics of the pattern, and the order of
+            # the alternatives makes the first matching rule win
+            alternatives.append(f'(?P<rule{len(self.components)}>(?=.*?(?:{rule.path})))')
+            self.components.append(rule.component)
+        self.regex = None
+        if alternatives and not any(
+            BACKREFERENCE_REGEX.search(pattern.pattern) for pattern in self.patterns
+        ):
+            try:
+                self.regex = re.compile('|'.join(alternatives), flags=re.IGNORECASE | re.DOTALL)
+            except re.error as e:
+                logger.debug(f'Unable to combine the rules of {repo_key}, matched one by one: {e}')
+
+    def match(self, filename):
+        """Return the component of the first rule matching the file, or None"""
+        if self.regex is None:
+            return next(
+                (
+                    component
+                    for pattern, component in zip(self.patterns, self.components, strict=True)
+                    if pattern.search(filename)
+                ),
+                None,
+            )
+        if not (match := self.regex.match(filename)):
+            return None
+        return self.components[int(match.lastgroup.removeprefix('rule'))]
+
+    def map(self, filenames):
+        """Return the components of the files, and the files no rule matched"""
+        components = set()
+        unmatched = set()
+        for filename in filenames:
+            if (component := self.match(filename)) is None:
+                unmatched.add(filename)
+            else:
+                components.add(component.lower())
+        return components, unmatched
+
+
+def compile_rules(repo_key, rules):
+    """Return the matcher of the rules of a repository, compiled once per process"""
+    if (matcher := _matchers.get(repo_key)) is None or matcher.rules is not rules:
+        matcher = _matchers[repo_key] = RuleMatcher(repo_key, rules)
+    return matcher
+
+
+def parse_upstream_pr(pr_info, gh_settings):
+    """Parse and validate a repo_key/pr_number PR specification
+
+    Returns:
+        tuple: The repository key, the PR number and the repository configuration
+
+    Raises:
+        ValueError: If PR format is invalid or repository key not found
+    """
+    if '/' not in pr_info:
+        raise ValueError(f"Invalid PR format: '{pr_info}'. Expected format: repo_key/pr_number")
+
+    repo_key, pr_id_str = pr_info.split('/', 1)
+    try:
+        pr_id = int(pr_id_str)
+    except ValueError as e:
+        raise ValueError(f"Invalid PR number: '{pr_id_str}'. Must be an integer") from e
+
+    # Validate repository configuration
+    repo_config = gh_settings.repos.get(repo_key)
+    if not repo_config:
+        available_repos = ', '.join(gh_settings.repos.keys()) if gh_settings else 'none'
+        raise ValueError(
+            f"Repository key '{repo_key}' not found in settings.github_repos. "
+            f"Available repositories: {available_repos}"
+        )
+    return repo_key, pr_id, repo_config
+
+
+def fetch_pr_files(github_client, repo_key, repo_config, pr_id, cache_dir=None):
+    """Return the files modified in a PR, cached by repository, PR and head commit.
+
+    A single request gets the head commit of the PR, the files are only listed when they are not
+    in the cache yet, following the pagination of the GitHub API.
+
+    Args:
+        github_client: The GitHub client
+        repo_key: The repository key, for the log messages
+        repo_config: The repository configuration, with 'org' and 'repo' attributes
+        pr_id: The PR number
+        cache_dir: The cache directory, defaults to a directory in robottelo.tmp_dir
+
+    Returns:
+        set: The modified filenames
+
+    Raises:
+        GithubException: If GitHub API access fails
+    """
+    logger.info(f"Fetching files modified in upstream PR {repo_key}/{pr_id}")
+    repo_full_name = f"{repo_config.org}/{repo_config.repo}"
+    try:
+        pr = github_client.get_repo(repo_full_name, lazy=True).get_pull(pr_id)
+
+        # Add validation for PR state
+        if pr.state != 'open':
+            logger.warning(f"PR {repo_key}/{pr_id} is {pr.state}, results may be outdated")
+
+        cache_path = Path(
+            cache_dir or get_robottelo_tmp_dir() / CACHE_DIR,
+            repo_config.org,
+            repo_config.repo,
+            f'{pr_id}-{pr.head.sha}.json',
+        )
+        try:
+            return set(json.loads(cache_path.read_text()))
+        except (OSError, ValueError):
+            pass
+        pr_filenames = sorted(file.filename for file in pr.get_files())
+        if len(pr_filenames) < pr.changed_files:
+            logger.warning(
+                f"GitHub listed {len(pr_filenames)} of the {pr.changed_files} files modified in "
+                f"PR {repo_key}/{pr_id}, the tests of the other files may be deselected"
+            )
+    except GithubException as e:
+        if e.status == 404:
+            logger.error(f"PR {repo_key}/{pr_id} not found. Check PR number and repository access.")
+        elif e.status == 403:
+            logger.error(
+                "GitHub API rate limit or permission issue. Consider setting TOKEN to a GitHub token."
+            )
+        else:
+            logger.error(f"GitHub API error for {repo_key}/{pr_id}: {e}")
+        # Raise after logging error, do not continue with any other PRs
+        raise
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(f'.{os.getpid()}.tmp')
+        tmp_path.write_text(json.dumps(pr_filenames))
+        tmp_path.replace(cache_path)
+    except OSError as e:
+        logger.warning(f"Unable to cache the files of PR {repo_key}/{pr_id}: {e}")
+    return set(pr_filenames)
+
+
 def pytest_addoption(parser):
     """Add CLI option to specify upstream GitHub PRs.
 
@@ -92,7 +259,7 @@ def pytest_collection_modifyitems(session, items, config):
 
     Process:
     1. Parse upstream PR specifications from command line
-    2. Fetch modified files from each specified GitHub PR
+    2. Fetch modified files from the specified GitHub PRs, concurrently
     3. Map modified files to test components using configured rules
     4. Filter collected tests to include only those with matching components
 
@@ -113,100 +280,49 @@ def pytest_collection_modifyitems(session, items, config):
     if not upstream_prs:
         return
 
-    components = set()
     gh_settings = settings.github_repos
+    parsed_prs = []
+    for pr_info in upstream_prs:
+        try:
+            parsed_prs.append(parse_upstream_pr(pr_info, gh_settings))
+        except ValueError as e:
+            logger.error(f"Error processing PR {pr_info}: {e}")
+            raise
 
     auth = None
     if token := gh_settings.get('token'):
         auth = Auth.Token(token)
-    github_client = Github(auth=auth)
+    github_client = Github(auth=auth, per_page=FILES_PER_PAGE)
 
-    for pr_info in upstream_prs:
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(parsed_prs))) as executor:
+        futures = [
+            executor.submit(fetch_pr_files, github_client, repo_key, repo_config, pr_id)
+            for repo_key, pr_id, repo_config in parsed_prs
+        ]
+    components = set()
+    for pr_info, (repo_key, pr_id, repo_config), future in zip(
+        upstream_prs, parsed_prs, futures, strict=True
+    ):
         try:
-            # Parse and validate the PR repo and id
-            if '/' not in pr_info:
-                raise ValueError(
-                    f"Invalid PR format: '{pr_info}'. Expected format: repo_key/pr_number"
-                )
-
-            repo_key, pr_id_str = pr_info.split('/', 1)
-            try:
-                pr_id = int(pr_id_str)
-            except ValueError as e:
-                raise ValueError(f"Invalid PR number: '{pr_id_str}'. Must be an integer") from e
-
-            # Validate repository configuration
-            repo_config = gh_settings.repos.get(repo_key)
-            if not repo_config:
-                available_repos = ', '.join(gh_settings.repos.keys()) if gh_settings else 'none'
-                raise ValueError(
-                    f"Repository key '{repo_key}' not found in settings.github_repos. "
-                    f"Available repositories: {available_repos}"
-                )
-
-            # Fetch PR data from GitHub
-            logger.info(f"Fetching files modified in upstream PR {repo_key}/{pr_id}")
-            repo_full_name = f"{repo_config.org}/{repo_config.repo}"
-            try:
-                github_repo = github_client.get_repo(repo_full_name)
-                pr = github_repo.get_pull(pr_id)
-                pr_filenames = {file.filename for file in pr.get_files()}
-
-                # Add validation for PR state
-                if pr.state != 'open':
-                    logger.warning(f"PR {repo_key}/{pr_id} is {pr.state}, results may be outdated")
-
-            except GithubException as e:
-                if e.status == 404:
-                    logger.error(
-                        f"PR {repo_key}/{pr_id} not found. Check PR number and repository access."
-                    )
-                elif e.status == 403:
-                    logger.error(
-                        "GitHub API rate limit or permission issue. Consider setting TOKEN to a GitHub token."
-                    )
-                else:
-                    logger.error(f"GitHub API error for {repo_key}/{pr_id}: {e}")
-                # Raise after logging error, do not continue with any other PRs
-                raise
-
-            # Map modified files to components using configured rules
-            unprocessed_filenames = pr_filenames.copy()
-            logger.debug(f'Upstream PR {repo_key}/{pr_id} modified files: {sorted(pr_filenames)}')
-            if not repo_config.rules:
-                logger.warning(
-                    f"No rules configured for repository '{repo_key}', skipping component mapping"
-                )
-                continue
-
-            for rule in repo_config.rules:
-                if not hasattr(rule, 'path') or not hasattr(rule, 'component'):
-                    logger.warning(
-                        f"Invalid rule in {repo_key}: missing 'path' or 'component' attribute"
-                    )
-                    continue
-
-                matched_filenames = {
-                    filename
-                    for filename in unprocessed_filenames
-                    if match_file_to_rule(filename, rule)
-                }
-                if matched_filenames:
-                    components.add(rule.component.lower())
-                    unprocessed_filenames.difference_update(matched_filenames)
-                    logger.debug(
-                        f"Rule '{rule.path}' matched {len(matched_filenames)} files, "
-                        f"mapped to component '{rule.component}'"
-                    )
-            if unprocessed_filenames:
-                logger.debug(
-                    f"Unmatched files in {repo_key}/{pr_id}: {sorted(unprocessed_filenames)}"
-                )
-
-        except (ValueError, GithubException) as e:
+            pr_filenames = future.result()
+        except GithubException as e:
             logger.error(f"Error processing PR {pr_info}: {e}")
             raise
 
+        # Map modified files to components using configured rules
+        logger.debug(f'Upstream PR {repo_key}/{pr_id} modified files: {sorted(pr_filenames)}')
+        if not repo_config.rules:
+            logger.warning(
+                f"No rules configured for repository '{repo_key}', skipping component mapping"
+            )
+            continue
+        pr_components, unprocessed_filenames = compile_rules(repo_key, repo_config.rules).map(
+            pr_filenames
+        )
+        components.update(pr_components)
+        if unprocessed_filenames:
+            logger.debug(f"Unmatched files in {repo_key}/{pr_id}: {sorted(unprocessed_filenames)}")
+
     # Filter tests based on matched components
     if not components:
         logger.warning("No components matched from upstream PRs, all tests will be deselected")
@@ -214,6 +330,7 @@ def pytest_collection_modifyitems(session, items, config):
     selected = []
     deselected = []
     base_marker = settings.github_repos.base_marker
+    components = frozenset(components)
     logger.info(f"Filtering tests based on components: {sorted(components)}")
 
     for item in items:
@@ -1,3 +1,7 @@
+import queue
+import shlex
+import threading
+import time
 from urllib.parse import urlparse
 
 from box import Box
@@ -16,15 +20,102 @@ test_directories = [
 ]
 
 
+VIDEOS_DIR = '/var/www/html/videos'
+# number of video directories deleted by a single remote command
+BATCH_SIZE = 50
+CLEANUP_RETRIES = 3
+CLEANUP_RETRY_DELAY = 5
+# how long the end of the session waits for the pending deletions
+CLEANUP_TIMEOUT = 300
+
+_STOP = object()
+
+
+class VideoCleanup:
+    """Delete the videos of the grid host in a background thread
+
+    The session IDs are queued by the test teardowns, and their directories are deleted in
+    batches, over a single connection to the grid host which is kept open for the whole session.
+    A failed batch is retried with a new connection, the session IDs of the batches which still
+    fail are kept in ``failed``.
+    """
+
+    def __init__(self, hostname, batch_size=BATCH_SIZE, retries=CLEANUP_RETRIES):
+        self.hostname = hostname
+        self.batch_size = batch_size
+        self.retries = retries
+        self.cleaned = 0
+        self.failed = []
+        self._host = None
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='video-cleanup', daemon=True)
+        self._thread.start()
+
+    def add(self, session_id):
+        self._queue.put(session_id)
+
+    def _run(self):
+        stop = False
+        while not stop:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get())
+            if _STOP in batch:
+                stop = True
+                batch.remove(_STOP)
+                # the session IDs queued after the batch was drained
+                while not self._queue.empty():
+                    batch.append(self._queue.get())
+            for start in range(0, len(batch), self.batch_size):
+                self._delete(batch[start : start + self.batch_size])
+        if self._host is not None:
+            self._host.close()
+
+    def _delete(self, session_ids):
+        command = shlex.join(['rm', '-rf', *(f'{VIDEOS_DIR}/{sid}' for sid in session_ids)])
+        for attempt in range(1, self.retries + 1):
+            try:
+                if self._host is None:
+                    self._host = Host(hostname=self.hostname)
+                result = self._host.execute(command=command)
+                if result.status == 0:
+                    self.cleaned += len(session_ids)
+                    logger.debug(f'cleaned up the videos of {len(session_ids)} sessions')
+                    return
+                error = result.stderr
+            except Exception as err:
+                error = err
+            logger.warning(
+                f'video cleanup attempt {attempt}/{self.retries} of {len(session_ids)} '
+                f'sessions failed: {error}'
+            )
+            if self._host is not None:
+                self._host.close()
+                self._host = None
+            if attempt < self.retries:
+                time.sleep(CLEANUP_RETRY_DELAY * attempt)
+        self.failed.extend(session_ids)
+
+    def close(self, timeout=CLEANUP_TIMEOUT):
+        """Wait for the queued deletions, at most ``timeout`` seconds
+
+        :return: True when all the queued deletions were attempted
+        """
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+
+_cleanup = {'worker': None}
+
+
 def _clean_video(session_id, test):
     if settings.ui.record_video:
-        logger.info(f"cleaning up video files for session: {session_id} and test: {test}")
-
         if settings.ui.grid_url and session_id:
-            grid = urlparse(url=settings.ui.grid_url)
-            infra_grid = Host(hostname=grid.hostname)
-            infra_grid.execute(command=f'rm -rf /var/www/html/videos/{session_id}')
-            logger.info(f"video cleanup for session {session_id} is complete")
+            logger.info(f"queueing video cleanup for session: {session_id} and test: {test}")
+            if _cleanup['worker'] is None:
+                _cleanup['worker'] = VideoCleanup(urlparse(url=settings.ui.grid_url).hostname)
+            _cleanup['worker'].add(session_id)
         else:
             logger.warning("missing grid_url or session_id. unable to clean video files.")
 
@@ -75,3 +166,23 @@ def pytest_runtest_makereport(item):
                 )
                 session_id = session_id_tuple[1] if session_id_tuple else None
                 _clean_video(session_id, item.nodeid)
+
+
+def pytest_sessionfinish(session):
+    """Wait for the video deletions queued by this process, and report the failed ones"""
+    worker = _cleanup['worker']
+    if worker is None:
+        return
+    _cleanup['worker'] = None
+    if not worker.close():
+        logger.warning(
+            f'video cleanup did not finish in {CLEANUP_TIMEOUT}s, '
+            f'{worker.cleaned} session videos cleaned up so far'
+        )
+        return
+    logger.info(f'video cleanup complete for {worker.cleaned} sessions')
+    if worker.failed:
+        logger.warning(
+            f'unable to clean up the videos of {len(worker.failed)} sessions: '
+            f'{", ".join(worker.failed)}'
+        )
@@ -1,11 +1,12 @@
 """Generic base class for cli hammer commands."""
 
 import re
+import time
 
 from wait_for import wait_for
 
 from robottelo import ssh
-from robottelo.cli import hammer
+from robottelo.cli import command_tree, hammer, timing
 from robottelo.config import settings
 from robottelo.exceptions import CLIDataBaseError, CLIError, CLIReturnCodeError
 from robottelo.logging import logger
@@ -200,16 +201,31 @@ class Base:
             f'--output={output_format}' if output_format else "",
             command,
         )
+        start = time.monotonic()
         response = ssh.command(
             cmd,
             hostname=hostname or cls.hostname or settings.server.hostname,
-            output_format=output_format,
+            # timed outputs are parsed once their size has been recorded
+            output_format=None if time_hammer else output_format,
             timeout=timeout,
         )
+        if time_hammer:
+            cls._record_timing(response, time.monotonic() - start)
+            ssh.parse_output(response, output_format)
         if return_raw_response:
             return response
         return cls._handle_response(response, ignore_stderr=ignore_stderr)
 
+    @classmethod
+    def _record_timing(cls, response, latency):
+        """Record the timing of a hammer command and remove it from its stderr"""
+        if isinstance(response.stderr, tuple):
+            response.stderr = response.stderr[1]
+        if isinstance(response.stderr, bytes):
+            response.stderr = response.stderr.decode()
+        times, response.stderr = hammer.parse_time(response.stderr or '')
+        timing.record(cls.command_base, cls.command_sub, times, latency, len(response.stdout or ''))
+
     @classmethod
     def sm_execute(cls, command, hostname=None, timeout=None, **kwargs):
         """Executes the satellite-maintain cli commands on the server via ssh"""
@@ -361,6 +377,11 @@ class Base:
         if options is None:
             options = {}
 
+        if settings.performance.validate_hammer_options:
+            command_tree.validate_command(
+                f"{cls.command_base or ''} {cls.command_sub or ''}", options
+            )
+
         for key, val in options.items():
             if val is None:
                 continue
@@ -0,0 +1,198 @@
+"""Hammer command tree, and its local index used to validate commands before running them.
+
+The command tree is generated by ``scripts/hammer_command_tree.py``, which walks the ``--help`` of
+every hammer command concurrently over a pool of SSH clients. The tree is flattened into an index
+of the subcommands and option names of every command, stored by Satellite version in
+``robottelo_tmp_dir``::
+
+    {"format": 1, "version": "6.17.0", "commands": {"organization list": {...}, ...}}
+
+With ``performance.validate_hammer_options``, :meth:`robottelo.cli.base.Base._construct_command`
+checks the subcommands and option names against the index of ``server.version.release``, and
+raises :class:`~robottelo.exceptions.CLIUsageError` on an unknown one instead of running hammer.
+The options of subcommand aliases and the arguments embedded in the command are not validated,
+nor are the commands when there is no index.
+"""
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import cache
+import json
+from pathlib import Path
+import re
+import threading
+
+from robottelo import ssh
+from robottelo.cli import hammer
+from robottelo.config import get_robottelo_tmp_dir, settings
+from robottelo.exceptions import CLIUsageError
+from robottelo.logging import logger as _root_logger
+
+logger = _root_logger.getChild('command_tree')
+
+INDEX_DIR = 'hammer_command_tree'
+INDEX_FORMAT = 1
+# hammer exits with EX_USAGE on unknown subcommands and options
+USAGE_ERROR_STATUS = 64
+
+# option aliases dropped by hammer.parse_help, like --[no-]verbose and deprecated names
+_option_aliases_regex = re.compile(
+    r'^ (-\w, )?--(?P<negation>\[no-\])?(?P<name>[\w-]+), --(?P<alias>[\w-]+)'
+    r'|^ (-\w, )?--\[no-\](?P<negated>[\w-]+)'
+)
+_subcommand_aliases_regex = re.compile(r'^ [\w-]+, (?P<alias>[\w-]+)\s')
+
+
+def parse_help_aliases(output):
+    """Return the option and subcommand aliases of a hammer help output"""
+    aliases = {'option_aliases': [], 'subcommand_aliases': []}
+    section = None
+    for line in output.splitlines():
+        if line.startswith(('Subcommands:', 'Options:')):
+            section = line
+            continue
+        if section == 'Options:' and (match := _option_aliases_regex.search(line)):
+            if match.group('alias'):
+                aliases['option_aliases'].append(match.group('alias'))
+            if match.group('negation') or match.group('negated'):
+                aliases['option_aliases'].append(
+                    f'no-{match.group("name") or match.group("negated")}'
+                )
+        elif section == 'Subcommands:' and (match := _subcommand_aliases_regex.search(line)):
+            aliases['subcommand_aliases'].append(match.group('alias'))
+    return aliases
+
+
+def generate_command_tree(hostname=None, workers=8, command='hammer'):
+    """Walk the help of a hammer command and of all its subcommands, concurrently
+
+    Every thread runs its commands over its own SSH client, which is reused for all of them.
+
+    :param str hostname: the Satellite to inspect, defaults to ``server.hostname``
+    :param int workers: number of concurrent SSH clients
+    :param str command: the command at the root of the tree
+    :return: the tree of the subcommands and options, as parsed by :func:`hammer.parse_help`
+    """
+    clients = threading.local()
+
+    def fetch_help(command):
+        if not hasattr(clients, 'client'):
+            clients.client = ssh.get_client(hostname=hostname)
+        output = clients.client.execute(f'{command} --help').stdout
+        return {**hammer.parse_help(output), **parse_help_aliases(output)}
+
+    root = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = {executor.submit(fetch_help, command): (command, root)}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                command, node = pending.pop(future)
+                node.update(future.result())
+                for subcommand in node['subcommands']:
+                    subcommand_path = f'{command} {subcommand["name"]}'
+                    pending[executor.submit(fetch_help, subcommand_path)] = (
+                        subcommand_path,
+                        subcommand,
+                    )
+    return root
+
+
+def build_index(tree):
+    """Flatten a command tree into the subcommands and option names of every command"""
+    commands = {}
+
+    def walk(node, path):
+        commands[path] = {
+            'subcommands': sorted(
+                {sub['name'] for sub in node['subcommands']} | {*node.get('subcommand_aliases', ())}
+            ),
+            'options': sorted(
+                {option['name'] for option in node['options']} | {*node.get('option_aliases', ())}
+            ),
+        }
+        for subcommand in node['subcommands']:
+            walk(subcommand, f'{path} {subcommand["name"]}'.strip())
+
+    walk(tree, '')
+    return commands
+
+
+def get_index_path(version, index_dir=None):
+    return Path(index_dir or get_robottelo_tmp_dir() / INDEX_DIR, f'{version}.json')
+
+
+def write_index(tree, version, index_dir=None):
+    """Write the index of a command tree for a Satellite version
+
+    :return: the path of the index
+    """
+    path = get_index_path(version, index_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {'format': INDEX_FORMAT, 'version': version, 'commands': build_index(tree)}
+    tmp_path = path.with_suffix('.tmp')
+    tmp_path.write_text(json.dumps(data, sort_keys=True))
+    tmp_path.replace(path)
+    return path
+
+
+@cache
+def load_index(version=None, index_dir=None):
+    """Return the commands of the index of a Satellite version, or None when there is none
+
+    :param str version: defaults to ``server.version.release``
+    """
+    version = version or str(settings.server.version.release)
+    path = get_index_path(version, index_dir)
+    try:
+        data = json.loads(path.read_text())
+    except (OSError, json.JSONDecodeError):
+        logger.debug(f'No hammer command index at {path}, commands are not validated')
+        return None
+    if data.get('format') != INDEX_FORMAT:
+        logger.warning(f'Ignoring the hammer command index {path} of an unsupported format')
+        return None
+    return {
+        command: {key: frozenset(names) for key, names in entry.items()}
+        for command, entry in data['commands'].items()
+    }
+
+
+def validate_command(command, options, index=None):
+    """Check the subcommands and options of a hammer command against the index
+
+    :param str command: the subcommands, like ``content-view version list``
+    :param dict options: the options passed to the command, as for ``Base._construct_command``
+    :param index: the index to use, defaults to the index of :func:`load_index`
+    :raises robottelo.exceptions.CLIUsageError: on an unknown subcommand or option
+    """
+    index = load_index() if index is None else index
+    if not index:
+        return
+    path = ''
+    for word in command.split():
+        entry = index.get(path)
+        if entry is None:
+            return
+        if word.startswith('-') or not entry['subcommands']:
+            # options and arguments embedded in the command itself are not validated
+            break
+        if word not in entry['subcommands']:
+            _usage_error(f"Error: No such sub-command '{word}'.", path)
+        path = f'{path} {word}'.strip()
+    entry = index.get(path)
+    if entry is None:
+        return
+    for name, value in options.items():
+        if value is None or value is False:
+            continue
+        if name not in entry['options']:
+            _usage_error(f"Error: Unrecognised option '--{name}'.", path)
+
+
+def _usage_error(message, path):
+    stderr = f"{message}\n\nSee: 'hammer {path} --help'.".replace('hammer  ', 'hammer ')
+    raise CLIUsageError(
+        USAGE_ERROR_STATUS,
+        stderr,
+        f'Command "{path}" rejected by the hammer command index\nstderr contains:\n{stderr}',
+    )
@@ -37,6 +37,22 @@ def _normalize_obj(obj):
     return obj
 
 
+TIME_OUTPUT_REGEX = re.compile(r'^(?P<name>real|user|sys) (?P<value>\d+(\.\d+)?)$\n?', re.MULTILINE)
+
+
+def parse_time(stderr):
+    """Parse the ``time -p`` output from a hammer command stderr.
+
+    :return: a tuple of a dict mapping ``real``, ``user`` and ``sys`` to the measured
+        seconds (empty if no timing was found) and the stderr without the timing lines.
+    """
+    times = {
+        match.group('name'): float(match.group('value'))
+        for match in TIME_OUTPUT_REGEX.finditer(stderr)
+    }
+    return times, TIME_OUTPUT_REGEX.sub('', stderr)
+
+
 def parse_csv(output):
     """Parse CSV output from Hammer CLI and return a Python dictionary."""
     output = output.splitlines()
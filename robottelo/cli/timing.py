@@ -0,0 +1,144 @@
+"""Collect and report the timings of hammer commands.
+
+When ``settings.performance.time_hammer`` is set, hammer commands are prefixed with ``time -p``
+and :meth:`robottelo.cli.base.Base.execute` records, for every call, the remote real, user and
+sys times, the end-to-end latency (including SSH) and the size of the output.
+
+At the end of the session, each process dumps its records to a directory shared by the whole
+pytest run, and the xdist controller (or the only process when xdist is not used) aggregates them
+in a per-command report, written as JSON and HTML.
+"""
+
+import html
+import json
+import math
+import os
+from pathlib import Path
+
+from robottelo.logging import logger
+from robottelo.utils.shared_state import get_run_id, get_state_dir
+
+TIMING_DIR = 'hammer_timing'
+PERCENTILES = (50, 95, 99)
+METRICS = ('real', 'user', 'sys', 'latency', 'output_size')
+
+_records = []
+
+
+def record(command_base, command_sub, times, latency, output_size):
+    """Record the timing of a hammer command
+
+    :param str command_base: the hammer command, e.g. ``content-view``
+    :param str command_sub: the hammer subcommand, e.g. ``publish``
+    :param dict times: the remote ``real``, ``user`` and ``sys`` times in seconds
+    :param float latency: the end-to-end time of the command in seconds
+    :param int output_size: the size of the command output in bytes
+    """
+    _records.append(
+        {
+            'command': f'{command_base or ""} {command_sub or ""}'.strip(),
+            'real': times.get('real'),
+            'user': times.get('user'),
+            'sys': times.get('sys'),
+            'latency': latency,
+            'output_size': output_size,
+        }
+    )
+
+
+def get_records():
+    """Return the timings recorded by the current process"""
+    return list(_records)
+
+
+def get_timing_dir():
+    """Return the directory where the timings of the current run are shared"""
+    timing_dir = get_state_dir().joinpath(TIMING_DIR, get_run_id())
+    timing_dir.mkdir(parents=True, exist_ok=True)
+    return timing_dir
+
+
+def dump_records(name=None):
+    """Write the records of the current process to the shared timing directory"""
+    name = name or os.environ.get('PYTEST_XDIST_WORKER', 'master')
+    path = get_timing_dir().joinpath(f'{name}.json')
+    path.write_text(json.dumps(_records))
+    return path
+
+
+def load_records(timing_dir=None):
+    """Load the records of all the processes of the current run"""
+    records = []
+    for path in Path(timing_dir or get_timing_dir()).glob('*.json'):
+        records.extend(json.loads(path.read_text()))
+    return records
+
+
+def percentile(values, pct):
+    """Return the nearest-rank percentile of a list of values"""
+    if not values:
+        return None
+    values = sorted(values)
+    return values[max(math.ceil(pct / 100 * len(values)) - 1, 0)]
+
+
+def summarize(records):
+    """Aggregate the records per command
+
+    :return: a dict mapping each command to the count of calls and the statistics (min, max, mean
+        and percentiles) of each metric
+    """
+    by_command = {}
+    for rec in records:
+        by_command.setdefault(rec['command'], []).append(rec)
+    summary = {}
+    for command, command_records in sorted(by_command.items()):
+        stats = {'count': len(command_records)}
+        for metric in METRICS:
+            values = [rec[metric] for rec in command_records if rec.get(metric) is not None]
+            if not values:
+                continue
+            stats[metric] = {
+                'min': min(values),
+                'max': max(values),
+                'mean': sum(values) / len(values),
+                **{f'p{pct}': percentile(values, pct) for pct in PERCENTILES},
+            }
+        summary[command] = stats
+    return summary
+
+
+def _html_report(summary):
+    columns = [f'{metric} p{pct}' for metric in METRICS for pct in PERCENTILES]
+    rows = []
+    for command, stats in summary.items():
+        cells = [
+            f'{stats[metric][f"p{pct}"]:.3f}' if metric in stats else '-'
+            for metric in METRICS
+            for pct in PERCENTILES
+        ]
+        rows.append(
+            f'<tr><td>{html.escape(command)}</td><td>{stats["count"]}</td>'
+            + ''.join(f'<td>{cell}</td>' for cell in cells)
+            + '</tr>'
+        )
+    header = ''.join(f'<th>{column}</th>' for column in ['command', 'count', *columns])
+    return (
+        '<html><head><title>Hammer timing report</title></head><body>'
+        '<h1>Hammer timing report</h1>'
+        '<p>Times are in seconds, output sizes in bytes.</p>'
+        f'<table border="1"><tr>{header}</tr>{"".join(rows)}</table>'
+        '</body></html>'
+    )
+
+
+def write_report(summary, report_path):
+    """Write the summary as ``<report_path>.json`` and ``<report_path>.html``
+
+    :param dict summary: the summary returned by :func:`summarize`
+    :param report_path: the report path, without extension
+    """
+    report_path = Path(report_path)
+    report_path.with_suffix('.json').write_text(json.dumps(summary, indent=4))
+    report_path.with_suffix('.html').write_text(_html_report(summary))
+    logger.info(f'Hammer timing report for {len(summary)} commands written to {report_path}.*')
@@ -2,9 +2,11 @@ import builtins
 import logging
 import os
 from pathlib import Path
+import pickle
 from urllib.parse import urlunsplit
 
 from dynaconf import LazySettings
+from dynaconf.utils.functional import empty
 from dynaconf.validator import ValidationError
 from nailgun.config import ServerConfig
 
@@ -15,15 +17,94 @@ if not os.getenv('ROBOTTELO_DIR'):
     # dynaconf robottelo file uses ROBOTELLO_DIR for screenshots
     os.environ['ROBOTTELO_DIR'] = str(robottelo_root_dir)
 
+# path of the settings snapshot written by the xdist controller, and loaded by its workers
+SETTINGS_SNAPSHOT_ENV = 'PYTEST_ROBOTTELO_SETTINGS_SNAPSHOT'
 
-def get_settings():
+
+class RobotteloSettings(LazySettings):
+    """Dynaconf settings, loaded and validated on their first access
+
+    The callables of ``on_setup`` are called with no arguments once the settings are loaded and
+    validated, to configure the subsystems that depend on them.
+    """
+
+    def __init__(self, *args, on_setup=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.__dict__['_on_setup'] = list(on_setup)
+
+    def _setup(self):
+        if self._load_snapshot():
+            for callback in self._on_setup:
+                callback()
+            return
+        super()._setup()
+        self.validators.register(**VALIDATORS)
+        try:
+            self.validators.validate()
+        except ValidationError as err:
+            if self.robottelo.settings.get('ignore_validation_errors'):
+                logger.warning(f'Dynaconf validation failed with\n{err}')
+            else:
+                # raise again on the next access, instead of using invalid settings
+                self._wrapped = empty
+                raise err
+        for callback in self._on_setup:
+            callback()
+
+    def _load_snapshot(self):
+        """Load the settings snapshot of the xdist controller, instead of resolving the settings
+
+        :return: True if the snapshot was loaded
+        """
+        path = os.environ.get(SETTINGS_SNAPSHOT_ENV)
+        if not path or not os.environ.get('PYTEST_XDIST_WORKER'):
+            return False
+        try:
+            data = pickle.loads(Path(path).read_bytes())
+        except (
+            OSError,
+            EOFError,
+            AttributeError,
+            ImportError,
+            ValueError,
+            pickle.UnpicklingError,
+        ) as err:
+            # a truncated snapshot, or one written by another version of robottelo
+            logger.warning(f'Unable to load the settings snapshot {path}: {err}')
+            return False
+        # the snapshot already holds the content of the files, vault and hooks
+        self._wrapped = self._wrapper_class(
+            **{
+                **self._kwargs,
+                'SETTINGS_FILE_FOR_DYNACONF': [],
+                'PRELOAD_FOR_DYNACONF': [],
+                'INCLUDES_FOR_DYNACONF': [],
+                'VAULT_ENABLED_FOR_DYNACONF': False,
+            }
+        )
+        self._wrapped.update(data, validate=False)
+        self.validators.register(**VALIDATORS)
+        logger.debug(f'Loaded the settings snapshot {path}')
+        return True
+
+    def write_snapshot(self, path):
+        """Write the loaded and validated settings to a file, to be loaded by the xdist workers
+
+        :param path: the snapshot file, it should only be readable by the current user
+        """
+        Path(path).write_bytes(pickle.dumps(self.as_dict()))
+
+
+def get_settings(lazy=False, on_setup=()):
     """Return Lazy settings object after validating
 
+    :param lazy: defer the loading and validation of the settings to their first access
+    :param on_setup: callables called once the settings are loaded and validated
     :return: A validated Lazy settings object
     """
     if getattr(builtins, "__sphinx_build__", False):
         return None
-    settings = LazySettings(
+    settings = RobotteloSettings(
         envvar_prefix="ROBOTTELO",
         core_loaders=["YAML"],
         root_path=str(robottelo_root_dir),
@@ -33,21 +114,33 @@ def get_settings():
         envless_mode=True,
         lowercase_read=True,
         load_dotenv=True,
+        on_setup=on_setup,
     )
-    settings.validators.register(**VALIDATORS)
-    try:
-        settings.validators.validate()
-    except ValidationError as err:
-        if settings.robottelo.settings.get('ignore_validation_errors'):
-            logger.warning(f'Dynaconf validation failed with\n{err}')
-        else:
-            raise err
+    if not lazy:
+        settings._setup()
     return settings
 
 
-settings = get_settings()
-robottelo_tmp_dir = Path(settings.robottelo.tmp_dir)
-robottelo_tmp_dir.mkdir(parents=True, exist_ok=True)
+def _configure_on_setup():
+    configure_nailgun()
+
+
+# settings are loaded on first access, nailgun is configured at the same time
+settings = get_settings(lazy=True, on_setup=[_configure_on_setup])
+
+
+def get_robottelo_tmp_dir():
+    """Return the robottelo temporary directory, creating it if needed"""
+    robottelo_tmp_dir = Path(settings.robottelo.tmp_dir)
+    robottelo_tmp_dir.mkdir(parents=True, exist_ok=True)
+    return robottelo_tmp_dir
+
+
+def __getattr__(name):
+    # robottelo_tmp_dir is resolved on access, so importing it does not load the settings early
+    if name == 'robottelo_tmp_dir':
+        return get_robottelo_tmp_dir()
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
 
 def get_credentials():
@@ -166,13 +259,14 @@ def configure_nailgun():
     entities.GPGKey.__init__ = patched_gpgkey_init
 
 
-configure_nailgun()
+_airgun_state = {'configured': False}
 
 
 def configure_airgun():
     """Pass required settings to AirGun"""
     import airgun
 
+    _airgun_state['configured'] = True
     airgun.settings.configure(
         {
             'airgun': {
@@ -195,4 +289,7 @@ def configure_airgun():
     )
 
 
-configure_airgun()
+def ensure_airgun_configured():
+    """Configure AirGun on its first use, importing it is deferred until then"""
+    if not _airgun_state['configured']:
+        configure_airgun()
@@ -21,8 +21,16 @@ VALIDATORS = dict(
         ),
         Validator('server.version.rhel_version', must_exist=True, cast=str),
         Validator(
-            'server.xdist_behavior', must_exist=True, is_in=['run-on-one', 'balance', 'on-demand']
-        ),
+            'server.xdist_behavior',
+            must_exist=True,
+            is_in=['run-on-one', 'balance', 'on-demand', 'load-aware'],
+        ),
+        Validator('server.load_balancing.probe_ttl', default=60, cast=int),
+        Validator('server.load_balancing.rebalance_per_module', default=False, is_type_of=bool),
+        Validator('server.load_balancing.worker_weight', default=1.0, cast=float),
+        Validator('server.load_balancing.in_flight_weight', default=1.0, cast=float),
+        Validator('server.load_balancing.task_weight', default=0.1, cast=float),
+        Validator('server.load_balancing.latency_weight', default=1.0, cast=float),
         Validator('server.auto_checkin', default=False, is_type_of=bool),
         (
             Validator('server.ssh_key', must_exist=True)
@@ -49,6 +57,9 @@ VALIDATORS = dict(
     ],
     content_host=[
         Validator('content_host.default_rhel_version', must_exist=True),
+        Validator('content_host.prefetch_facts', default=False, is_type_of=bool),
+        Validator('content_host.registration_command_ttl', default=300, is_type_of=int),
+        Validator('content_host.registration_workers', default=10, is_type_of=int, gte=1),
         Validator(
             'content_host.network_type',
             cast=NetworkType,
@@ -280,6 +291,14 @@ VALIDATORS = dict(
             must_exist=True,
         ),
     ],
+    manifest=[
+        Validator('manifest.pool.enabled', default=False, is_type_of=bool),
+        Validator('manifest.pool.directory', default=''),
+        Validator('manifest.pool.size', default=1, is_type_of=int, gte=0),
+        Validator('manifest.pool.max_age', default=86400, is_type_of=int, gte=0),
+        Validator('manifest.pool.lease_timeout', default=1800, is_type_of=int, gte=0),
+        Validator('manifest.pool.refill', default=True, is_type_of=bool),
+    ],
     mcp=[
         Validator(
             'foreman_mcp.username',
@@ -298,6 +317,8 @@ VALIDATORS = dict(
             'ohsnap.request_retry.delay',
             must_exist=True,
         ),
+        Validator('ohsnap.cache.ttl', default=3600, is_type_of=int, gte=0),
+        Validator('ohsnap.cache.directory', default=None),
     ],
     open_ldap=[
         Validator(
@@ -333,7 +354,18 @@ VALIDATORS = dict(
             must_exist=True,
         ),
     ],
-    performance=[Validator('performance.time_hammer', default=False)],
+    performance=[
+        Validator('performance.time_hammer', default=False),
+        Validator('performance.validate_hammer_options', default=False, is_type_of=bool),
+        Validator('performance.entity_pool.enabled', default=False, is_type_of=bool),
+        Validator('performance.entity_pool.size', default=5, is_type_of=int, gte=1),
+        Validator('performance.entity_tracker.enabled', default=False, is_type_of=bool),
+        Validator(
+            'performance.entity_tracker.scope', default='module', is_in=['module', 'session']
+        ),
+        Validator('performance.entity_tracker.orphan_cleanup', default=True, is_type_of=bool),
+        Validator('performance.entity_tracker.db_growth', default=False, is_type_of=bool),
+    ],
     report_portal=[
         Validator(
             'report_portal.portal_url',
@@ -433,6 +465,7 @@ VALIDATORS = dict(
         Validator('robottelo.stage_docs_url', default='https://docs.redhat.com'),
         Validator('robottelo.custom_docs_url', default=''),
         Validator('robottelo.settings.ignore_validation_errors', is_type_of=bool, default=False),
+        Validator('robottelo.settings.share_snapshot', is_type_of=bool, default=True),
         Validator('robottelo.rhel_source', default='ga', is_in=['ga', 'internal']),
         Validator(
             'robottelo.sat_non_ga_versions',
@@ -454,6 +487,10 @@ VALIDATORS = dict(
         Validator('shared_function.call_retries', default=2),
         Validator('shared_function.redis_password', default=None),
     ],
+    ui=[
+        Validator('ui.session_pool.enabled', default=False, is_type_of=bool),
+        Validator('ui.session_pool.max_uses', default=10, is_type_of=int, gte=1),
+    ],
     upgrade=[
         Validator('upgrade.capsule_ak', must_exist=True),
     ],
@@ -43,6 +43,18 @@ class ReposContentSetupWasNotPerformed(Exception):
     setup"""
 
 
+class RepositorySyncError(Exception):
+    """Raised when the synchronization of one or more repositories failed
+
+    :param dict failures: the failure message of each failed repository
+    """
+
+    def __init__(self, failures):
+        self.failures = failures
+        details = '\n'.join(f'  {repo}: {message}' for repo, message in failures.items())
+        super().__init__(f'{len(failures)} repositories failed to synchronize:\n{details}')
+
+
 class DataFileError(Exception):
     """Indicates any issue when reading a data file."""
 
@@ -134,5 +146,11 @@ class CLIDataBaseError(CLIBaseError):
     """
 
 
+class CLIUsageError(CLIReturnCodeError):
+    """Error to be raised when a hammer command uses an unknown subcommand or
+    option, according to the local hammer command index, without running it
+    """
+
+
 class NoManifestProvidedError(Exception):
     """Raised when a manifest is not provided to a helper function that expects one"""
@@ -11,8 +11,9 @@ from urllib.parse import urlparse
 
 from fauxfactory import gen_ipaddr, gen_mac, gen_string
 from nailgun.client import request
-from nailgun.entity_mixins import call_entity_method_with_timeout
+from nailgun.entity_mixins import TaskFailedError, call_entity_method_with_timeout
 from requests import HTTPError
+from wait_for import TimedOutError
 
 from robottelo.config import settings
 from robottelo.constants import (
@@ -77,13 +78,70 @@ class APIFactory:
         if repo_id is not None:
             content_view.repository = [self._satellite.api.Repository(id=repo_id)]
             content_view = content_view.update(['repository'])
-        # Publish content view
-        content_view.publish()
-        # Promote the content view version.
-        content_view_version = content_view.read().version[0]
-        content_view_version.promote(data={'environment_ids': lce.id})
+        self.publish_promote(content_view, [lce])
         return content_view.read()
 
+    def publish_promote(
+        self, content_views, environments=(), force=False, poll_rate=5, timeout=3600
+    ):
+        """Publish content views and promote their new versions, with asynchronous tasks.
+
+        All the content views are published at once. As soon as the publish of a content view is
+        done, its new version is promoted to all the ``environments`` in a single call. All the
+        tasks are tracked with a single search per poll.
+
+        :param content_views: A content view entity, or a list of them.
+        :param environments: The lifecycle environments, or their ids, to promote the new
+            versions to. Unless ``force`` is set, they have to follow the promotion path.
+        :param bool force: Promote out of the promotion path of the environments.
+        :param poll_rate: Delay between two searches of the tasks.
+        :param timeout: Maximum number of seconds to wait for all the tasks.
+        :return: The new content view version entity, or a list of them in the order of
+            ``content_views``.
+        :raises nailgun.entity_mixins.TaskFailedError: If a publish or promote did not succeed.
+        :raises wait_for.TimedOutError: If the tasks did not finish until timeout.
+        """
+        single = not isinstance(content_views, list | tuple)
+        content_views = [content_views] if single else list(content_views)
+        env_ids = [getattr(env, 'id', env) for env in environments]
+        pending = {cv.publish(synchronous=False)['id']: ('publish', cv) for cv in content_views}
+        versions = {}
+        start = time.monotonic()
+        while pending:
+            for task_id, task in self._satellite.finished_tasks(list(pending)).items():
+                action, cv = pending.pop(task_id)
+                # a paused task waits for a manual action, it would not finish until timeout
+                if task.state == 'paused' or task.result != 'success':
+                    raise TaskFailedError(
+                        f'{action.capitalize()} of content view {cv.id} did not succeed. '
+                        f'Task {task_id} state: {task.state}, result: {task.result}',
+                        task_id,
+                    )
+                if action == 'publish':
+                    versions[cv.id] = self._published_version(cv, task)
+                    if env_ids:
+                        promote = versions[cv.id].promote(
+                            synchronous=False, data={'environment_ids': env_ids, 'force': force}
+                        )
+                        pending[promote['id']] = ('promote', cv)
+            if not pending:
+                break
+            if time.monotonic() - start > timeout:
+                raise TimedOutError(
+                    f'Content view tasks {", ".join(pending)} did not finish in {timeout}s'
+                )
+            time.sleep(poll_rate)
+        versions = [versions[cv.id].read() for cv in content_views]
+        return versions[0] if single else versions
+
+    def _published_version(self, content_view, task):
+        """Return the content view version created by a finished publish task"""
+        version_id = (task.output or {}).get('content_view_version_id')
+        if version_id is None:
+            # the task output is not always part of the search results
+            version_id = max(version.id for version in content_view.read().version)
+        return self._satellite.api.ContentViewVersion(id=version_id)
+
     def enable_rhrepo_and_fetchid(
         self, basearch, org_id, product, repo, reposet, releasever=None, strict=False
     ):
@@ -3,6 +3,7 @@ import time
 
 from box import Box
 from dateutil.parser import parse
+from wait_for import wait_for
 
 from robottelo import ssh
 from robottelo.config import settings
@@ -15,6 +16,9 @@ from robottelo.enums import NetworkType
 from robottelo.logging import logger
 from robottelo.utils.installer import InstallerCommand
 
+# the states of the tasks that do not progress anymore, a paused task waits for a manual action
+FINISHED_TASK_STATES = ('stopped', 'paused')
+
 
 class EnablePluginsCapsule:
     """Miscellaneous settings helper methods"""
@@ -70,6 +74,42 @@ class CapsuleInfo:
             raise AssertionError(f"No task was found using query '{search_query}'")
         return tasks
 
+    def finished_tasks(self, task_ids):
+        """Search several tasks at once, and return the ones that are stopped or paused.
+
+        :param task_ids: The ids of the tasks to search.
+        :return: Dict of the task id to its finished ``sat.api.ForemanTask`` entity, the tasks
+            states and results are not checked.
+        """
+        task_ids = list(task_ids)
+        if not task_ids:
+            return {}
+        tasks = self.satellite.api.ForemanTask().search(
+            query={'search': f'id ^ ({", ".join(task_ids)})', 'per_page': len(task_ids)}
+        )
+        return {task.id: task for task in tasks if task.state in FINISHED_TASK_STATES}
+
+    def wait_for_task_ids(self, task_ids, poll_rate=10, timeout=3600):
+        """Wait for several tasks to stop or pause, with a single search of all of them per poll.
+
+        :param task_ids: The ids of the tasks to wait for.
+        :param poll_rate: Delay between two searches.
+        :param timeout: Maximum number of seconds to wait for all the tasks.
+        :return: Dict of the task id to its finished ``sat.api.ForemanTask`` entity, the tasks
+            states and results are not checked.
+        :raises: ``wait_for.TimedOutError``. If a task did not finish until timeout.
+        """
+        task_ids = list(task_ids)
+
+        def all_finished():
+            tasks = self.finished_tasks(task_ids)
+            return tasks if len(tasks) == len(task_ids) else False
+
+        if not task_ids:
+            return {}
+        tasks, _ = wait_for(all_finished, timeout=timeout, delay=poll_rate)
+        return tasks
+
     def wait_for_sync(self, start_time=None, timeout=600):
         """Wait for capsule sync to finish and assert success.
         Assert that a task to sync lifecycle environment to the
@@ -192,6 +232,15 @@ class CapsuleInfo:
 
         return Box(path=path, size=size, sum=real_sum, info=info)
 
+    def _resolve_addresses(self, hostname):
+        """Return the (ipv6|ipv4, address) pairs the host resolves a hostname to"""
+        results = self.execute_many([f'dig +short AAAA {hostname}', f'dig +short A {hostname}'])
+        return [
+            (family, result.stdout.strip())
+            for family, result in zip(('ipv6', 'ipv4'), results, strict=True)
+            if result.stdout.strip()
+        ]
+
     def cutoff_host_setup_log(self, proxy_hostname, hostname):
         """For testing of HTTP Proxy, disable direct connection to some host using firewall. On the Proxy, setup logs for later comparison that the Proxy was used."""
         log_path = '/var/log/squid/access.log'
@@ -200,22 +249,14 @@ class CapsuleInfo:
             f'sshpass -p "{settings.server.ssh_password}" scp -o StrictHostKeyChecking=no root@{proxy_hostname}:{log_path} {old_log}'
         )
         # make sure the system can't communicate with the git directly, without proxy
-        result = self.execute(f'dig +short AAAA {hostname}').stdout.strip()
-        if len(result) > 0:
-            assert (
-                self.execute(
-                    f'firewall-cmd --permanent --direct --add-rule ipv6 filter OUTPUT 1 -d {result} -j REJECT && firewall-cmd --reload'
-                ).status
-                == 0
-            )
-        result = self.execute(f'dig +short A {hostname}').stdout.strip()
-        if len(result) > 0:
-            assert (
-                self.execute(
-                    f'firewall-cmd --permanent --direct --add-rule ipv4 filter OUTPUT 1 -d {result} -j REJECT && firewall-cmd --reload'
-                ).status
-                == 0
-            )
+        commands = [
+            f'firewall-cmd --permanent --direct --add-rule {family} filter OUTPUT 1 -d {address} -j REJECT'
+            for family, address in self._resolve_addresses(hostname)
+        ]
+        if commands:
+            commands.append('firewall-cmd --reload')
+            results = self.execute_many(commands, stop_on_failure=True)
+            assert [result.status for result in results] == [0] * len(commands)
         assert self.execute(f'ping -c 2 {hostname}').status != 0, (
             "the connection was not successfully disabled"
         )
@@ -224,16 +265,12 @@ class CapsuleInfo:
     def restore_host_check_log(self, proxy_hostname, hostname, old_log):
         """For testing of HTTP Proxy, call after running the thing that should use Proxy."""
         log_path = '/var/log/squid/access.log'
-        result = self.execute(f'dig +short AAAA {hostname}').stdout.strip()
-        if len(result) > 0:
-            self.execute(
-                f'firewall-cmd --permanent --direct --remove-rule ipv6 filter OUTPUT 1 -d {result} -j REJECT && firewall-cmd --reload'
-            )
-        result = self.execute(f'dig +short A {hostname}').stdout.strip()
-        if len(result) > 0:
-            self.execute(
-                f'firewall-cmd --permanent --direct --remove-rule ipv4 filter OUTPUT 1 -d {result} -j REJECT && firewall-cmd --reload'
-            )
+        commands = [
+            f'firewall-cmd --permanent --direct --remove-rule {family} filter OUTPUT 1 -d {address} -j REJECT'
+            for family, address in self._resolve_addresses(hostname)
+        ]
+        if commands:
+            self.execute_many([*commands, 'firewall-cmd --reload'], stop_on_failure=True)
 
         new_log = ssh.command('echo /tmp/$RANDOM').stdout.strip()
         ssh.command(
@@ -31,6 +31,7 @@ from robottelo.cli.proxy import CapsuleTunnelError
 from robottelo.config import settings
 from robottelo.exceptions import CLIFactoryError, CLIReturnCodeError
 from robottelo.host_helpers.repository_mixins import initiate_repo_helpers
+from robottelo.utils.entity_tracker import record_cli_entity
 
 
 def create_object(cli_object, options, values=None, credentials=None, timeout=None):
@@ -49,10 +50,9 @@ def create_object(cli_object, options, values=None, credentials=None, timeout=No
 
     """
     options.update(values or {})
-    if credentials:
-        cli_object = cli_object.with_user(*credentials)
+    creator = cli_object.with_user(*credentials) if credentials else cli_object
     try:
-        result = cli_object.create(options, timeout)
+        result = creator.create(options, timeout)
     except CLIReturnCodeError as err:
         # If the object is not created, raise exception, stop the show.
         raise CLIFactoryError(
@@ -61,6 +61,8 @@ def create_object(cli_object, options, values=None, credentials=None, timeout=No
     # Sometimes we get a list with a dictionary and not a dictionary.
     if isinstance(result, list) and len(result) > 0:
         result = result[0]
+    # the entity is deleted as admin, not as the user who created it
+    record_cli_entity(cli_object, options, result)
     return Box(result)
 
 
@@ -122,7 +124,7 @@ ENTITY_FIELDS = {
     'repository_with_credentials': {
         '_entity_cls': 'Repository',
         'name': gen_alpha,
-        'url': settings.repos.yum_1.url,
+        'url': lambda: settings.repos.yum_1.url,
         'content-type': 'yum',
     },
     'role': {'name': gen_alphanumeric},
@@ -5,7 +5,7 @@ import json
 from tempfile import NamedTemporaryFile
 
 from robottelo import constants
-from robottelo.config import robottelo_tmp_dir, settings
+from robottelo.config import get_robottelo_tmp_dir, settings
 from robottelo.logging import logger
 from robottelo.utils.ohsnap import dogfood_repofile_url, dogfood_repository
 
@@ -173,18 +173,18 @@ class SystemFacts:
 
     def _get_custom_facts(self, filename=None):
         """get a dictionary of custom facts on the system"""
-        if isinstance(filename, list):
-            all_facts = {}
-            for fname in filename:
-                all_facts.update(self._get_custom_facts(fname))
         if filename is None:
             filenames = self._get_dir_list('/etc/rhsm/facts/', '*.facts')
             filename = [fname.replace('/etc/rhsm/facts/', '') for fname in filenames]
         if isinstance(filename, str):
-            result = self.execute(f'cat /etc/rhsm/facts/{filename}')
-            if result.status == 0:
-                return {filename: json.loads(result.stdout)}
-        return {}
+            filename = [filename]
+        # the fact files are read in a single remote call
+        results = self.execute_many([f'cat /etc/rhsm/facts/{fname}' for fname in filename])
+        return {
+            fname: json.loads(result.stdout)
+            for fname, result in zip(filename, results, strict=True)
+            if result.status == 0
+        }
 
     def get_facts(self):
         """Get a dictionary representation of all subscription-manager facts"""
@@ -213,7 +213,7 @@ class SystemFacts:
             # if not, then wrap it all under a custom.facts key
             facts_dict = {'custom.facts': facts_dict}
         for filename, facts in facts_dict.items():
-            with NamedTemporaryFile('w+', dir=robottelo_tmp_dir) as tf:
+            with NamedTemporaryFile('w+', dir=get_robottelo_tmp_dir()) as tf:
                 json.dump(facts, tf)
                 tf.flush()
                 self.put(tf.name, f'/etc/rhsm/facts/{filename}')
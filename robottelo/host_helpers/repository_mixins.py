@@ -15,6 +15,7 @@ from robottelo.exceptions import (
     RepositoryAlreadyCreated,
     RepositoryAlreadyDefinedError,
     RepositoryDataNotFound,
+    RepositorySyncError,
 )
 
 
@@ -103,9 +104,19 @@ class BaseRepository:
             self.synchronize()
         return repo_info
 
-    def synchronize(self):
-        """Synchronize the repository"""
-        self.satellite.cli.Repository.synchronize({'id': self.repo_info['id']}, timeout=4800000)
+    def synchronize(self, wait=True):
+        """Synchronize the repository
+
+        :param wait: wait for the synchronization to finish, else only trigger it
+        :return: the id of the synchronization task when not waiting for it
+        """
+        if wait:
+            self.satellite.cli.Repository.synchronize({'id': self.repo_info['id']}, timeout=4800000)
+            return None
+        result = self.satellite.cli.Repository.synchronize(
+            {'id': self.repo_info['id'], 'async': True}
+        )
+        return result[0]['id']
 
     def add_to_content_view(self, organization_id, content_view_id):
         """Associate repository content to content-view"""
@@ -437,7 +448,12 @@ class GenericRHRepository(BaseRepository):
             if synchronize:
                 self.synchronize()
         else:
-            repo_info = super().create(organization_id, product_id, download_policy=download_policy)
+            repo_info = super().create(
+                organization_id,
+                product_id,
+                download_policy=download_policy,
+                synchronize=synchronize,
+            )
         return repo_info
 
 
@@ -640,14 +656,17 @@ class RepositoryCollection:
                 {'organization-id': org_id}
             )
         custom_product_id = custom_product['id'] if custom_product else None
+        # create all the repositories first, then synchronize them concurrently
         for repo in self:
             repo_info = repo.create(
                 org_id,
                 custom_product_id,
                 download_policy=download_policy,
-                synchronize=synchronize,
+                synchronize=False,
             )
             repos_info.append(repo_info)
+        if synchronize:
+            self.synchronize()
         self._custom_product_info = custom_product
         self._repos_info = repos_info
         # Wait for metadata generation for repository creation for specific org
@@ -659,6 +678,27 @@ class RepositoryCollection:
         )
         return custom_product, repos_info
 
+    def synchronize(self, poll_rate=10, timeout=4800):
+        """Trigger the synchronization of all the created repositories, and wait for all of them
+
+        :raises RepositorySyncError: with the failure of each repository that did not synchronize
+        """
+        tasks = {repo.synchronize(wait=False): repo for repo in self}
+        finished_tasks = self.satellite.wait_for_task_ids(
+            tasks, poll_rate=poll_rate, timeout=timeout
+        )
+        failures = {}
+        for task_id, repo in tasks.items():
+            task = finished_tasks[task_id]
+            # a paused task waits for a manual action, it does not synchronize the repository
+            status = 'paused' if task.state == 'paused' else task.result
+            if status != 'success':
+                failures[repo] = f'task {task_id} {status}'
+                if errors := (getattr(task, 'humanized', None) or {}).get('errors'):
+                    failures[repo] += f': {"; ".join(errors)}'
+        if failures:
+            raise RepositorySyncError(failures)
+
     def setup_content_view(self, org_id, lce_id=None):
         """Setup organization content view by adding all the repositories, publishing and promoting
         to lce if needed.
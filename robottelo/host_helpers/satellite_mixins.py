@@ -4,6 +4,7 @@ import json
 import os
 import random
 import re
+import shlex
 from urllib.parse import urljoin
 from urllib.request import urlopen
 
@@ -14,7 +15,7 @@ from wait_for import TimedOutError, wait_for
 import yaml
 
 from robottelo.cli.proxy import CapsuleTunnelError
-from robottelo.config import robottelo_tmp_dir, settings
+from robottelo.config import get_robottelo_tmp_dir, settings
 from robottelo.constants import (
     PULP_EXPORT_DIR,
     PULP_IMPORT_DIR,
@@ -29,6 +30,30 @@ from robottelo.host_helpers.ui_factory import UIFactory
 from robottelo.logging import logger
 from robottelo.utils.installer import InstallerCommand
 
+# Streams every URL once through all the requested hash algorithms, concurrently, without writing
+# it to disk. Runs with the python 3.6 of RHEL 8, and prints {url: {sum_type: checksum or null}}.
+REMOTE_CHECKSUM_SCRIPT = """
+import hashlib, json, sys, urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+urls, sum_types, workers = json.loads(sys.argv[1])
+
+def checksum(url):
+    hashes = [hashlib.new(sum_type[:-3]) for sum_type in sum_types]
+    try:
+        with urllib.request.urlopen(url, timeout=300) as response:
+            for chunk in iter(lambda: response.read(1048576), b''):
+                for digest in hashes:
+                    digest.update(chunk)
+    except Exception:
+        return dict.fromkeys(sum_types)
+    return {sum_type: digest.hexdigest() for sum_type, digest in zip(sum_types, hashes)}
+
+with ThreadPoolExecutor(max_workers=workers) as executor:
+    print(json.dumps(dict(zip(urls, executor.map(checksum, urls)))))
+"""
+REMOTE_PYTHON = '$(command -v python3 || echo /usr/libexec/platform-python)'
+
 
 class EnablePluginsSatellite:
     """Miscellaneous settings helper methods"""
@@ -131,16 +156,39 @@ class ContentInfo:
         :param str sum_type: Checksum type like md5sum, sha256sum, sha512sum, etc.
             Defaults to md5sum.
         :return str: string containing the checksum.
-        :raises: AssertionError: If non-zero return code received (file couldn't be
-            reached or calculation was not successful).
+        :raises: AssertionError: If the file couldn't be reached or calculation was
+            not successful.
+        """
+        return self.checksums_by_url([url], sum_types=[sum_type])[url][sum_type]
+
+    def checksums_by_url(self, urls, sum_types=('md5sum',), workers=8):
+        """Returns the checksums of many files accessible via URL, in a single command.
+
+        Every file is downloaded once by the host, concurrently with the others, and
+        streamed through all the checksum types at the same time, without being stored.
+
+        :param list urls: URLs of the files.
+        :param list sum_types: Checksum types like md5sum, sha256sum, sha512sum, etc.
+            Defaults to md5sum.
+        :param int workers: Number of files downloaded at the same time.
+        :return dict: the checksums of every URL, by checksum type, like
+            ``{url: {'md5sum': '...', 'sha256sum': '...'}}``.
+        :raises: AssertionError: If any file couldn't be reached or calculation was
+            not successful.
         """
-        filename = url.split('/')[-1]
-        result = self.execute(f'wget -q --spider {url}')
+        urls, sum_types = list(dict.fromkeys(urls)), list(sum_types)
+        if not urls:
+            return {}
+        args = json.dumps([urls, sum_types, min(workers, len(urls))])
+        result = self.execute(
+            f'{REMOTE_PYTHON} -c {shlex.quote(REMOTE_CHECKSUM_SCRIPT)} {shlex.quote(args)}'
+        )
         if result.status != 0:
-            raise AssertionError(f'Failed to get `{filename}` from `{url}`.')
-        return self.execute(
-            f'wget -qO - {url} | tee {filename} | {sum_type} | awk \'{{print $1}}\''
-        ).stdout.strip()
+            raise AssertionError(f'Failed to calculate the checksums of {urls}: {result.stderr}')
+        checksums = json.loads(result.stdout)
+        if failed := [url for url, sums in checksums.items() if None in sums.values()]:
+            raise AssertionError(f'Failed to get {failed}.')
+        return checksums
 
     def upload_manifest(self, org_id, manifest=None, interface='API', timeout=None):
         """Upload a manifest using the requested interface.
@@ -171,19 +219,23 @@ class ContentInfo:
             )
         return result
 
-    def publish_content_view(self, org, repo_list, name=None):
+    def publish_content_view(self, org, repo_list, name=None, environments=()):
         """This method publishes the content view for a given organization and repository list.
 
         :param str org: The name of the organization to which the content view belongs
         :param list or str repo_list:  A list of repositories or a single repository
         :param str name: Name of the Content View to create. Defaults to random string.
+        :param environments: Lifecycle environments to promote the published version to.
 
         :return: A dictionary containing the details of the published content view.
         """
         repo = repo_list if isinstance(repo_list, list) else [repo_list]
         name = name or gen_string('alpha')
         content_view = self.api.ContentView(organization=org, repository=repo, name=name).create()
-        content_view.publish()
+        if environments:
+            self.api_factory.publish_promote(content_view, environments)
+        else:
+            content_view.publish()
         return content_view.read()
 
     def move_pulp_archive(self, org, export_message, target=None):
@@ -352,12 +404,13 @@ class SystemInfo:
 class ProvisioningSetup:
     """Provisioning tests setup helper methods"""
 
-    def configure_libvirt_cr(self, server_fqdn=settings.libvirt.libvirt_hostname):
+    def configure_libvirt_cr(self, server_fqdn=None):
         """Configures Libvirt ComputeResource to communicate with Satellite
 
-        :param server_fqdn: Libvirt server FQDN
+        :param server_fqdn: Libvirt server FQDN, defaults to ``settings.libvirt.libvirt_hostname``
         :return: None
         """
+        server_fqdn = server_fqdn or settings.libvirt.libvirt_hostname
         # Generate SSH key-pair for foreman user and copy public key to libvirt server
         self.execute('sudo -u foreman ssh-keygen -q -t rsa -f ~foreman/.ssh/id_rsa -N "" <<< y')
         self.execute('echo "StrictHostKeyChecking accept-new" >> ~foreman/.ssh/config')
@@ -477,7 +530,7 @@ class IoPSetup:
 
         # Set up container image path overrides
         if image_paths := self.get_iop_image_paths():
-            custom_hiera = f'{robottelo_tmp_dir}/custom-hiera.yaml'
+            custom_hiera = f'{get_robottelo_tmp_dir()}/custom-hiera.yaml'
 
             with open(custom_hiera, 'w') as f:
                 yaml.dump(
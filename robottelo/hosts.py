@@ -1,4 +1,5 @@
 import base64
+from concurrent.futures import ThreadPoolExecutor
 from configparser import ConfigParser
 import contextlib
 from contextlib import contextmanager
@@ -11,12 +12,14 @@ from pathlib import Path, PurePath
 import random
 import re
 from tempfile import NamedTemporaryFile
+import threading
 import time
 from urllib.parse import urljoin, urlparse, urlunsplit
+import uuid
 
-import apypie
 from box import Box
 from broker import Broker
+from broker.helpers import Result
 from broker.hosts import Host
 from dynaconf.vendor.box.exceptions import BoxKeyError
 from fauxfactory import gen_alpha, gen_string
@@ -34,7 +37,8 @@ from robottelo.cli.base import Base
 from robottelo.config import (
     configure_airgun,
     configure_nailgun,
-    robottelo_tmp_dir,
+    ensure_airgun_configured,
+    get_robottelo_tmp_dir,
     settings,
 )
 from robottelo.constants import (
@@ -70,8 +74,30 @@ from robottelo.host_helpers import (
 )
 from robottelo.logging import logger
 from robottelo.utils import validate_ssh_pub_key
+from robottelo.utils.apidoc_cache import load_apidoc
 from robottelo.utils.datafactory import valid_emails_list
+from robottelo.utils.entity_tracker import tracked_create
 from robottelo.utils.installer import InstallerCommand
+from robottelo.utils.ui_session_pool import get_ui_session_pool
+
+# commands gathering the facts backing ContentHost cached properties, see ContentHost.gather_facts
+HOST_FACT_COMMANDS = {
+    '_os_release': 'cat /etc/os-release',
+    '_redhat_release': 'cat /etc/redhat-release',
+    'arch': 'uname -m',
+    'is_el': 'stat /etc/redhat-release',
+}
+HOST_FACT_REGEX = re.compile(
+    r'^<<<robottelo-fact:(?P<name>\w+)>>>\n(?P<stdout>.*?)^<<<robottelo-status:(?P<status>\d+)>>>$',
+    re.MULTILINE | re.DOTALL,
+)
+
+# (satellite hostname, registration options, auth username) -> (registration command, timestamp)
+_registration_commands = {}
+_registration_commands_lock = threading.Lock()
+
+# printed by psql after the result of each query of a batch
+DB_QUERY_DELIMITER = '--robottelo-query-end--'
 
 POWER_OPERATIONS = {
     VmState.RUNNING: 'running',
@@ -125,7 +151,6 @@ def get_sat_rhel_version():
 
 class ContentHost(Host, ContentHostMixins):
     run = Host.execute
-    default_timeout = settings.server.ssh_client.command_timeout
     # Extend the keep_keys tuple from the parent class
     keep_keys = (*Host.keep_keys, 'net_type', 'blank')
 
@@ -150,6 +175,16 @@ class ContentHost(Host, ContentHostMixins):
         self.blank = kwargs.get('blank', False)
         super().__init__(hostname=hostname, **kwargs)
 
+    @property
+    def default_timeout(self):
+        if not hasattr(self, '_default_timeout'):
+            self._default_timeout = settings.server.ssh_client.command_timeout
+        return self._default_timeout
+
+    @default_timeout.setter
+    def default_timeout(self, value):
+        self._default_timeout = value
+
     @property
     def network_type(self):
         if not hasattr(self, '_net_type'):
@@ -244,17 +279,12 @@ class ContentHost(Host, ContentHostMixins):
     def arch(self):
         return self.get_facts().get('lscpu.architecture') or self.execute('uname -m').stdout.strip()
 
-    @cached_property
-    def _redhat_release(self):
-        """Process redhat-release file for distro and version information
-        This is a fallback for when /etc/os-release is not available
-        """
-        result = self.execute('cat /etc/redhat-release')
-        if result.status != 0:
-            raise ContentHostError(f'Not able to cat /etc/redhat-release "{result.stderr}"')
-        match = re.match(r'(?P<NAME>.+) release (?P<major>\d+)(.(?P<minor>\d+))?', result.stdout)
+    @staticmethod
+    def _parse_redhat_release(content):
+        """Parse the content of /etc/redhat-release into /etc/os-release like facts"""
+        match = re.match(r'(?P<NAME>.+) release (?P<major>\d+)(.(?P<minor>\d+))?', content)
         if match is None:
-            raise ContentHostError(f'Not able to parse release string "{result.stdout}"')
+            raise ContentHostError(f'Not able to parse release string "{content}"')
         r_release = match.groupdict()
 
         # /etc/os-release compatibility layer
@@ -274,11 +304,33 @@ class ContentHost(Host, ContentHostMixins):
                 break
         return r_release
 
+    @staticmethod
+    def _parse_os_release(content):
+        """Parse the content of /etc/os-release into a dictionary of facts"""
+        facts = {}
+        regex = r'^(["\'])(.*)(\1)$'
+        for ln in [line for line in content.splitlines() if line.strip()]:
+            line = ln.strip()
+            if line.startswith('#'):
+                continue
+            key, value = line.split('=')
+            if key and value:
+                facts[key] = re.sub(regex, r'\2', value).replace('\\', '')
+        return facts
+
+    @cached_property
+    def _redhat_release(self):
+        """Process redhat-release file for distro and version information
+        This is a fallback for when /etc/os-release is not available
+        """
+        result = self.execute('cat /etc/redhat-release')
+        if result.status != 0:
+            raise ContentHostError(f'Not able to cat /etc/redhat-release "{result.stderr}"')
+        return self._parse_redhat_release(result.stdout)
+
     @cached_property
     def _os_release(self):
         """Process os-release file for distro and version information"""
-        facts = {}
-        regex = r'^(["\'])(.*)(\1)$'
         result = self.execute('cat /etc/os-release')
         if result.status != 0:
             logger.info(
@@ -286,14 +338,7 @@ class ContentHost(Host, ContentHostMixins):
                 'falling back to /etc/redhat-release'
             )
             return self._redhat_release
-        for ln in [line for line in result.stdout.splitlines() if line.strip()]:
-            line = ln.strip()
-            if line.startswith('#'):
-                continue
-            key, value = line.split('=')
-            if key and value:
-                facts[key] = re.sub(regex, r'\2', value).replace('\\', '')
-        return facts
+        return self._parse_os_release(result.stdout)
 
     @property
     def os_distro(self):
@@ -342,16 +387,111 @@ class ContentHost(Host, ContentHostMixins):
         """Return a dictionary of cached properties for this class"""
         return {name: getattr(self, name) for name in self.list_cached_properties()}
 
-    def clean_cached_properties(self):
-        """Delete all cached properties for this class"""
-        for name in self.list_cached_properties():
+    def clean_cached_properties(self, names=None):
+        """Delete all cached properties for this class, or only the given ones
+
+        :param names: optional list of cached property names to delete
+        """
+        for name in names or self.list_cached_properties():
             with contextlib.suppress(KeyError):  # ignore if property is not cached
                 del self.__dict__[name]
 
+    def gather_facts(self, names=None):
+        """Populate the cached properties backed by host facts in a single remote call
+
+        The facts are read by one remote script, instead of one remote command per cached
+        property on first access. Facts that could not be gathered are left unpopulated, so the
+        corresponding property keeps its usual behavior when read.
+
+        :param names: optional list of fact names to refresh, from ``HOST_FACT_COMMANDS``,
+            all of them by default
+        :return: a dictionary of the gathered facts
+        """
+        names = list(names or HOST_FACT_COMMANDS)
+        self.clean_cached_properties(names)
+        script = '; '.join(
+            f'echo "<<<robottelo-fact:{name}>>>"; {HOST_FACT_COMMANDS[name]} 2>/dev/null; '
+            f'echo "<<<robottelo-status:$?>>>"'
+            for name in names
+        )
+        results = {
+            match.group('name'): (int(match.group('status')), match.group('stdout'))
+            for match in HOST_FACT_REGEX.finditer(self.execute(script).stdout)
+        }
+        facts = {}
+        if '_redhat_release' in results and results['_redhat_release'][0] == 0:
+            facts['_redhat_release'] = self._parse_redhat_release(results['_redhat_release'][1])
+        if '_os_release' in results:
+            status, stdout = results['_os_release']
+            if status == 0:
+                facts['_os_release'] = self._parse_os_release(stdout)
+            elif '_redhat_release' in facts:
+                facts['_os_release'] = facts['_redhat_release']
+        if 'arch' in results and results['arch'][0] == 0:
+            facts['arch'] = results['arch'][1].strip()
+        if 'is_el' in results:
+            facts['is_el'] = results['is_el'][0] == 0
+        self.__dict__.update(facts)
+        logger.debug(f'Gathered facts {list(facts)} of host {self.hostname}')
+        return facts
+
+    def execute_many(self, commands, stop_on_failure=False, timeout=None):
+        """Run a sequence of commands in a single remote call
+
+        Every command runs in its own subshell, its output and exit status are delimited in the
+        output of the call, so the commands do not share their working directory or variables,
+        as with separate ``execute`` calls.
+
+        :param list commands: the commands to run, in order
+        :param bool stop_on_failure: do not run the commands following a failed one
+        :param timeout: the timeout of the whole call
+        :return: a list of results with the ``status``, ``stdout`` and ``stderr`` of every
+            command that was run, the commands following a failed one have no result when
+            ``stop_on_failure`` is set
+        """
+        if not commands:
+            return []
+        # a marker per call, that the output of the commands can not contain by chance
+        marker = f'robottelo-{uuid.uuid4().hex[:12]}'
+        lines = []
+        for index, command in enumerate(commands):
+            lines += [
+                f"echo '<<<{marker}:start:{index}>>>'; echo '<<<{marker}:start:{index}>>>' >&2",
+                f'(\n{command}\n)',
+                f"status=$?; printf '\\n<<<{marker}:end:%s>>>\\n' $status; "
+                f"printf '\\n<<<{marker}:end:%s>>>\\n' $status >&2",
+            ]
+            if stop_on_failure:
+                lines.append('[ $status -eq 0 ] || exit $status')
+        result = self.execute('\n'.join(lines), timeout=timeout)
+        regex = re.compile(
+            rf'^<<<{marker}:start:(?P<index>\d+)>>>\n(?P<output>.*?)\n<<<{marker}:end:(?P<status>\d+)>>>$',
+            re.MULTILINE | re.DOTALL,
+        )
+        stdout = {int(match.group('index')): match for match in regex.finditer(result.stdout)}
+        stderr = {
+            int(match.group('index')): match.group('output')
+            for match in regex.finditer(result.stderr or '')
+        }
+        results = []
+        for index in range(len(commands)):
+            if index not in stdout:
+                break
+            results.append(
+                Result(
+                    status=int(stdout[index].group('status')),
+                    stdout=stdout[index].group('output'),
+                    stderr=stderr.get(index, ''),
+                )
+            )
+        return results
+
     def setup(self):
         logger.debug('START: setting up host %s', self)
         if not self.blank:
             self.reset_rhsm()
+            if settings.content_host.prefetch_facts:
+                self.gather_facts()
 
         logger.debug('END: setting up host %s', self)
 
@@ -511,13 +651,15 @@ class ContentHost(Host, ContentHostMixins):
     def subscription_manager_environments_set(
         self,
         env_names,
-        username=settings.server.admin_username,
-        password=settings.server.admin_password,
+        username=None,
+        password=None,
     ):
         """
         Reassign the host to the specified content view environments
         """
         assert isinstance(env_names, str)
+        username = username or settings.server.admin_username
+        password = password or settings.server.admin_password
         return self.execute(
             f'subscription-manager environments --set="{env_names}" --username={username} --password={password}'
         )
@@ -622,6 +764,7 @@ class ContentHost(Host, ContentHostMixins):
         auth_password=None,
         download_utility=None,
         setup_container_certs=None,
+        cache_command=False,
     ):
         """Registers content host to the Satellite or Capsule server
         using a global registration template.
@@ -645,6 +788,8 @@ class ContentHost(Host, ContentHostMixins):
         :param auth_username: username required if non-admin user
         :param auth_password: password required if non-admin user
         :param setup_container_certs: Use certificates for container registry authentication.
+        :param cache_command: Reuse the registration command generated for the same options,
+            see ``generate_registration_command``.
         :return: SSHCommandResult instance filled with the result of the registration
         """
         options = {
@@ -699,20 +844,9 @@ class ContentHost(Host, ContentHostMixins):
             options['setup-container-registry-certs'] = str(setup_container_certs).lower()
 
         self._satellite = target.satellite
-        if auth_username and auth_password:
-            user = target.satellite.cli.User.list({'search': f'login={auth_username}'})
-            if user:
-                register_role = target.satellite.cli.Role.info({'name': 'Register hosts'})
-                target.satellite.cli.User.add_role(
-                    {'id': user[0]['id'], 'role-id': register_role['id']}
-                )
-                cmd = target.satellite.cli.HostRegistration.with_user(
-                    auth_username, auth_password
-                ).generate_command(options)
-            else:
-                raise CLIFactoryError(f'User {auth_username} doesn\'t exist')
-        else:
-            cmd = target.satellite.cli.HostRegistration.generate_command(options)
+        cmd = generate_registration_command(
+            target, options, auth_username, auth_password, cache=cache_command
+        )
         return self.execute(cmd.strip('\n'))
 
     def api_register(self, target, **kwargs):
@@ -738,8 +872,8 @@ class ContentHost(Host, ContentHostMixins):
         force=True,
         releasever=None,
         name=None,
-        username=settings.server.admin_username,
-        password=settings.server.admin_password,
+        username=None,
+        password=None,
         serverurl=None,
         baseurl=None,
     ):
@@ -757,8 +891,8 @@ class ContentHost(Host, ContentHostMixins):
         :param org: Organization name to register content host for.
         :param force: Register the content host even if it's already registered
         :param releasever: Set a release version
-        :param username: a user name to register the content host with
-        :param password: the user password
+        :param username: a user name to register the content host with, defaults to the admin user
+        :param password: the user password, defaults to the admin password
         :param name: name of the system to register, defaults to the hostname
         :param serverurl: name of the subscription service with which to
             register the system
@@ -768,6 +902,8 @@ class ContentHost(Host, ContentHostMixins):
             registration.
         """
 
+        username = username or settings.server.admin_username
+        password = password or settings.server.admin_password
         userpass = f' --username {username} --password {password}' if username and password else ''
         # Setup the base command
         cmd = 'subscription-manager register'
@@ -841,12 +977,12 @@ class ContentHost(Host, ContentHostMixins):
         then continue with the upload.
         """
         if temp_file:
-            with NamedTemporaryFile(dir=robottelo_tmp_dir) as content_file:
+            with NamedTemporaryFile(dir=get_robottelo_tmp_dir()) as content_file:
                 content_file.write(str.encode(local_path))
                 content_file.flush()
                 self.session.sftp_write(source=content_file.name, destination=remote_path)
         elif 'utils.manifest' in str(local_path):
-            with NamedTemporaryFile(dir=robottelo_tmp_dir) as content_file:
+            with NamedTemporaryFile(dir=get_robottelo_tmp_dir()) as content_file:
                 content_file.write(local_path.content.read())
                 content_file.flush()
                 self.session.sftp_write(source=content_file.name, destination=remote_path)
@@ -866,27 +1002,33 @@ class ContentHost(Host, ContentHostMixins):
         if result.status != 0:
             raise CLIFactoryError(f'Failed to chmod ssh key file:\n{result.stderr}')
 
-    def enable_rhsm_proxy(self, hostname, port=None):
-        """Configures HTTP proxy for subscription manager"""
+    @staticmethod
+    def _rhsm_proxy_command(hostname, port=None):
         cmd = f"subscription-manager config --server.proxy_hostname={hostname}"
         if port:
             cmd += f' --server.proxy_port={port}'
+        return cmd
+
+    @staticmethod
+    def _dnf_proxy_command(hostname, scheme=None, port=None):
+        proxy = f'{scheme or "http"}://{hostname}'
+        if port:
+            proxy += f':{port}'
+        # yum.conf is used when there is no dnf.conf
+        return (
+            'conf=/etc/dnf/dnf.conf; test -f $conf || conf=/etc/yum.conf; '
+            f"echo -e 'proxy = {proxy}' >> $conf"
+        )
+
+    def enable_rhsm_proxy(self, hostname, port=None):
+        """Configures HTTP proxy for subscription manager"""
         logger.info(f'Configuring {hostname} HTTP proxy for subscription manager.')
-        self.execute(cmd)
+        self.execute(self._rhsm_proxy_command(hostname, port))
 
     def enable_dnf_proxy(self, hostname, scheme=None, port=None):
         """Configures HTTP proxy for dnf"""
-        if not scheme:
-            scheme = 'http'
-        cmd = f"echo -e 'proxy = {scheme}://{hostname}"
-        if port:
-            cmd += f':{port}'
-        if self.execute('test -f /etc/dnf/dnf.conf').status == 0:
-            cmd += "' >> /etc/dnf/dnf.conf"
-        else:
-            cmd += "' >> /etc/yum.conf"
         logger.info(f'Configuring {hostname} HTTP proxy for dnf.')
-        self.execute(cmd)
+        self.execute(self._dnf_proxy_command(hostname, scheme, port))
 
     def enable_ipv6_rhsm_proxy(self):
         """Execute procedures for enabling rhsm IPv6 HTTP Proxy"""
@@ -929,8 +1071,14 @@ class ContentHost(Host, ContentHostMixins):
     def enable_ipv6_dnf_and_rhsm_proxy(self):
         """Execute procedures for enabling rhsm and dnf IPv6 HTTP Proxy"""
         if not self.network_type.has_ipv4:
-            self.enable_ipv6_rhsm_proxy()
-            self.enable_ipv6_dnf_proxy()
+            url = urlparse(settings.http_proxy.http_proxy_ipv6_url)
+            logger.info(f'Configuring {url.hostname} HTTP proxy for subscription manager and dnf.')
+            self.execute_many(
+                [
+                    self._rhsm_proxy_command(url.hostname, url.port),
+                    self._dnf_proxy_command(url.hostname, url.scheme, url.port),
+                ]
+            )
 
     def add_authorized_key(self, pub_key):
         """Inject a public key into the authorized keys file
@@ -1635,7 +1783,7 @@ class ContentHost(Host, ContentHostMixins):
             auth_str = f'{username}:{password}'
             auth_b64 = base64.b64encode(auth_str.encode()).decode()
             auth_data = {'auths': {f'{registry}': {'auth': auth_b64}}}
-            local_authfile_path = f'{robottelo_tmp_dir}/podman-auth.json'
+            local_authfile_path = f'{get_robottelo_tmp_dir()}/podman-auth.json'
             with open(local_authfile_path, 'w') as f:
                 json.dump(auth_data, f)
             self.put(local_authfile_path, constants.PODMAN_AUTHFILE_PATH)
@@ -1684,6 +1832,88 @@ class ContentHost(Host, ContentHostMixins):
             logger.warning(f'Podman is not logged into container registry {registry}')
 
 
+def generate_registration_command(
+    target, options, auth_username=None, auth_password=None, cache=False
+):
+    """Generate a global registration command for a Satellite or Capsule
+
+    :param target: Satellite or Capsule object to register to.
+    :param options: the ``hammer host-registration generate-command`` options.
+    :param auth_username: username required if non-admin user, granted the Register hosts role.
+    :param auth_password: password required if non-admin user
+    :param cache: reuse the command generated for the same target, options and user, as long as
+        it is younger than ``settings.content_host.registration_command_ttl`` seconds.
+    :return: the registration command
+    """
+    key = (
+        target.satellite.hostname,
+        tuple(sorted((name, str(value)) for name, value in options.items())),
+        auth_username if auth_username and auth_password else None,
+    )
+    if cache:
+        with _registration_commands_lock:
+            cached = _registration_commands.get(key)
+        if cached and time.time() - cached[1] < settings.content_host.registration_command_ttl:
+            return cached[0]
+    if auth_username and auth_password:
+        user = target.satellite.cli.User.list({'search': f'login={auth_username}'})
+        if user:
+            register_role = target.satellite.cli.Role.info({'name': 'Register hosts'})
+            target.satellite.cli.User.add_role(
+                {'id': user[0]['id'], 'role-id': register_role['id']}
+            )
+            cmd = target.satellite.cli.HostRegistration.with_user(
+                auth_username, auth_password
+            ).generate_command(options)
+        else:
+            raise CLIFactoryError(f'User {auth_username} doesn\'t exist')
+    else:
+        cmd = target.satellite.cli.HostRegistration.generate_command(options)
+    if cache:
+        with _registration_commands_lock:
+            _registration_commands[key] = (cmd, time.time())
+    return cmd
+
+
+def clear_registration_commands():
+    """Forget all the cached registration commands"""
+    with _registration_commands_lock:
+        _registration_commands.clear()
+
+
+def register_many(hosts, *args, max_workers=None, **kwargs):
+    """Register several content hosts concurrently with the same registration options
+
+    The registration command is generated once for all the hosts, see
+    ``generate_registration_command``, then run on the hosts by a pool of threads.
+
+    :param hosts: list of ContentHost objects to register
+    :param max_workers: maximum number of concurrent registrations, defaults to
+        ``settings.content_host.registration_workers``
+    :param args: positional arguments of ``ContentHost.register``
+    :param kwargs: keyword arguments of ``ContentHost.register``
+    :return: list of the registration results, in the order of the hosts. The exception is
+        returned instead of the result for a host whose registration raised.
+    """
+    if not hosts:
+        return []
+    kwargs['cache_command'] = True
+
+    def _register(host):
+        try:
+            return host.register(*args, **kwargs)
+        except Exception as err:
+            logger.warning(f'Registration of host {host.hostname} failed: {err}')
+            return err
+
+    # the first registration generates the command, and grants the user role, for the others
+    results = [_register(hosts[0])]
+    workers = max_workers or settings.content_host.registration_workers
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results.extend(executor.map(_register, hosts[1:]))
+    return results
+
+
 class Capsule(ContentHost, CapsuleMixins):
     rex_key_path = '~foreman-proxy/.ssh/id_rsa_foreman_proxy.pub'
     product_rpm_name = 'satellite-capsule'
@@ -2027,6 +2257,23 @@ class Capsule(ContentHost, CapsuleMixins):
         )
         return
 
+    def _run_psql_script(self, script, db='foreman'):
+        """Run a psql script in a single remote call and return its unaligned, tuples-only output.
+
+        The script is passed through a quoted heredoc, so queries don't need any shell escaping.
+
+        Raises:
+            CLIReturnCodeError: If any statement of the script fails
+        """
+        cmd = (
+            f'sudo -u postgres psql -d {db} -X -q -A -t -v ON_ERROR_STOP=1 '
+            f"<<'ROBOTTELO_SQL'\n{script}\nROBOTTELO_SQL"
+        )
+        result = self.execute(cmd)
+        if result.status != 0:
+            raise CLIReturnCodeError(result.status, result.stderr, f'psql script on {db} failed')
+        return result.stdout
+
     def query_db(self, query, db='foreman', output_format='json'):
         """Execute a PostgreSQL query and return the result.
 
@@ -2041,22 +2288,59 @@ class Capsule(ContentHost, CapsuleMixins):
         Raises:
             CLIReturnCodeError: If the database query fails
         """
+        if output_format == 'json':
+            return self.query_db_batch([query], db=db)[0]
 
-        def _execute_db_query(cmd):
-            result = self.execute(cmd)
-            if result.status != 0:
-                raise CLIReturnCodeError(result.status, result.stderr, f'"{cmd}" failed')
-            return result
+        cmd = f'sudo -u postgres psql -d {db} -c "{query}"'
+        result = self.execute(cmd)
+        if result.status != 0:
+            raise CLIReturnCodeError(result.status, result.stderr, f'"{cmd}" failed')
+        return result.stdout
 
-        base_cmd = f'sudo -u postgres psql -d {db}'
+    def query_db_batch(self, queries, db='foreman'):
+        """Execute several PostgreSQL queries in a single psql process and SSH round trip.
 
-        if output_format == 'json':
-            cmd = f'{base_cmd} -A -t -c "SELECT json_agg(row_to_json(t)) FROM ({query}) t"'
-            result = _execute_db_query(cmd)
-            return json.loads(result.stdout) if result.stdout.strip() else []
+        Args:
+            queries: list of SQL queries to execute, in order
+            db: Database name (default: 'foreman')
+
+        Returns:
+            list with, for each query, the list of dicts of its rows
+
+        Raises:
+            CLIReturnCodeError: If any of the queries fails
+        """
+        script = '\n'.join(
+            f'SELECT json_agg(row_to_json(t)) FROM ({query.strip().rstrip(";")}) t;\n'
+            f'\\echo {DB_QUERY_DELIMITER}'
+            for query in queries
+        )
+        outputs = self._run_psql_script(script, db=db).split(DB_QUERY_DELIMITER)
+        return [json.loads(output) if output.strip() else [] for output in outputs[: len(queries)]]
+
+    def query_db_rows(self, query, db='foreman', fetch_count=1000):
+        """Execute a PostgreSQL query and yield its rows one by one.
+
+        psql fetches the rows through a cursor, ``fetch_count`` rows at a time, and prints one JSON
+        document per row, so neither the database nor psql build the whole result set in memory,
+        unlike the ``json_agg`` used by :meth:`query_db`. The output of psql is still read at once
+        over SSH, before the first row is parsed and yielded.
 
-        cmd = f'{base_cmd} -c "{query}"'
-        return _execute_db_query(cmd).stdout
+        Args:
+            query: SQL query to execute
+            db: Database name (default: 'foreman')
+            fetch_count: number of rows fetched from the cursor at a time
+
+        Yields:
+            a dict per row
+        """
+        script = (
+            f'\\set FETCH_COUNT {fetch_count}\n'
+            f'SELECT row_to_json(t) FROM ({query.strip().rstrip(";")}) t;'
+        )
+        for line in self._run_psql_script(script, db=db).splitlines():
+            if line.strip():
+                yield json.loads(line)
 
     def load_remote_yaml_file(self, file_path):
         """Load a remote yaml file and return a Box object"""
@@ -2123,7 +2407,11 @@ class Satellite(Capsule, SatelliteMixins):
             try:
                 if Entity in obj.mro():
                     #  create a copy of the class and inject our server config into the __init__
-                    new_cls = type(name, (obj,), {})
+                    #  the entities created by the copy are recorded by the entity tracker
+                    attrs = {}
+                    if hasattr(obj, 'create'):
+                        attrs['create'] = tracked_create(self, name, obj.create)
+                    new_cls = type(name, (obj,), attrs)
                     setattr(self._api, name, inject_config(new_cls, self.nailgun_cfg))
             except AttributeError:
                 # not everything has an mro method, we don't care about them
@@ -2133,15 +2421,9 @@ class Satellite(Capsule, SatelliteMixins):
 
     @property
     def apidoc(self):
-        """Provide Satellite's apidoc via apypie"""
+        """Provide Satellite's apidoc via apypie, cached on disk by Satellite version"""
         if not self._apidoc:
-            self._apidoc = apypie.Api(
-                uri=self.url,
-                username=settings.server.admin_username,
-                password=settings.server.admin_password,
-                api_version=2,
-                verify_ssl=settings.server.verify_ca,
-            ).apidoc
+            self._apidoc = load_apidoc(self)
         return self._apidoc
 
     @property
@@ -2200,9 +2482,10 @@ class Satellite(Capsule, SatelliteMixins):
 
     @contextmanager
     def ui_session(self, testname=None, user=None, password=None, url=None, login=True):
-        """Initialize an airgun Session object and store it as self.ui_session"""
+        """Initialize an airgun Session object and store it as self.ui_session
 
-        from airgun.session import Session
+        The logged-in sessions are leased from the active UI session pool, if any.
+        """
 
         def get_caller():
             import inspect
@@ -2212,9 +2495,29 @@ class Satellite(Capsule, SatelliteMixins):
                     return frame.function
             return None
 
+        testname = testname or get_caller()
+        pool = get_ui_session_pool()
+        if pool is not None and url is None and login:
+            with pool.lease(
+                self,
+                testname,
+                user or settings.server.admin_username,
+                password or settings.server.admin_password,
+            ) as ui_session:
+                yield ui_session
+            return
+        with self._start_ui_session(testname, user, password, url, login) as ui_session:
+            yield ui_session
+
+    @contextmanager
+    def _start_ui_session(self, testname=None, user=None, password=None, url=None, login=True):
+        """Start a new airgun Session"""
+        ensure_airgun_configured()
+        from airgun.session import Session
+
         try:
             with Session(
-                session_name=testname or get_caller(),
+                session_name=testname,
                 user=user or settings.server.admin_username,
                 password=password or settings.server.admin_password,
                 url=url,
@@ -1,6 +1,9 @@
+import atexit
 import logging
+from logging.handlers import BaseRotatingHandler, QueueHandler, QueueListener
 import os
 from pathlib import Path
+import queue
 
 from box import Box
 import logzero
@@ -86,3 +89,160 @@ config_logger = logzero.setup_logger(
     fileLoglevel=logging_yaml.config.fileLevel,
     formatter=defaultFormatter,
 )
+
+
+class OverflowQueueHandler(QueueHandler):
+    """Enqueue the records without blocking, and count the records dropped when the queue is full
+
+    Records of ``block_level`` and above are not dropped right away, they wait up to
+    ``block_timeout`` seconds for a free slot.
+
+    :param log_queue: the bounded queue shared with the listener
+    :param route: the name of the listener route of the records, see ``BatchQueueListener``
+    """
+
+    def __init__(self, log_queue, route, block_level=logging.WARNING, block_timeout=5):
+        super().__init__(log_queue)
+        self.route = route
+        self.block_level = block_level
+        self.block_timeout = block_timeout
+        self.dropped = 0
+
+    def prepare(self, record):
+        record = super().prepare(record)
+        record.queue_route = self.route
+        return record
+
+    def enqueue(self, record):
+        try:
+            if record.levelno >= self.block_level:
+                self.queue.put(record, timeout=self.block_timeout)
+            else:
+                self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class BatchQueueListener(QueueListener):
+    """Write the queued records from a background thread, flushing the handlers once per batch
+
+    :param log_queue: the queue of the records
+    :param routes: a dictionary of the handlers of each route
+    :param batch_size: the maximum number of records written before the handlers are flushed
+    """
+
+    def __init__(self, log_queue, routes, batch_size=100):
+        super().__init__(log_queue, respect_handler_level=True)
+        self.routes = routes
+        self.batch_size = batch_size
+        self._pending = []
+
+    def enqueue_sentinel(self):
+        # the queue may be full, wait for the thread to make room instead of failing
+        self.queue.put(self._sentinel)
+
+    def handle(self, record):
+        self._pending.append(record)
+        # the batch is written when it is full, or when there is nothing more to wait for
+        if len(self._pending) >= self.batch_size or self.queue.empty():
+            self.flush()
+
+    def flush(self):
+        """Write the pending records to the handlers of their routes"""
+        batches = {}
+        for record in self._pending:
+            for handler in self.routes.get(record.queue_route, ()):
+                if record.levelno >= handler.level:
+                    batches.setdefault(handler, []).append(record)
+        self._pending = []
+        for handler, records in batches.items():
+            self._write(handler, records)
+
+    @staticmethod
+    def _write(handler, records):
+        if not isinstance(handler, logging.StreamHandler) or isinstance(
+            handler, BaseRotatingHandler
+        ):
+            # rotating and other handlers need to process each record
+            for record in records:
+                handler.handle(record)
+            return
+        handler.acquire()
+        try:
+            if handler.stream is None:
+                # FileHandler opened with delay
+                handler.stream = handler._open()
+            handler.stream.write(
+                ''.join(
+                    handler.format(record) + handler.terminator
+                    for record in records
+                    if handler.filter(record)
+                )
+            )
+            handler.flush()
+        except Exception:
+            handler.handleError(records[-1])
+        finally:
+            handler.release()
+
+
+_queue_logging = {}
+
+
+def enable_queue_logging(loggers=None, size=None, batch_size=None):
+    """Write the logs of the given loggers from a background thread
+
+    The handlers of the loggers are replaced by an ``OverflowQueueHandler``, and moved to a
+    ``BatchQueueListener`` started for the process. Records are dropped when the bounded queue is
+    full, see ``get_queue_logging_stats``.
+
+    :param loggers: the loggers to handle, the robottelo loggers by default
+    :param size: the maximum number of queued records, from logging.yaml by default
+    :param batch_size: the maximum number of records per batch, from logging.yaml by default
+    """
+    if _queue_logging:
+        return
+    queue_config = logging_yaml.get('queue') or {}
+    log_queue = queue.Queue(size or queue_config.get('size', 10000))
+    routes = {}
+    original_handlers = {}
+    queue_handlers = []
+    for _logger in loggers or (logger, collection_logger, config_logger):
+        original_handlers[_logger] = _logger.handlers[:]
+        routes[_logger.name] = _logger.handlers[:]
+        queue_handler = OverflowQueueHandler(log_queue, route=_logger.name)
+        _logger.handlers = [queue_handler]
+        queue_handlers.append(queue_handler)
+    listener = BatchQueueListener(
+        log_queue, routes, batch_size=batch_size or queue_config.get('batch_size', 100)
+    )
+    listener.start()
+    _queue_logging.update(
+        listener=listener, original_handlers=original_handlers, queue_handlers=queue_handlers
+    )
+    atexit.register(disable_queue_logging)
+
+
+def get_queue_logging_stats():
+    """Return the number of queued and dropped records of the queue logging pipeline"""
+    if not _queue_logging:
+        return {'queued': 0, 'dropped': 0}
+    return {
+        'queued': _queue_logging['listener'].queue.qsize(),
+        'dropped': sum(handler.dropped for handler in _queue_logging['queue_handlers']),
+    }
+
+
+def disable_queue_logging():
+    """Write the queued records, stop the background thread and restore the original handlers"""
+    if not _queue_logging:
+        return
+    stats = get_queue_logging_stats()
+    listener = _queue_logging['listener']
+    listener.stop()
+    listener.flush()
+    for _logger, handlers in _queue_logging['original_handlers'].items():
+        _logger.handlers = handlers
+    _queue_logging.clear()
+    if stats['dropped']:
+        logger.warning(f'{stats["dropped"]} log records were dropped, the log queue was full')
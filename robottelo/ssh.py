@@ -55,7 +55,15 @@ def command(
         net_type=net_type,
     )
     result = client.execute(cmd, timeout=timeout)
+    return parse_output(result, output_format)
 
+
+def parse_output(result, output_format=None):
+    """Parse the stdout of a successful command result in place
+
+    :param result: the command result
+    :param str output_format: json, csv or None
+    """
     if output_format and result.status == 0:
         if output_format == 'csv':
             result.stdout = hammer.parse_csv(result.stdout) if result.stdout else {}
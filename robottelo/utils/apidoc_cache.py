@@ -0,0 +1,108 @@
+"""On-disk cache of the Satellite apidoc, shared by every Satellite object and xdist worker.
+
+Downloading and parsing the apidoc of a Satellite takes seconds, and ``apypie`` caches it per URL
+without ever invalidating it. The apidoc is cached here as a pickle in ``robottelo_tmp_dir``, keyed
+by the Satellite version and by the ``Apipie-Checksum`` header the server sends with every API
+response, so a Satellite upgrade or a plugin installation changes the key and the apidoc is fetched
+again. Satellites with the same version and checksum share the same entry, and the entries that
+were not used for :data:`MAX_AGE` seconds are pruned.
+"""
+
+import hashlib
+from pathlib import Path
+import pickle
+import tempfile
+import time
+
+import requests
+
+from robottelo.config import get_robottelo_tmp_dir, settings
+from robottelo.logging import logger as _root_logger
+from robottelo.utils.shared_state import SharedState
+
+logger = _root_logger.getChild('apidoc_cache')
+
+CACHE_DIR = 'apidoc_cache'
+CHECKSUM_HEADER = 'Apipie-Checksum'
+# seconds after which an unused entry is pruned
+MAX_AGE = 7 * 24 * 3600
+# seconds a worker waits for the apidoc downloaded by another one
+LOCK_TIMEOUT = 600
+
+# the apidocs loaded by this process, by cache key
+_loaded = {}
+
+
+def fetch_checksum(satellite):
+    """Return the apidoc checksum of the Satellite, or None when the server does not send it"""
+    response = requests.get(
+        f'{satellite.url}/api/status',
+        auth=(settings.server.admin_username, settings.server.admin_password),
+        verify=settings.server.verify_ca,
+    )
+    response.raise_for_status()
+    return response.headers.get(CHECKSUM_HEADER)
+
+
+def fetch_apidoc(satellite):
+    """Download the apidoc of the Satellite, bypassing the persistent cache of apypie"""
+    # apypie is only imported by the tests using the apidoc, not by every import of robottelo.hosts
+    import apypie
+
+    with tempfile.TemporaryDirectory() as apidoc_cache_dir:
+        return apypie.Api(
+            uri=satellite.url,
+            username=settings.server.admin_username,
+            password=settings.server.admin_password,
+            api_version=2,
+            verify_ssl=settings.server.verify_ca,
+            apidoc_cache_dir=apidoc_cache_dir,
+        ).apidoc
+
+
+def cache_key(satellite, checksum):
+    """Return the cache key of the apidoc of a Satellite
+
+    Without a checksum, the apidoc can only be shared by the objects of the same Satellite.
+    """
+    if checksum is None:
+        checksum = hashlib.sha256(satellite.hostname.encode()).hexdigest()[:16]
+    return f'{satellite.version}-{checksum}'
+
+
+def _prune(cache_dir, keep):
+    now = time.time()
+    for path in cache_dir.glob('*.pickle'):
+        if path != keep and now - path.stat().st_mtime > MAX_AGE:
+            path.unlink(missing_ok=True)
+
+
+def load_apidoc(satellite, cache_dir=None):
+    """Return the apidoc of a Satellite, from the cache when it is up to date
+
+    :param satellite: the :class:`~robottelo.hosts.Satellite` of the apidoc
+    :param cache_dir: directory of the cache, defaults to a directory in ``robottelo_tmp_dir``
+    :return: the apidoc, as a dict
+    """
+    key = cache_key(satellite, fetch_checksum(satellite))
+    if key in _loaded:
+        return _loaded[key]
+    cache_dir = Path(cache_dir or get_robottelo_tmp_dir() / CACHE_DIR)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    path = cache_dir / f'{key}.pickle'
+    # the lock lets a single worker download a missing apidoc, the others wait for its entry
+    with SharedState(CACHE_DIR, state_dir=cache_dir, lock_timeout=LOCK_TIMEOUT).lock():
+        try:
+            apidoc = pickle.loads(path.read_bytes())
+            path.touch()
+            logger.debug(f'Loaded the apidoc {key} from the cache')
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+            # a missing or corrupted entry, or one written with a newer pickle protocol
+            apidoc = fetch_apidoc(satellite)
+            tmp_path = path.with_suffix('.tmp')
+            tmp_path.write_bytes(pickle.dumps(apidoc, protocol=pickle.HIGHEST_PROTOCOL))
+            tmp_path.replace(path)
+            logger.info(f'Cached the apidoc {key} of {satellite.hostname}')
+            _prune(cache_dir, keep=path)
+    _loaded[key] = apidoc
+    return apidoc
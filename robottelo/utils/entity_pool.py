@@ -0,0 +1,320 @@
+"""Pool recycling the organizations, locations, products and lifecycle environments of fixtures.
+
+Creating a Katello organization or product takes seconds, and the fixtures creating them for every
+test leave them behind, so the Satellite database grows and every later search gets slower. With
+``performance.entity_pool.enabled``, the fixtures lease their entities from a pool instead::
+
+    with pooled_entity(request, target_sat, 'organization') as org:
+        yield org
+
+Organizations and locations are created in bulk on the first lease. When the fixture is torn down,
+the entity is read again: it goes back to the pool under a new name if it is still clean, that is
+if its fields were not changed and no other entity was created in it, otherwise it is discarded.
+Products and lifecycle environments are pooled per organization, and only when their organization
+is pooled. At the end of the session, the pooled and discarded locations and organizations are
+deleted in bulk, deleting an organization deletes its products and lifecycle environments.
+
+The pooled products and lifecycle environments of an organization are deleted when the
+organization is released, so a recycled organization holds no content of the previous tests. The
+pool of a Satellite is local to the process. Tests needing entities that were
+never used by another test, like tests counting the content of their organization, can opt out
+with the ``fresh_entities`` marker.
+"""
+
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from fauxfactory import gen_string
+
+from robottelo.config import settings
+from robottelo.constants import DEFAULT_CV, ENVIRONMENT
+from robottelo.logging import logger as _root_logger
+from robottelo.utils.entity_tracker import untracked
+
+logger = _root_logger.getChild('entity_pool')
+
+# number of threads creating and deleting entities in bulk
+BULK_WORKERS = 5
+
+
+def _create_organization(satellite, parent):
+    return satellite.api.Organization().create()
+
+
+def _create_location(satellite, parent):
+    if parent is None:
+        return satellite.api.Location().create()
+    return satellite.api.Location(organization=[parent]).create()
+
+
+def _create_product(satellite, parent):
+    return satellite.api.Product(organization=parent).create()
+
+
+def _create_lifecycle_environment(satellite, parent):
+    return satellite.api.LifecycleEnvironment(organization=parent).create()
+
+
+def _organization_is_clean(pool, org):
+    """Check that the organization holds no content, the pooled products and environments of the
+    organization are deleted before"""
+    api = pool.satellite.api
+    if api.Product(organization=org).search(query={'per_page': 'all'}) or any(
+        lce.name != ENVIRONMENT
+        for lce in api.LifecycleEnvironment(organization=org).search(query={'per_page': 'all'})
+    ):
+        return False
+    content_views = api.ContentView(organization=org).search()
+    return not (
+        any(cv.name != DEFAULT_CV for cv in content_views)
+        or api.ActivationKey(organization=org).search()
+        or api.Subscription(organization=org).search()
+        or api.Host().search(query={'search': f'organization_id={org.id}'})
+    )
+
+
+def _location_is_clean(pool, location):
+    return not pool.satellite.api.Host().search(query={'search': f'location_id={location.id}'})
+
+
+def _product_is_clean(pool, product):
+    return not pool.satellite.api.Repository(product=product).search()
+
+
+def _lifecycle_environment_is_clean(pool, lce):
+    api = pool.satellite.api
+    successors = [
+        env
+        for env in api.LifecycleEnvironment(organization=lce.organization).search()
+        if getattr(env, 'prior', None) is not None and env.prior.id == lce.id
+    ]
+    return not successors and not api.ContentViewVersion().search(query={'environment_id': lce.id})
+
+
+# the entities that can be pooled, with their parent kind, and how they are created and checked
+ENTITY_KINDS = {
+    'organization': {
+        'parent': None,
+        'create': _create_organization,
+        'is_clean': _organization_is_clean,
+    },
+    'location': {
+        'parent': 'organization',
+        'create': _create_location,
+        'is_clean': _location_is_clean,
+    },
+    'product': {
+        'parent': 'organization',
+        'create': _create_product,
+        'is_clean': _product_is_clean,
+    },
+    'lifecycle_environment': {
+        'parent': 'organization',
+        'create': _create_lifecycle_environment,
+        'is_clean': _lifecycle_environment_is_clean,
+    },
+}
+# kinds deleted by the garbage collection, in this order, the others are deleted with their parent
+COLLECTED_KINDS = ('location', 'organization')
+# kinds of the content of an organization, deleted when the organization is released
+CONTENT_KINDS = ('product', 'lifecycle_environment')
+# fields derived from the name, which changes when an entity is recycled
+NAME_FIELDS = ('name', 'title')
+
+
+def fingerprint(entity):
+    """Return the field values of an entity that a test should not leave changed"""
+    values = {}
+    for name, value in entity.get_values().items():
+        if name in NAME_FIELDS:
+            continue
+        if hasattr(value, 'id'):
+            value = value.id
+        elif isinstance(value, list):
+            value = sorted(getattr(item, 'id', item) for item in value)
+        values[name] = value
+    return values
+
+
+class EntityPool:
+    """Lease recycled entities of a Satellite
+
+    :param satellite: the Satellite the entities are created on
+    :param int size: number of organizations and locations created in bulk when the pool is empty
+    """
+
+    def __init__(self, satellite, size=None):
+        self.satellite = satellite
+        self.size = settings.performance.entity_pool.size if size is None else size
+        # the entities created by the pool, with their kind, parent id and fingerprint
+        self.owned = {}
+        # the clean entities ready to be leased, by kind and parent id
+        self.available = defaultdict(list)
+        self.stats = defaultdict(lambda: {'leases': 0, 'recycled': 0, 'discarded': 0})
+
+    def _owns(self, entity):
+        return entity is not None and (type(entity).__name__, entity.id) in self.owned
+
+    def _track(self, kind, entity, parent_id):
+        self.owned[type(entity).__name__, entity.id] = {
+            'kind': kind,
+            'entity': entity,
+            'parent_id': parent_id,
+            'fingerprint': fingerprint(entity),
+        }
+        return entity
+
+    def _create(self, kind, parent, count):
+        create = ENTITY_KINDS[kind]['create']
+        # the pooled entities are deleted by the pool, not by the entity tracker
+        with untracked():
+            if count == 1:
+                return [create(self.satellite, parent)]
+            with ThreadPoolExecutor(max_workers=min(count, BULK_WORKERS)) as executor:
+                futures = [executor.submit(create, self.satellite, parent) for _ in range(count)]
+            return [future.result() for future in futures]
+
+    def _drop_content(self, org):
+        """Delete the pooled products and lifecycle environments of an organization"""
+        for kind in CONTENT_KINDS:
+            for entity in self.available.pop((kind, org.id), []):
+                entity.delete()
+                del self.owned[type(entity).__name__, entity.id]
+
+    def available_children(self, parent):
+        """Return the available entities of the pool that belong to the parent entity"""
+        return [
+            entity
+            for (kind, parent_id), entities in self.available.items()
+            if parent_id == parent.id and ENTITY_KINDS[kind]['parent'] == 'organization'
+            for entity in entities
+        ]
+
+    def acquire(self, kind, parent=None):
+        """Lease an entity of the kind, creating it when none is available
+
+        :param str kind: one of :data:`ENTITY_KINDS`
+        :param parent: the organization of the entity, the entity is only pooled when the
+            organization itself was leased from the pool
+        """
+        if parent is not None and not self._owns(parent):
+            return ENTITY_KINDS[kind]['create'](self.satellite, parent)
+        parent_id = getattr(parent, 'id', None)
+        available = self.available[kind, parent_id]
+        self.stats[kind]['leases'] += 1
+        if available:
+            self.stats[kind]['recycled'] += 1
+            return available.pop(0)
+        # the children of an organization are only leased by the tests using the organization
+        count = self.size if parent is None else 1
+        entities = [
+            self._track(kind, entity, parent_id) for entity in self._create(kind, parent, count)
+        ]
+        if kind == 'location' and parent is not None:
+            # the organization of a new location lists it
+            self.owned[type(parent).__name__, parent.id]['fingerprint'] = fingerprint(parent.read())
+        available.extend(entities[1:])
+        return entities[0]
+
+    def release(self, entity):
+        """Return a leased entity to the pool, or discard it when it is not clean anymore"""
+        if not self._owns(entity):
+            return
+        record = self.owned[type(entity).__name__, entity.id]
+        kind = record['kind']
+        try:
+            current = entity.read()
+            clean = fingerprint(current) == record['fingerprint']
+            if clean and kind == 'organization':
+                # a recycled organization holds no content of the previous tests
+                self._drop_content(current)
+            clean = clean and ENTITY_KINDS[kind]['is_clean'](self, current)
+            if clean:
+                # a new name, so the next test does not find the name used by the previous one
+                current.name = gen_string('alpha')
+                current = current.update(['name'])
+                # the fields derived from the name, like the title, changed with it
+                record['fingerprint'] = fingerprint(current)
+        except Exception as err:
+            logger.warning(f'Unable to recycle the {kind} {entity.id}: {err}')
+            clean = False
+        if clean:
+            record['entity'] = current
+            self.available[kind, record['parent_id']].append(current)
+            return
+        # the discarded entity is still owned, and deleted by the garbage collection
+        self.stats[kind]['discarded'] += 1
+        if kind == 'organization':
+            # the pooled children of the organization are deleted with it
+            for (child_kind, parent_id), children in self.available.items():
+                if parent_id == entity.id and ENTITY_KINDS[child_kind]['parent'] == 'organization':
+                    children.clear()
+
+    def collect(self):
+        """Delete all the entities created by the pool, in bulk
+
+        :return: the number of deleted entities
+        """
+        deleted = 0
+        for kind in COLLECTED_KINDS:
+            entities = [
+                record['entity'] for record in self.owned.values() if record['kind'] == kind
+            ]
+            if not entities:
+                continue
+            with ThreadPoolExecutor(max_workers=BULK_WORKERS) as executor:
+                futures = {executor.submit(entity.delete): entity for entity in entities}
+            for future, entity in futures.items():
+                if err := future.exception():
+                    logger.warning(f'Unable to delete the pooled {kind} {entity.id}: {err}')
+                else:
+                    deleted += 1
+        self.owned.clear()
+        self.available.clear()
+        return deleted
+
+
+_pools = {}
+
+
+def get_entity_pool(satellite):
+    """Return the entity pool of a Satellite"""
+    if satellite.hostname not in _pools:
+        _pools[satellite.hostname] = EntityPool(satellite)
+    return _pools[satellite.hostname]
+
+
+def collect_entity_pools():
+    """Delete the entities of all the pools of the process
+
+    :return: the pool statistics by Satellite hostname, with the number of deleted entities
+    """
+    report = {}
+    while _pools:
+        hostname, pool = _pools.popitem()
+        report[hostname] = {'kinds': dict(pool.stats), 'deleted': pool.collect()}
+    return report
+
+
+@contextmanager
+def pooled_entity(request, satellite, kind, parent=None):
+    """Yield an entity leased from the pool of the Satellite, or a new one when the pool is
+    disabled or the test is marked with ``fresh_entities``
+
+    :param request: the pytest request of the fixture
+    :param satellite: the Satellite of the entity
+    :param str kind: one of :data:`ENTITY_KINDS`
+    :param parent: the organization of the entity
+    """
+    if not settings.performance.entity_pool.enabled or request.node.get_closest_marker(
+        'fresh_entities'
+    ):
+        yield ENTITY_KINDS[kind]['create'](satellite, parent)
+        return
+    pool = get_entity_pool(satellite)
+    entity = pool.acquire(kind, parent)
+    try:
+        yield entity
+    finally:
+        pool.release(entity)
@@ -0,0 +1,300 @@
+"""Tracker of the entities created by the tests, deleted in bulk at the end of their module.
+
+Most tests leave the organizations, products, hosts and users they create behind, and the Satellite
+gets slower during a long run, which skews the later tests. With
+``performance.entity_tracker.enabled``, the entities created by the nailgun classes of
+:attr:`robottelo.hosts.Satellite.api`, and so by :class:`~robottelo.host_helpers.api_factory.APIFactory`,
+and by :func:`robottelo.host_helpers.cli_factory.create_object` are recorded in creation order.
+
+The entities created by the session and package scoped fixtures are kept until the end of the
+session, the others are deleted at the end of their test module, or of the session with
+``performance.entity_tracker.scope: session``. The entities of a tracked organization are deleted
+with it, the other entities are deleted in waves by kind, dependent kinds like hosts first and
+organizations last, and concurrently within a wave. The entities the tests deleted themselves are
+skipped. At the end of the session, the orphaned content of the Satellite is removed with
+:meth:`robottelo.hosts.Satellite.run_orphan_cleanup`.
+
+The number of entities created and deleted by every module is reported at the end of the run, with
+the growth of the Satellite databases across the module with ``performance.entity_tracker.db_growth``.
+The entities created by :mod:`robottelo.utils.entity_pool` are not tracked, the pool deletes them.
+Neither are the entities of the ``pre_upgrade`` tests and of the tests saving data with the
+``save_test_data`` fixture, the post upgrade tests use them.
+"""
+
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import copy
+import functools
+
+from robottelo.config import settings
+from robottelo.logging import logger as _root_logger
+from robottelo.utils.shared_state import SharedState
+
+logger = _root_logger.getChild('entity_tracker')
+
+# number of threads deleting entities in bulk
+BULK_WORKERS = 5
+# the kinds deleted first, in this order, the other kinds are deleted before locations and
+# organizations
+DELETE_ORDER = (
+    'Host',
+    'ActivationKey',
+    'ContentView',
+    'Repository',
+    'Product',
+    'LifecycleEnvironment',
+    'HostGroup',
+    'User',
+    'UserGroup',
+    'Role',
+)
+DELETE_LAST = ('Location', 'Organization')
+# the CLI classes named differently than the nailgun entities
+KIND_ALIASES = {'Org': 'Organization'}
+# the fixture scopes whose entities are kept until the end of the session
+SESSION_SCOPES = ('session', 'package')
+DB_SIZE_COMMAND = (
+    "runuser -u postgres -- psql -tAc 'SELECT sum(pg_database_size(datname)) FROM pg_database'"
+)
+
+# the test module running, the scopes of the fixtures being set up, and the untracked contexts
+_state = {'module': None, 'scopes': [], 'untracked': 0}
+_trackers = {}
+
+
+def _organization_id(entity, options=None):
+    """Return the id of the organization of an entity, or None"""
+    if options and options.get('organization-id'):
+        return int(options['organization-id'])
+    org = getattr(entity, 'organization', None)
+    if isinstance(org, list):
+        org = org[0] if len(org) == 1 else None
+    return getattr(org, 'id', org if isinstance(org, int) else None)
+
+
+def _is_not_found(err):
+    response = getattr(err, 'response', None)
+    return getattr(response, 'status_code', None) == 404 or 'not found' in str(err).lower()
+
+
+def _delete_rank(kind):
+    if kind in DELETE_ORDER:
+        return DELETE_ORDER.index(kind)
+    if kind in DELETE_LAST:
+        return len(DELETE_ORDER) + 1 + DELETE_LAST.index(kind)
+    return len(DELETE_ORDER)
+
+
+class EntityTracker:
+    """The entities created on a Satellite, by the test module that created them
+
+    :param str hostname: the hostname of the Satellite
+    :param satellite: the Satellite, created from the hostname when it is needed and not given
+    """
+
+    def __init__(self, hostname, satellite=None):
+        self.hostname = hostname
+        self._satellite = satellite
+        self.records = []
+        self.stats = defaultdict(lambda: {'created': 0, 'deleted': 0, 'gone': 0, 'failed': 0})
+        self.db_sizes = {}
+
+    @property
+    def satellite(self):
+        if self._satellite is None:
+            from robottelo.hosts import Satellite
+
+            self._satellite = Satellite(hostname=self.hostname)
+        return self._satellite
+
+    def db_size(self):
+        """Return the size of the Satellite databases in bytes, or None when unknown"""
+        try:
+            result = self.satellite.execute(DB_SIZE_COMMAND)
+            return int(result.stdout.strip()) if result.status == 0 else None
+        except Exception as err:
+            logger.debug(f'Unable to get the database size of {self.hostname}: {err}')
+            return None
+
+    def before_create(self):
+        """Measure the databases before the first entity of the module is created"""
+        module = _state['module']
+        if settings.performance.entity_tracker.db_growth and module not in self.db_sizes:
+            self.db_sizes[module] = self.db_size()
+
+    def record(self, kind, entity_id, delete, organization_id=None):
+        """Record a created entity
+
+        :param str kind: the name of the nailgun entity class, like ``Organization``
+        :param entity_id: the id of the entity
+        :param delete: the function deleting the entity
+        :param organization_id: the id of the organization of the entity
+        """
+        module = _state['module']
+        scope = 'session' if any(s in SESSION_SCOPES for s in _state['scopes']) else 'module'
+        self.records.append(
+            {
+                'kind': kind,
+                'id': entity_id,
+                'module': module,
+                'scope': scope,
+                'delete': delete,
+                'organization_id': organization_id,
+            }
+        )
+        self.stats[module]['created'] += 1
+
+    def _delete(self, record):
+        try:
+            record['delete']()
+        except Exception as err:
+            if _is_not_found(err):
+                return 'gone'
+            logger.warning(f'Unable to delete the {record["kind"]} {record["id"]}: {err}')
+            return 'failed'
+        return 'deleted'
+
+    def delete(self, records):
+        """Delete records in bulk, the entities of a deleted organization with it"""
+        org_ids = {r['id'] for r in records if r['kind'] == 'Organization'}
+        waves = defaultdict(list)
+        org_children = []
+        org_outcomes = {}
+        for record in records:
+            if record['kind'] != 'Organization' and record['organization_id'] in org_ids:
+                # deleted with its organization
+                org_children.append(record)
+                continue
+            waves[_delete_rank(record['kind'])].append(record)
+        for _, wave in sorted(waves.items()):
+            # in a wave, the entities created last are deleted first
+            wave.reverse()
+            with ThreadPoolExecutor(max_workers=min(len(wave), BULK_WORKERS)) as executor:
+                for record, outcome in zip(wave, executor.map(self._delete, wave), strict=True):
+                    self.stats[record['module']][outcome] += 1
+                    if record['kind'] == 'Organization':
+                        org_outcomes[record['id']] = outcome
+        # the entities of an organization share the outcome of its deletion
+        for record in org_children:
+            self.stats[record['module']][org_outcomes[record['organization_id']]] += 1
+
+    def collect(self, module=None):
+        """Delete the entities created by a module, or all of them
+
+        :param str module: the test module, None to delete the entities of the whole session
+        """
+        if module is None:
+            records, self.records = self.records, []
+        else:
+            records, kept = [], []
+            for record in self.records:
+                collected = record['module'] == module and record['scope'] == 'module'
+                (records if collected else kept).append(record)
+            self.records = kept
+        if records:
+            self.delete(records)
+
+    def report(self, module):
+        """Return and forget the statistics of a module, with the growth of the databases"""
+        report = self.stats.pop(module, None)
+        if report is None:
+            return None
+        before = self.db_sizes.pop(module, None)
+        after = self.db_size() if before is not None else None
+        report['db_growth'] = None if after is None else after - before
+        return report
+
+
+def get_entity_tracker(hostname, satellite=None):
+    """Return the tracker of a Satellite, or None when the tracking is disabled"""
+    if not settings.performance.entity_tracker.enabled or _state['untracked']:
+        return None
+    if hostname not in _trackers:
+        _trackers[hostname] = EntityTracker(hostname, satellite)
+    return _trackers[hostname]
+
+
+def get_entity_trackers():
+    return list(_trackers.values())
+
+
+def get_report_state():
+    return SharedState('entity_tracker', per_run=True)
+
+
+def set_module(module):
+    """Set the test module the created entities are recorded for"""
+    _state['module'] = module
+
+
+@contextmanager
+def fixture_scope(scope):
+    """Record the entities created in the context for a fixture of the scope"""
+    _state['scopes'].append(scope)
+    try:
+        yield
+    finally:
+        _state['scopes'].pop()
+
+
+@contextmanager
+def untracked():
+    """Do not record the entities created in the context"""
+    _state['untracked'] += 1
+    try:
+        yield
+    finally:
+        _state['untracked'] -= 1
+
+
+def _admin_delete(satellite, entity):
+    """Delete an entity with the admin server config of its Satellite
+
+    The entity may have been created as another user, who can be deleted before it, like the CLI
+    entities deleted as admin. The copy keeps the fields of the entity its path depends on.
+    """
+    admin_entity = copy.copy(entity)
+    admin_entity._server_config = satellite.nailgun_cfg
+    admin_entity.delete()
+
+
+def tracked_create(satellite, kind, create):
+    """Wrap the create method of a nailgun entity class to record the created entities
+
+    :param satellite: the Satellite of the entity class
+    :param str kind: the name of the entity class
+    :param create: the create method of the class
+    """
+
+    @functools.wraps(create)
+    def wrapper(entity, *args, **kwargs):
+        tracker = get_entity_tracker(satellite.hostname, satellite)
+        if tracker is not None:
+            tracker.before_create()
+        created = create(entity, *args, **kwargs)
+        if tracker is not None and getattr(created, 'delete', None) is not None:
+            tracker.record(
+                kind,
+                created.id,
+                functools.partial(_admin_delete, satellite, created),
+                _organization_id(created),
+            )
+        return created
+
+    return wrapper
+
+
+def record_cli_entity(cli_object, options, result):
+    """Record an entity created by a CLI class of a Satellite"""
+    hostname = getattr(cli_object, 'hostname', None)
+    if not hostname or not isinstance(result, dict) or 'id' not in result:
+        return
+    if (tracker := get_entity_tracker(hostname)) is None:
+        return
+    tracker.record(
+        KIND_ALIASES.get(cli_object.__name__, cli_object.__name__),
+        result['id'],
+        functools.partial(cli_object.delete, {'id': result['id']}),
+        _organization_id(result, options),
+    )
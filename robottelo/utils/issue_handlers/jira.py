@@ -366,8 +366,8 @@ def get_default_jira(issue_id):  # pragma: no cover
 def add_comment_on_jira(
     issue_id,
     comment,
-    comment_type=settings.jira.comment_type,
-    comment_visibility=settings.jira.comment_visibility,
+    comment_type=None,
+    comment_visibility=None,
     labels=None,
 ):
     """Adds a new comment to a Jira issue.
@@ -376,9 +376,9 @@ def add_comment_on_jira(
     :type issue_id: str
     :param comment: Comment to add on the issue.
     :type comment: str
-    :param comment_type: Type of comment to add.
+    :param comment_type: Type of comment to add, defaults to ``settings.jira.comment_type``
     :type comment_type: str
-    :param comment_visibility: Comment visibility
+    :param comment_visibility: Comment visibility, defaults to ``settings.jira.comment_visibility``
     :type comment_visibility: str
     :param labels: Add/Remove Jira labels, ex. [{'add':'tests_passed'},{'remove':'tests_failed'}]
     :type labels: list
@@ -386,6 +386,8 @@ def add_comment_on_jira(
     :rtype: dict
     """
     issue_id = issue_id.strip()
+    comment_type = comment_type or settings.jira.comment_type
+    comment_visibility = comment_visibility or settings.jira.comment_visibility
     if settings.jira.enable_comment != bool(getattr(pytest, 'jira_comments', False)):
         logger.warning(
             'Jira comments are currently disabled for this run. '
@@ -0,0 +1,316 @@
+"""Pool of subscription manifests shared between pytest-xdist workers, and between runs.
+
+Generating a manifest with Manifester creates a subscription allocation on the Red Hat Customer
+Portal and exports it, which is slow and rate limited. The pool keeps the exported manifests on
+disk, indexed in a :class:`~robottelo.utils.shared_state.SharedState`, and leases them::
+
+    with get_manifest('golden_ticket') as manifest:
+        satellite.upload_manifest(org.id, manifest.content)
+
+A manifest can only be imported in one organization of a Satellite, so a pooled manifest is only
+leased for a Satellite it was not imported to yet. When no manifest is available, the lease waits
+for the manifest being generated by another worker, or generates a new one. After every lease,
+a background thread refills the pool up to ``manifest.pool.size`` available manifests of the
+category. Manifests older than ``manifest.pool.max_age`` seconds are retired at the end of the
+session, and their subscription allocation is deleted.
+
+The pool is enabled with ``manifest.pool.enabled``, :func:`get_manifest` uses Manifester directly
+otherwise.
+"""
+
+from contextlib import contextmanager
+from functools import cache
+import os
+from pathlib import Path
+import threading
+import time
+import uuid
+
+from manifester import Manifester
+
+from robottelo.config import settings
+from robottelo.logging import logger as _root_logger
+from robottelo.utils.shared_state import SharedState, get_state_dir
+
+logger = _root_logger.getChild('manifest_pool')
+
+POOL_DIR = 'manifest_pool'
+# delay between two checks of the pool while waiting for a manifest
+WAIT_POLL_RATE = 5
+
+
+class PooledManifest:
+    """A manifest file of the pool, with the attributes of the manifests returned by Manifester"""
+
+    def __init__(self, entry):
+        self.uuid = entry['uuid']
+        self.category = entry['category']
+        self.path = Path(entry['path'])
+        self.name = entry['name']
+
+    @property
+    def content(self):
+        return self.path.read_bytes()
+
+    def __repr__(self):
+        return f'<PooledManifest {self.category} {self.uuid}>'
+
+
+def generate_manifest(category, pool_dir):
+    """Generate a manifest with Manifester and store it in the pool directory
+
+    :return: the pool entry of the manifest
+    """
+    manifest = Manifester(manifest_category=settings.manifest[category]).get_manifest()
+    path = Path(pool_dir, f'{manifest.uuid}.zip')
+    path.write_bytes(manifest.content)
+    return {'uuid': manifest.uuid, 'name': str(manifest.name), 'path': str(path)}
+
+
+def delete_manifest(entry):
+    """Delete the subscription allocation and the file of a pooled manifest"""
+    Manifester(
+        manifest_category=settings.manifest[entry['category']]
+    ).delete_subscription_allocation(uuid=entry['uuid'])
+    Path(entry['path']).unlink(missing_ok=True)
+
+
+class ManifestPool:
+    """Lease manifests from a pool shared by all the processes of the machine
+
+    :param pool_dir: directory of the manifest files and of the pool index
+    :param int size: number of available manifests of a category that the refill maintains
+    :param int max_age: seconds after which a manifest is retired
+    :param int lease_timeout: seconds to wait for a manifest generated by another worker
+    :param bool refill: refill the pool in background after a lease
+    :param generate: callable ``(category, pool_dir)`` generating a manifest entry
+    :param delete: callable ``(entry)`` deleting a manifest
+    """
+
+    def __init__(
+        self,
+        pool_dir=None,
+        size=None,
+        max_age=None,
+        lease_timeout=None,
+        refill=None,
+        generate=generate_manifest,
+        delete=delete_manifest,
+    ):
+        pool_settings = settings.manifest.pool
+        self.pool_dir = Path(pool_dir or pool_settings.directory or get_state_dir() / POOL_DIR)
+        self.pool_dir.mkdir(parents=True, exist_ok=True)
+        self.size = pool_settings.size if size is None else size
+        self.max_age = pool_settings.max_age if max_age is None else max_age
+        self.lease_timeout = pool_settings.lease_timeout if lease_timeout is None else lease_timeout
+        self.refill = pool_settings.refill if refill is None else refill
+        self.generate = generate
+        self.delete = delete
+        self.state = SharedState('manifest_pool', state_dir=self.pool_dir)
+        self.stats = SharedState('manifest_pool_stats', state_dir=self.pool_dir, per_run=True)
+        self.owner = f'{os.environ.get("PYTEST_XDIST_WORKER", "master")}-{os.getpid()}'
+        self._refills = []
+
+    def _is_available(self, entry, category, hostname, now):
+        return (
+            entry['category'] == category
+            and entry['leased_by'] is None
+            and hostname not in entry['imported_to']
+            and now - entry['created'] < self.max_age
+        )
+
+    def _generating(self, data, category, now):
+        """Return the manifest generations in progress for a category, dropping the stale ones"""
+        generating = data.setdefault('generating', {})
+        for key, started in list(generating.items()):
+            if now - started[1] > self.lease_timeout:
+                del generating[key]
+        return [key for key, (gen_category, _) in generating.items() if gen_category == category]
+
+    def _record(self, category, **values):
+        with self.stats.update() as data:
+            stats = data.setdefault(category, {'leases': 0, 'hits': 0, 'generated': 0})
+            stats.setdefault('wait_total', 0.0)
+            stats.setdefault('wait_max', 0.0)
+            for name, value in values.items():
+                if name == 'wait':
+                    stats['wait_total'] += value
+                    stats['wait_max'] = max(stats['wait_max'], value)
+                else:
+                    stats[name] += value
+
+    def _generate(self, category, key, leased_by=None):
+        """Generate a manifest and add it to the pool, leased or available"""
+        try:
+            entry = self.generate(category, self.pool_dir)
+        except Exception:
+            with self.state.update() as data:
+                data.setdefault('generating', {}).pop(key, None)
+            raise
+        entry.update(category=category, created=time.time(), leased_by=leased_by, imported_to=[])
+        with self.state.update() as data:
+            # the generation ends when the manifest is in the pool, so waiters do not miss it
+            data.setdefault('generating', {}).pop(key, None)
+            data.setdefault('manifests', {})[entry['uuid']] = entry
+        self._record(category, generated=1)
+        logger.info(f'Generated the {category} manifest {entry["uuid"]} for the pool')
+        return entry
+
+    def acquire(self, category, hostname=None):
+        """Lease a manifest of the category, that was not imported to the Satellite yet
+
+        :param str category: the name of the manifest category in ``settings.manifest``
+        :param str hostname: the Satellite the manifest is leased for, defaults to
+            ``server.hostname``
+        :return: a :class:`PooledManifest`
+        """
+        hostname = hostname or settings.server.hostname
+        start = time.monotonic()
+        while True:
+            now = time.time()
+            with self.state.update() as data:
+                manifests = data.setdefault('manifests', {})
+                entry = next(
+                    (
+                        entry
+                        for entry in sorted(manifests.values(), key=lambda entry: entry['created'])
+                        if self._is_available(entry, category, hostname, now)
+                    ),
+                    None,
+                )
+                generate_key = None
+                if entry:
+                    entry['leased_by'] = self.owner
+                elif (
+                    not self._generating(data, category, now)
+                    or time.monotonic() - start > self.lease_timeout
+                ):
+                    generate_key = uuid.uuid4().hex
+                    data['generating'][generate_key] = (category, now)
+            if entry or generate_key:
+                break
+            time.sleep(WAIT_POLL_RATE)
+        if entry is None:
+            entry = self._generate(category, generate_key, leased_by=self.owner)
+        wait = time.monotonic() - start
+        self._record(category, leases=1, hits=int(generate_key is None), wait=wait)
+        logger.debug(f'Leased the {category} manifest {entry["uuid"]} after {wait:.1f}s')
+        if self.refill:
+            self.start_refill(category)
+        return PooledManifest(entry)
+
+    def release(self, manifest, hostname=None, imported=True):
+        """Return a leased manifest to the pool
+
+        :param manifest: the :class:`PooledManifest` to return
+        :param str hostname: the Satellite the manifest was leased for, defaults to
+            ``server.hostname``
+        :param bool imported: whether the manifest is still imported to the Satellite, it can only
+            be leased again for this Satellite once it was deleted from its organization
+        """
+        hostname = hostname or settings.server.hostname
+        with self.state.update() as data:
+            entry = data.get('manifests', {}).get(manifest.uuid)
+            if entry is None:
+                return
+            entry['leased_by'] = None
+            if imported and hostname not in entry['imported_to']:
+                entry['imported_to'].append(hostname)
+
+    @contextmanager
+    def lease(self, category, hostname=None):
+        """Lease a manifest for the duration of the context, see :meth:`acquire`"""
+        manifest = self.acquire(category, hostname)
+        try:
+            yield manifest
+        finally:
+            self.release(manifest, hostname)
+
+    def start_refill(self, category):
+        """Generate manifests in background, up to ``size`` available manifests of the category"""
+        now = time.time()
+        with self.state.update() as data:
+            available = [
+                entry
+                for entry in data.setdefault('manifests', {}).values()
+                if entry['category'] == category
+                and entry['leased_by'] is None
+                and now - entry['created'] < self.max_age
+            ]
+            missing = self.size - len(available) - len(self._generating(data, category, now))
+            keys = [uuid.uuid4().hex for _ in range(max(missing, 0))]
+            for key in keys:
+                data['generating'][key] = (category, now)
+        for key in keys:
+            thread = threading.Thread(
+                target=self._refill,
+                args=(category, key),
+                name=f'manifest-refill-{key}',
+                daemon=True,
+            )
+            thread.start()
+            self._refills.append(thread)
+
+    def _refill(self, category, key):
+        try:
+            self._generate(category, key)
+        except Exception as err:
+            logger.warning(f'Failed to refill the {category} manifest pool: {err}')
+
+    def join(self, timeout=None):
+        """Wait for the background refills of this process"""
+        for thread in self._refills:
+            thread.join(timeout)
+        self._refills = [thread for thread in self._refills if thread.is_alive()]
+
+    def retire_expired(self):
+        """Delete the available manifests older than ``max_age``
+
+        :return: the number of retired manifests
+        """
+        now = time.time()
+        with self.state.update() as data:
+            manifests = data.setdefault('manifests', {})
+            expired = [
+                manifests.pop(key)
+                for key, entry in list(manifests.items())
+                if entry['leased_by'] is None and now - entry['created'] >= self.max_age
+            ]
+        for entry in expired:
+            try:
+                self.delete(entry)
+            except Exception as err:
+                logger.warning(f'Failed to delete the pooled manifest {entry["uuid"]}: {err}')
+        return len(expired)
+
+    def report(self):
+        """Return the lease statistics of the current run, per category"""
+        report = {}
+        for category, stats in self.stats.read().items():
+            leases = stats['leases']
+            report[category] = {
+                **stats,
+                'hit_rate': stats['hits'] / leases if leases else 0.0,
+                'wait_mean': stats['wait_total'] / leases if leases else 0.0,
+            }
+        return report
+
+
+@cache
+def get_manifest_pool():
+    """Return the manifest pool of the current process"""
+    return ManifestPool()
+
+
+@contextmanager
+def get_manifest(category):
+    """Yield a manifest of the category, leased from the pool when it is enabled
+
+    :param str category: the name of the manifest category in ``settings.manifest``
+    """
+    if settings.manifest.pool.enabled:
+        with get_manifest_pool().lease(category) as manifest:
+            yield manifest
+    else:
+        with Manifester(manifest_category=settings.manifest[category]) as manifest:
+            yield manifest
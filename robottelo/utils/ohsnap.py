@@ -1,4 +1,18 @@
-"""Utility module to communicate with Ohsnap API"""
+"""Utility module to communicate with Ohsnap API
+
+The requests go through an :class:`OhsnapClient` per Ohsnap host, which keeps a single HTTP session
+and caches the JSON responses by URL and parameters, in memory and on disk, for
+``ohsnap.cache.ttl`` seconds. Expired entries are refreshed with conditional requests, so an
+unchanged response is not downloaded again.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+import tempfile
+import threading
+import time
 
 from box import Box
 from packaging.version import Version
@@ -9,6 +23,13 @@ from robottelo import constants
 from robottelo.exceptions import InvalidArgumentError, RepositoryDataNotFound
 from robottelo.logging import logger
 
+CACHE_DIR = 'ohsnap_cache'
+# seconds a cached response is used without asking Ohsnap whether it changed
+DEFAULT_CACHE_TTL = 3600
+
+_clients = {}
+_clients_lock = threading.Lock()
+
 
 def ohsnap_response_hook(r, *args, **kwargs):
     """Requests response hook callback function that processes the response
@@ -21,6 +42,104 @@ def ohsnap_response_hook(r, *args, **kwargs):
     r.raise_for_status()
 
 
+class OhsnapClient:
+    """Client of the Ohsnap API, caching its JSON responses
+
+    :param ohsnap: the ``ohsnap`` settings
+    :param cache_dir: the directory of the cache shared by the processes, defaults to
+        ``ohsnap.cache.directory``, or to a directory in the system temporary directory
+    :param int ttl: seconds a response is cached, defaults to ``ohsnap.cache.ttl``
+    """
+
+    def __init__(self, ohsnap, cache_dir=None, ttl=None):
+        # the settings may still be loading, so the cache settings are optional
+        cache = ohsnap.get('cache') or {}
+        self.ohsnap = ohsnap
+        self.ttl = cache.get('ttl', DEFAULT_CACHE_TTL) if ttl is None else ttl
+        self.cache_dir = Path(
+            cache_dir or cache.get('directory') or Path(tempfile.gettempdir(), CACHE_DIR)
+        )
+        self.session = requests.Session()
+        self.session.hooks['response'].append(ohsnap_response_hook)
+        self._memory = {}
+        self._url_status = {}
+        self._lock = threading.Lock()
+
+    def _cache_path(self, key):
+        return self.cache_dir / f'{hashlib.sha256(key.encode()).hexdigest()}.json'
+
+    def _read(self, key):
+        try:
+            entry = json.loads(self._cache_path(key).read_text())
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get('key') == key else None
+
+    def _write(self, key, entry):
+        path = self._cache_path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f'.{os.getpid()}.{threading.get_ident()}.tmp')
+            tmp_path.write_text(json.dumps(entry))
+            tmp_path.replace(path)
+        except OSError as err:
+            logger.warning(f'Unable to cache the Ohsnap response in {path}: {err}')
+
+    def get_json(self, url, params=None):
+        """Return the JSON response of an Ohsnap URL, from the cache when it is fresh enough"""
+        key = json.dumps([url, params or {}], sort_keys=True)
+        with self._lock:
+            entry = self._memory.get(key)
+        entry = entry or self._read(key)
+        if entry and time.time() - entry['fetched'] < self.ttl:
+            return entry['data']
+        headers = {}
+        if entry and entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry and entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        res, _ = wait_for(
+            lambda: self.session.get(url, params=params, headers=headers),
+            handle_exception=True,
+            raise_original=True,
+            timeout=self.ohsnap.request_retry.timeout,
+            delay=self.ohsnap.request_retry.delay,
+        )
+        if entry and res.status_code == 304:
+            logger.debug(f'Ohsnap response of {res.url} not modified')
+            entry = {**entry, 'fetched': time.time()}
+        else:
+            entry = {
+                'key': key,
+                'data': res.json(),
+                'etag': res.headers.get('ETag'),
+                'last_modified': res.headers.get('Last-Modified'),
+                'fetched': time.time(),
+            }
+        with self._lock:
+            self._memory[key] = entry
+        self._write(key, entry)
+        return entry['data']
+
+    def url_status(self, url):
+        """Return the HTTP status code of a URL outside Ohsnap, checked once per process"""
+        with self._lock:
+            status = self._url_status.get(url)
+        if status is None:
+            status = requests.get(url).status_code
+            with self._lock:
+                self._url_status[url] = status
+        return status
+
+
+def get_ohsnap_client(ohsnap):
+    """Return the client of an Ohsnap host, shared by the whole process"""
+    with _clients_lock:
+        if (client := _clients.get(ohsnap.host)) is None:
+            client = _clients[ohsnap.host] = OhsnapClient(ohsnap)
+    return client
+
+
 def ohsnap_repo_url(ohsnap, request_type, product, release, os_release, snap=''):
     """Returns a URL pointing to Ohsnap "repo_file" or "repositories" API endpoint"""
     if request_type not in ['repo_file', 'repositories']:
@@ -38,20 +157,10 @@ def ohsnap_repo_url(ohsnap, request_type, product, release, os_release, snap='')
                 f'.z version component not provided in the release ({release}),'
                 f' fetching the recent z-stream from ohsnap'
             )
-            request_query = {
-                'url': f'{ohsnap.host}/api/streams',
-                'hooks': {'response': ohsnap_response_hook},
-            }
-            res, _ = wait_for(
-                lambda: requests.get(**request_query),
-                handle_exception=True,
-                raise_original=True,
-                timeout=ohsnap.request_retry.timeout,
-                delay=ohsnap.request_retry.delay,
-            )
-            logger.debug(f'List of releases returned by Ohsnap: {res.json()}')
+            streams = get_ohsnap_client(ohsnap).get_json(f'{ohsnap.host}/api/streams')
+            logger.debug(f'List of releases returned by Ohsnap: {streams}')
             # filter the stream for our release and set it only if it has at least 1 snap
-            if (streams := [stream for stream in res.json() if stream['id'] == release]) and len(
+            if (streams := [stream for stream in streams if stream['id'] == release]) and len(
                 streams[0]['release_ids']
             ) > 0:
                 # get the recent snap id (last in the list)
@@ -75,29 +184,23 @@ def dogfood_repository(
 ):
     """Returns a repository definition based on the arguments provided"""
     arch = arch or constants.DEFAULT_ARCHITECTURE
-    res, _ = wait_for(
-        lambda: requests.get(
-            ohsnap_repo_url(ohsnap, 'repositories', product, release, os_release, snap),
-            hooks={'response': ohsnap_response_hook},
-        ),
-        handle_exception=True,
-        raise_original=True,
-        timeout=ohsnap.request_retry.timeout,
-        delay=ohsnap.request_retry.delay,
+    client = get_ohsnap_client(ohsnap)
+    repositories = client.get_json(
+        ohsnap_repo_url(ohsnap, 'repositories', product, release, os_release, snap)
     )
     try:
-        repository = next(r for r in res.json() if r['label'] == repo)
+        repository = next(r for r in repositories if r['label'] == repo)
     except StopIteration:
         raise RepositoryDataNotFound(
             f'Repository "{repo}" is not provided by the given product'
         ) from None
-    repository['baseurl'] = repository['baseurl'].replace('$basearch', arch)
+    # the cached repository is shared, it must not be modified
+    repository = {**repository, 'baseurl': repository['baseurl'].replace('$basearch', arch)}
     # If repo check is enabled, check that the repository actually exists on the remote server
-    dogfood_req = requests.get(repository['baseurl'])
-    if repo_check and not dogfood_req.ok:
+    if repo_check and (status := client.url_status(repository['baseurl'])) >= 400:
         logger.warning(
             f'Unable to locate the repo at the URL: {repository["baseurl"]} ; '
-            f'HTTP response: {dogfood_req.status_code}; Arguments used: {repo=}, '
+            f'HTTP response: {status}; Arguments used: {repo=}, '
             f'{product=}, {release=}, {os_release=}, {snap=}'
         )
     return Box(**repository)
@@ -106,21 +209,12 @@ def dogfood_repository(
 def ohsnap_snap_rpms(ohsnap, sat_version, snap_version, os_major, is_all=True):
     sat_xy = '.'.join(sat_version.split('.')[:2])
     url = f'{ohsnap.host}/api/releases/{sat_version}/snaps/{snap_version}/rpms'
-    if is_all:
-        url += '?all=true'
-    res, _ = wait_for(
-        lambda: requests.get(url, hooks={'response': ohsnap_response_hook}),
-        handle_exception=True,
-        raise_original=True,
-        timeout=ohsnap.request_retry.timeout,
-        delay=ohsnap.request_retry.delay,
-    )
+    repos_data = get_ohsnap_client(ohsnap).get_json(url, params={'all': 'true'} if is_all else None)
     rpms = []
     rpm_repos = [f'satellite {sat_xy}', f'maintenance {sat_xy}']
-    if res.status_code == 200:
-        for repo_data in res.json():
-            if repo_data['rhel'] == os_major and any(
-                repo in repo_data['repository'].lower() for repo in rpm_repos
-            ):
-                rpms += repo_data['rpms']
+    for repo_data in repos_data:
+        if repo_data['rhel'] == os_major and any(
+            repo in repo_data['repository'].lower() for repo in rpm_repos
+        ):
+            rpms += repo_data['rpms']
     return rpms
@@ -0,0 +1,149 @@
+"""Load-aware alignment of pytest-xdist workers to Satellites.
+
+Every worker records the Satellite it is aligned to, and whether it is currently running a test,
+in a :class:`~robottelo.utils.shared_state.SharedState` common to the whole pytest run. Satellites
+are also probed through the foreman-tasks API; the response time and the number of running tasks
+are cached in the same state for ``server.load_balancing.probe_ttl`` seconds, so that a probe is
+done at most once per TTL across all the workers.
+
+When a worker needs a Satellite, the candidate with the lowest load score is selected::
+
+    score = workers * worker_weight
+            + in_flight_tests * in_flight_weight
+            + running_tasks * task_weight
+            + api_latency_seconds * latency_weight
+"""
+
+import time
+
+import requests
+
+from robottelo.config import settings
+from robottelo.logging import logger as _root_logger
+from robottelo.utils.shared_state import SharedState
+
+logger = _root_logger.getChild('satellite_load')
+
+RUNNING_TASKS_PATH = '/foreman_tasks/api/tasks'
+PROBE_TIMEOUT = 30
+
+
+def probe_satellite(hostname):
+    """Measure the API latency and the number of running foreman tasks of a Satellite
+
+    :param str hostname: the Satellite hostname
+    :return: a dict with ``latency`` (seconds) and ``running_tasks`` keys, both set to ``None``
+        when the Satellite could not be probed
+    """
+    start = time.monotonic()
+    try:
+        response = requests.get(
+            f'{settings.server.scheme}://{hostname}{RUNNING_TASKS_PATH}',
+            params={'search': 'state=running', 'per_page': 1},
+            auth=(settings.server.admin_username, settings.server.admin_password),
+            verify=settings.server.verify_ca,
+            timeout=PROBE_TIMEOUT,
+        )
+        response.raise_for_status()
+        data = response.json()
+    except (requests.RequestException, ValueError) as err:
+        logger.warning(f'Unable to probe the load of {hostname}: {err}')
+        return {'latency': None, 'running_tasks': None, 'probed_at': time.time()}
+    return {
+        'latency': time.monotonic() - start,
+        'running_tasks': data.get('subtotal', data.get('total')),
+        'probed_at': time.time(),
+    }
+
+
+class SatelliteLoadBalancer:
+    """Assign Satellites to xdist workers based on their current load
+
+    :param list hostnames: the candidate Satellite hostnames
+    :param state: the :class:`SharedState` to coordinate through, defaults to a per-run state
+    :param probe: callable used to probe a Satellite, defaults to :func:`probe_satellite`
+    """
+
+    def __init__(self, hostnames, state=None, probe=probe_satellite):
+        self.hostnames = list(dict.fromkeys(hostnames))
+        self.state = state or SharedState('satellite_load', per_run=True)
+        self.probe = probe
+        self.config = settings.server.load_balancing
+
+    def _stale_probes(self, data):
+        """Return the hostnames whose cached probe results are missing or expired"""
+        probes = data.get('probes', {})
+        now = time.time()
+        return [
+            hostname
+            for hostname in self.hostnames
+            if now - probes.get(hostname, {}).get('probed_at', 0) > self.config.probe_ttl
+        ]
+
+    def refresh_probes(self):
+        """Probe all the Satellites whose cached results expired"""
+        # probing is done outside of the lock, so workers are never blocked on the network
+        if not (stale := self._stale_probes(self.state.read())):
+            return
+        results = {hostname: self.probe(hostname) for hostname in stale}
+        with self.state.update() as data:
+            data.setdefault('probes', {}).update(results)
+
+    def scores(self, data, exclude_worker=None):
+        """Compute the load score of each candidate Satellite
+
+        :param dict data: the shared state
+        :param str exclude_worker: ignore the load generated by this worker
+        :return: a dict mapping each hostname to its score
+        """
+        scores = {}
+        for hostname in self.hostnames:
+            workers = [
+                worker
+                for worker_id, worker in data.get('workers', {}).items()
+                if worker['hostname'] == hostname and worker_id != exclude_worker
+            ]
+            probe = data.get('probes', {}).get(hostname, {})
+            scores[hostname] = (
+                len(workers) * self.config.worker_weight
+                + sum(worker['in_flight'] for worker in workers) * self.config.in_flight_weight
+                + (probe.get('running_tasks') or 0) * self.config.task_weight
+                + (probe.get('latency') or 0) * self.config.latency_weight
+            )
+        return scores
+
+    def assign(self, worker_id):
+        """Align a worker to the least loaded Satellite
+
+        The previous assignment of the worker, if any, is not taken into account, which makes this
+        method suitable for rebalancing as well.
+
+        :param str worker_id: the xdist worker id
+        :return: the assigned hostname
+        """
+        self.refresh_probes()
+        with self.state.update() as data:
+            scores = self.scores(data, exclude_worker=worker_id)
+            # ties are broken by the order of the hostnames in settings
+            hostname = min(self.hostnames, key=lambda host: scores[host])
+            data.setdefault('workers', {})[worker_id] = {'hostname': hostname, 'in_flight': 0}
+        logger.debug(f'{worker_id=}: load scores {scores}, selected {hostname}')
+        return hostname
+
+    def release(self, worker_id):
+        """Remove a worker from the shared state"""
+        with self.state.update() as data:
+            data.get('workers', {}).pop(worker_id, None)
+
+    def _set_in_flight(self, worker_id, value):
+        with self.state.update() as data:
+            if worker := data.get('workers', {}).get(worker_id):
+                worker['in_flight'] = value
+
+    def test_started(self, worker_id):
+        """Record that a worker started running a test"""
+        self._set_in_flight(worker_id, 1)
+
+    def test_finished(self, worker_id):
+        """Record that a worker finished running a test"""
+        self._set_in_flight(worker_id, 0)
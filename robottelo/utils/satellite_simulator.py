@@ -0,0 +1,454 @@
+"""Local Satellite simulator, to benchmark robottelo without a Satellite.
+
+The simulator stands for a single Satellite hostname. It answers the commands run over ssh, in
+place of the broker ssh session, and the REST requests done by nailgun, in place of the
+``requests`` transport adapter. Hammer commands are answered in the csv, json or info output
+formats, and REST requests in json, from recorded fixtures::
+
+    hammer:
+      organization list:
+        - {Id: 1, Title: Default Organization, Name: Default Organization}
+      organization info:
+        Id: 1
+        Name: Default Organization
+      capsule refresh-features:
+        status: 70
+        stderr: 'Could not refresh the features'
+    api:
+      - method: GET
+        path: /api/v2/status
+        body: {version: 3.14.0}
+    commands:
+      - pattern: '^rpm -q satellite'
+        stdout: satellite-6.17.0-1.el9sat.noarch
+
+The hammer ``create``, ``info``, ``list``, ``update`` and ``delete`` commands, and the REST
+requests, that are not recorded are answered by an in-memory store, so that the entities created
+by the CLI and API factories can be read back. A latency, with an optional random jitter, is
+injected before every answer::
+
+    simulator = SatelliteSimulator(fixtures='tests/robottelo/data/satellite_simulator.yaml',
+                                   latency=0.005)
+    with simulator.patch():
+        satellite = simulator.satellite()
+        org = satellite.cli_factory.make_org()
+"""
+
+from collections import Counter
+from contextlib import contextmanager
+import csv
+from http import HTTPStatus
+import io
+import itertools
+import json
+from pathlib import Path
+import random
+import re
+import shlex
+import threading
+import time
+from urllib.parse import parse_qs, urlsplit
+
+from box import Box
+from broker.helpers import Result
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+import yaml
+
+from robottelo.logging import logger as _root_logger
+
+logger = _root_logger.getChild('satellite_simulator')
+
+SIMULATOR_HOSTNAME = 'satellite.simulator.test'
+
+# hammer options given before the subcommand, and whether they take a value
+HAMMER_GLOBAL_OPTIONS = {
+    '-v': False,
+    '--verbose': False,
+    '-d': False,
+    '--debug': False,
+    '-u': True,
+    '--username': True,
+    '-p': True,
+    '--password': True,
+    '--interactive': True,
+    '--output': True,
+}
+HAMMER_STORE_COMMANDS = ('create', 'info', 'list', 'update', 'delete')
+API_PATH_REGEX = re.compile(
+    r'^/(?:[\w-]+/)?api(?:/v2)?/(?:[\w-]+/\d+/)*(?P<resource>[\w-]+)(?:/(?P<id>\d+))?/?$'
+)
+SEARCH_TERM_REGEX = re.compile(r'(?P<key>[\w.-]+)\s*=\s*"?(?P<value>[^"\s]*)"?')
+
+
+def hammer_key(option):
+    """Return the hammer output column of an option, ``organization-id`` -> ``Organization Id``"""
+    return option.replace('-', ' ').replace('_', ' ').title()
+
+
+def render_csv(records):
+    """Render records the way ``hammer --output=csv`` does"""
+    if isinstance(records, dict):
+        records = [records]
+    if not records:
+        return ''
+    fieldnames = list(dict.fromkeys(key for record in records for key in record))
+    output = io.StringIO()
+    writer = csv.DictWriter(output, fieldnames=fieldnames, lineterminator='\n')
+    writer.writeheader()
+    writer.writerows(records)
+    return output.getvalue()
+
+
+def render_json(records):
+    """Render records the way ``hammer --output=json`` does"""
+    return json.dumps(records, indent=2) + '\n'
+
+
+def render_info(record):
+    """Render a record the way ``hammer <resource> info`` does without output format
+
+    Nested dictionaries are rendered as indented sub-properties, lists of values as indented
+    lines and lists of dictionaries as numbered sub-properties.
+    """
+    lines = []
+    for key, value in record.items():
+        if isinstance(value, dict):
+            lines.append(f'{key}:')
+            lines.extend(f'    {sub_key}: {sub_value}' for sub_key, sub_value in value.items())
+        elif isinstance(value, list):
+            lines.append(f'{key}:')
+            for num, item in enumerate(value, 1):
+                if isinstance(item, dict):
+                    for pos, (sub_key, sub_value) in enumerate(item.items()):
+                        prefix = f'{num}) ' if pos == 0 else ' ' * len(f'{num}) ')
+                        lines.append(f'    {prefix}{sub_key}: {sub_value}')
+                else:
+                    lines.append(f'    {item}')
+        else:
+            lines.append(f'{key}: {"" if value is None else value}')
+    return '\n'.join(lines) + '\n'
+
+
+def load_fixtures(fixtures):
+    """Load the simulator fixtures from a yaml file, or return the given dictionary"""
+    if fixtures is None:
+        return {}
+    if isinstance(fixtures, str | Path):
+        return yaml.safe_load(Path(fixtures).read_text()) or {}
+    return fixtures
+
+
+class SimulatorAdapter(BaseAdapter):
+    """requests transport adapter answering the requests sent to the simulated Satellite"""
+
+    def __init__(self, simulator):
+        super().__init__()
+        self.simulator = simulator
+
+    def send(self, request, **kwargs):
+        url = urlsplit(request.url)
+        body = request.body
+        if isinstance(body, bytes):
+            body = body.decode()
+        try:
+            payload = json.loads(body) if body else None
+        except ValueError:
+            payload = None
+        status, content = self.simulator.respond(
+            request.method, url.path, parse_qs(url.query), payload
+        )
+        response = requests.Response()
+        response.status_code = status
+        response.reason = HTTPStatus(status).phrase
+        response.headers = CaseInsensitiveDict({'Content-Type': 'application/json'})
+        response._content = json.dumps(content).encode()
+        response.encoding = 'utf-8'
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+class SatelliteSimulator:
+    """Answer the hammer commands and REST requests of a simulated Satellite
+
+    :param str hostname: the simulated Satellite hostname, only this hostname is simulated
+    :param fixtures: the recorded answers, as a dictionary or the path of a yaml file
+    :param float latency: seconds waited before every answer
+    :param float jitter: maximum random seconds added to the latency
+    :param int seed: the seed of the jitter, for repeatable benchmarks
+    """
+
+    def __init__(
+        self, hostname=SIMULATOR_HOSTNAME, fixtures=None, latency=0.0, jitter=0.0, seed=None
+    ):
+        self.hostname = hostname
+        self.fixtures = load_fixtures(fixtures)
+        self.latency = latency
+        self.jitter = jitter
+        self.calls = Counter()
+        # total seconds of injected latency, to separate it from the robottelo overhead
+        self.injected_latency = 0.0
+        self._random = random.Random(seed)
+        self._ids = itertools.count(1000)
+        self._store = {}
+        self._lock = threading.Lock()
+        self.adapter = SimulatorAdapter(self)
+
+    def _wait(self):
+        with self._lock:
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0)
+            self.injected_latency += delay
+        if delay:
+            time.sleep(delay)
+        return delay
+
+    # ssh session interface, used by broker.hosts.Host.execute
+
+    def run(self, command, timeout=None):
+        """Answer a command as the broker ssh session of the simulated Satellite would"""
+        delay = self._wait()
+        if ' hammer ' in f' {command} ':
+            result = self.run_hammer(command)
+            if 'time -p' in command:
+                result.stderr += f'real {delay:.2f}\nuser 0.00\nsys 0.00\n'
+            return result
+        self.calls['command'] += 1
+        for entry in self.fixtures.get('commands', []):
+            if re.search(entry['pattern'], command):
+                return Result(
+                    stdout=entry.get('stdout', ''),
+                    stderr=entry.get('stderr', ''),
+                    status=entry.get('status', 0),
+                )
+        logger.debug(f'No simulated answer for command: {command}')
+        return Result(stdout='', stderr=f'{command.split()[0]}: command not found', status=127)
+
+    def disconnect(self):
+        pass
+
+    # hammer
+
+    @staticmethod
+    def parse_hammer(command):
+        """Split a hammer command line in its subcommand words, options and output format
+
+        :return: a tuple of the subcommand words, a dictionary of the options, and the output
+            format (``None`` for the default info-like output)
+        """
+        tokens = shlex.split(command)
+        tokens = tokens[tokens.index('hammer') + 1 :]
+        output_format = None
+        words, options = [], {}
+        tokens = iter(tokens)
+        for token in tokens:
+            name, _, value = token.partition('=')
+            if name in HAMMER_GLOBAL_OPTIONS and not words:
+                if HAMMER_GLOBAL_OPTIONS[name] and not value:
+                    value = next(tokens, '')
+                if name == '--output':
+                    output_format = value
+            elif token.startswith('-'):
+                options[name.lstrip('-')] = value if value else True
+            elif not options:
+                # positional arguments after the options are not subcommands
+                words.append(token)
+        return words, options, output_format
+
+    def _hammer_fixture(self, words):
+        """Return the recorded answer matching the most subcommand words"""
+        recorded = self.fixtures.get('hammer', {})
+        for size in range(len(words), 0, -1):
+            key = ' '.join(words[:size])
+            if key in recorded:
+                return recorded[key]
+        return None
+
+    def run_hammer(self, command):
+        """Answer a hammer command from the in-memory store, or from the fixtures
+
+        The entities of the store take precedence for the commands on their id, and are appended
+        to the recorded ``list`` answers.
+        """
+        words, options, output_format = self.parse_hammer(command)
+        self.calls[f'hammer {" ".join(words)}'] += 1
+        answer = self._hammer_fixture(words)
+        if isinstance(answer, dict) and 'status' in answer:
+            return Result(
+                stdout=answer.get('stdout', ''),
+                stderr=answer.get('stderr', ''),
+                status=answer['status'],
+            )
+        if words and words[-1] in HAMMER_STORE_COMMANDS:
+            answer = self._hammer_store(words[:-1], words[-1], options, answer)
+            if isinstance(answer, Result):
+                return answer
+        if answer is None:
+            return Result(stdout='', stderr='', status=0)
+        if output_format == 'csv':
+            stdout = render_csv(answer)
+        elif output_format in ('json', 'yaml'):
+            stdout = render_json(answer)
+        elif isinstance(answer, dict):
+            stdout = render_info(answer)
+        else:
+            stdout = render_csv(answer)
+        return Result(stdout=stdout, stderr='', status=0)
+
+    def _hammer_store(self, resource, action, options, recorded):
+        """Answer a hammer CRUD command with the entities of the in-memory store
+
+        :param recorded: the recorded answer of the command, if any
+        """
+        name = ' '.join(resource)
+        with self._lock:
+            entities = self._store.setdefault(name, {})
+            if action == 'list':
+                return [*(recorded or []), *entities.values()]
+            if action == 'create':
+                if recorded is not None:
+                    return recorded
+                entity_id = str(next(self._ids))
+                entities[entity_id] = {'Id': entity_id}
+                entities[entity_id].update(
+                    (hammer_key(option), value)
+                    for option, value in options.items()
+                    if not isinstance(value, bool)
+                )
+                return [
+                    {
+                        'Message': f'{name.capitalize()} created.',
+                        'Id': entity_id,
+                        'Name': entities[entity_id].get('Name', ''),
+                    }
+                ]
+            entity_id = str(options.get('id', ''))
+            if entity_id not in entities:
+                if recorded is not None:
+                    return recorded
+                return Result(
+                    stdout='',
+                    stderr=f'Could not find {resource[-1]} resource for {entity_id}.\n',
+                    status=65,
+                )
+            if action == 'update':
+                entities[entity_id].update(
+                    (hammer_key(option), value)
+                    for option, value in options.items()
+                    if option != 'id'
+                )
+                return [{'Message': f'{name.capitalize()} updated.'}]
+            if action == 'delete':
+                del entities[entity_id]
+                return [{'Message': f'{name.capitalize()} deleted.'}]
+            return entities[entity_id]
+
+    # REST
+
+    def respond(self, method, path, query=None, payload=None):
+        """Answer a REST request from the fixtures, or from the in-memory store
+
+        :return: a tuple of the http status code and the json content
+        """
+        self._wait()
+        self.calls[f'{method} {path}'] += 1
+        for entry in self.fixtures.get('api', []):
+            if entry.get('method', 'GET') == method and re.fullmatch(entry['path'], path):
+                return entry.get('status', 200), entry.get('body', {})
+        match = API_PATH_REGEX.match(path)
+        if not match:
+            return 404, {'error': {'message': f'Route {method} {path} not found'}}
+        with self._lock:
+            return self._api_store(method, match['resource'], match['id'], query or {}, payload)
+
+    def _api_store(self, method, resource, entity_id, query, payload):
+        """Answer a REST request with the entities of the in-memory store"""
+        entities = self._store.setdefault(f'api {resource}', {})
+        # nailgun wraps the fields of the entity in a single key, like {'organization': {...}}
+        if isinstance(payload, dict) and len(payload) == 1:
+            (value,) = payload.values()
+            if isinstance(value, dict):
+                payload = value
+        if entity_id is None:
+            if method == 'POST':
+                entity = {**(payload or {}), 'id': next(self._ids)}
+                entities[entity['id']] = entity
+                return 201, entity
+            results = list(entities.values())
+            for term in SEARCH_TERM_REGEX.finditer(' '.join(query.get('search', []))):
+                results = [
+                    entity for entity in results if str(entity.get(term['key'])) == term['value']
+                ]
+            return 200, {
+                'total': len(entities),
+                'subtotal': len(results),
+                'page': 1,
+                'per_page': len(results),
+                'search': ' '.join(query.get('search', [])) or None,
+                'results': results,
+            }
+        entity_id = int(entity_id)
+        if entity_id not in entities:
+            return 404, {'error': {'message': f'Resource {resource} not found by id {entity_id}'}}
+        if method in ('PUT', 'PATCH'):
+            entities[entity_id].update(payload or {})
+        elif method == 'DELETE':
+            return 200, entities.pop(entity_id)
+        return 200, entities[entity_id]
+
+    # patching
+
+    @contextmanager
+    def patch(self):
+        """Route the ssh commands and REST requests for the simulated hostname to the simulator
+
+        Hosts created for the simulated hostname get the simulator as ssh session, without
+        loading the broker settings, and requests sessions get the simulator as transport
+        adapter for its url. Other hostnames and urls are left untouched.
+        """
+        from broker.hosts import Host
+
+        simulator = self
+        host_init = Host.__init__
+        get_adapter = requests.Session.get_adapter
+        base_url = f'https://{self.hostname}'
+
+        def simulated_host_init(host, hostname=None, **kwargs):
+            if hostname != simulator.hostname:
+                return host_init(host, hostname=hostname, **kwargs)
+            host._settings = Box(default_box=True)
+            host.name = kwargs.pop('name', None)
+            host.hostname = hostname
+            host.username = kwargs.pop('username', 'root')
+            host.password = kwargs.pop('password', None)
+            host.port = kwargs.pop('port', 22)
+            host.timeout = kwargs.pop('connection_timeout', 60)
+            host.__dict__.update(kwargs)
+            host._session = simulator
+            return None
+
+        def simulated_get_adapter(session, url):
+            if url == base_url or url.startswith(f'{base_url}/'):
+                return simulator.adapter
+            return get_adapter(session, url)
+
+        Host.__init__ = simulated_host_init
+        requests.Session.get_adapter = simulated_get_adapter
+        try:
+            yield self
+        finally:
+            Host.__init__ = host_init
+            requests.Session.get_adapter = get_adapter
+
+    def satellite(self, **kwargs):
+        """Return a :class:`robottelo.hosts.Satellite` for the simulated hostname
+
+        It has to be used within :meth:`patch`.
+        """
+        from robottelo.hosts import Satellite
+
+        return Satellite(hostname=self.hostname, **kwargs)
@@ -0,0 +1,109 @@
+"""Small JSON state store shared between processes on the same machine.
+
+The state lives in a single JSON file guarded by a ``pytest_services`` file lock, which makes it
+usable for coordination between pytest-xdist workers (and the controller) without requiring any
+external service.
+
+Usage::
+
+    from robottelo.utils.shared_state import SharedState
+
+    state = SharedState('satellite_load')
+    with state.update() as data:
+        data.setdefault('workers', {})['gw0'] = 'sat1.example.com'
+    state.read()['workers']
+"""
+
+from contextlib import contextmanager
+import json
+import os
+from pathlib import Path
+import tempfile
+
+from pytest_services.locks import file_lock
+
+from robottelo.logging import logger
+
+TEMP_ROOT_DIR = 'robottelo'
+TEMP_SHARED_STATE_DIR = 'shared_state'
+LOCK_TIMEOUT = 60
+
+
+def get_run_id():
+    """Return an identifier common to every worker of the current pytest run
+
+    pytest-xdist exports the same ``PYTEST_XDIST_TESTRUNUID`` to all of its workers, so it can be
+    used to namespace state that must not leak between runs.
+    """
+    return os.environ.get('PYTEST_XDIST_TESTRUNUID', 'local')
+
+
+def get_state_dir(create=True):
+    """Return the directory where the shared state files are stored"""
+    from robottelo.config import settings
+
+    tmp_dir = settings.robottelo.tmp_dir or tempfile.gettempdir()
+    state_dir = Path(tmp_dir, TEMP_ROOT_DIR, TEMP_SHARED_STATE_DIR)
+    if create:
+        # workers may try to create this directory at the same time
+        state_dir.mkdir(parents=True, exist_ok=True)
+    return state_dir
+
+
+class SharedState:
+    """A JSON document shared between processes
+
+    :param str name: the name of the state, used as the file name
+    :param state_dir: directory where to store the state, defaults to :func:`get_state_dir`
+    :param bool per_run: namespace the state file with the current pytest run id
+    :param int lock_timeout: seconds to wait for the file lock
+    """
+
+    def __init__(self, name, state_dir=None, per_run=False, lock_timeout=LOCK_TIMEOUT):
+        if per_run:
+            name = f'{name}-{get_run_id()}'
+        self.name = name
+        self.state_dir = Path(state_dir) if state_dir else get_state_dir()
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        self.path = self.state_dir.joinpath(f'{name}.json')
+        self.lock_path = self.state_dir.joinpath(f'{name}.json.lock')
+        self.lock_timeout = lock_timeout
+
+    def _load(self):
+        try:
+            return json.loads(self.path.read_text())
+        except FileNotFoundError:
+            return {}
+        except json.JSONDecodeError:
+            logger.warning(f'Shared state {self.path} is corrupted, starting from scratch')
+            return {}
+
+    def _dump(self, data):
+        # write to a temporary file first so readers never see a partial document
+        tmp_path = self.path.with_suffix(f'.{os.getpid()}.tmp')
+        tmp_path.write_text(json.dumps(data, indent=4, default=str))
+        tmp_path.replace(self.path)
+
+    @contextmanager
+    def lock(self):
+        """Hold the state lock without reading or writing the state"""
+        with file_lock(str(self.lock_path), remove=False, timeout=self.lock_timeout):
+            yield
+
+    def read(self):
+        """Return a copy of the current state"""
+        with self.lock():
+            return self._load()
+
+    @contextmanager
+    def update(self):
+        """Lock the state and yield it as a dict, the dict is written back on exit"""
+        with self.lock():
+            data = self._load()
+            yield data
+            self._dump(data)
+
+    def clear(self):
+        """Remove the state file"""
+        with self.lock():
+            self.path.unlink(missing_ok=True)
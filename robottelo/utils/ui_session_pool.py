@@ -0,0 +1,202 @@
+"""Pool of logged-in airgun browser sessions, reused by the UI tests of a module.
+
+Starting a browser and logging in to Satellite often takes longer than the steps of a UI test.
+With ``ui.session_pool.enabled``, the module-scoped ``ui_session_pool`` fixture activates a pool,
+and :meth:`robottelo.hosts.Satellite.ui_session` leases its sessions from it, by Satellite and
+user, instead of starting a new one for every test.
+
+When a test is done with a session, the session storage of the browser is cleared, the organization
+and location context is set back to the defaults of the user, as after a login, and the browser
+navigates back to the Satellite landing page, the login cookies are kept. A session is closed
+after ``ui.session_pool.max_uses`` tests, or as soon as an exception is raised while it is used, in
+which case airgun takes its usual failure screenshot. The ``session`` and ``autosession`` fixtures
+do not see the exceptions of their test, they discard the session of a failed test instead. All the sessions are closed at the end of the
+module, and the time saved on browser startups and logins is recorded, then reported at the end of
+the run.
+
+The pool is not used when videos are recorded, since a video is recorded per browser session.
+"""
+
+from contextlib import ExitStack, contextmanager
+import time
+
+from robottelo.config import settings
+from robottelo.logging import logger as _root_logger
+from robottelo.utils.shared_state import SharedState
+
+logger = _root_logger.getChild('ui_session_pool')
+
+# the page a pooled browser is brought back to between two tests
+NEUTRAL_PATH = '/'
+RESET_SCRIPT = 'window.localStorage.clear(); window.sessionStorage.clear();'
+# the taxonomies of the Foreman context, a context is selected with the select path of a taxonomy,
+# or cleared to any taxonomy with its clear path
+TAXONOMIES = ('organizations', 'locations')
+
+_active = {'pool': None}
+
+
+class PooledSession:
+    """A started airgun session, with the context that closes it"""
+
+    def __init__(self, key, stack, session, startup):
+        self.key = key
+        self.stack = stack
+        self.session = session
+        self.startup = startup
+        self.uses = 0
+        # closed at the end of the lease instead of being reused
+        self.discarded = False
+        # the ids of the default taxonomies of the user, by taxonomy
+        self.context = None
+
+
+class UISessionPool:
+    """Logged-in airgun sessions, by Satellite hostname and user
+
+    :param int max_uses: number of tests after which a session is closed
+    :param str name: the name of the pool in the reports, the test module
+    """
+
+    def __init__(self, max_uses=None, name=None):
+        self.max_uses = settings.ui.session_pool.max_uses if max_uses is None else max_uses
+        self.name = name
+        self.available = {}
+        # the leased sessions, by id of their airgun session
+        self._leased = {}
+        self.stats = {'leases': 0, 'reuses': 0, 'starts': 0, 'recycled': 0, 'startup_time': 0.0}
+
+    def _start(self, satellite, key, testname, user, password):
+        stack = ExitStack()
+        start = time.monotonic()
+        try:
+            session = stack.enter_context(
+                satellite._start_ui_session(testname=testname, user=user, password=password)
+            )
+        except BaseException:
+            stack.close()
+            raise
+        startup = time.monotonic() - start
+        self.stats['starts'] += 1
+        self.stats['startup_time'] += startup
+        logger.debug(f'Started a pooled UI session for {user} on {key[0]} in {startup:.1f}s')
+        return PooledSession(key, stack, session, startup)
+
+    def _default_context(self, satellite, user):
+        """Return the ids of the default organization and location of a user, None for any"""
+        (entity,) = satellite.api.User().search(query={'search': f'login="{user}"'})
+        return {
+            'organizations': getattr(entity.default_organization, 'id', None),
+            'locations': getattr(entity.default_location, 'id', None),
+        }
+
+    def _reset(self, pooled, satellite):
+        """Bring a session back to the landing page and the taxonomy context of a login, without
+        its per-test storage"""
+        selenium = pooled.session.browser.selenium
+        selenium.execute_script(RESET_SCRIPT)
+        if pooled.context is None:
+            pooled.context = self._default_context(satellite, pooled.key[1])
+        for taxonomy in TAXONOMIES:
+            taxonomy_id = pooled.context[taxonomy]
+            path = f'/{taxonomy}/{taxonomy_id}/select' if taxonomy_id else f'/{taxonomy}/clear'
+            selenium.get(f'{satellite.url}{path}')
+        selenium.get(f'{satellite.url}{NEUTRAL_PATH}')
+
+    def discard(self, session):
+        """Close a leased session at the end of its lease instead of reusing it, like the session
+        of a failed test whose browser state is unknown"""
+        if (pooled := self._leased.get(id(session))) is not None:
+            pooled.discarded = True
+
+    def _close(self, pooled, exc_info=(None, None, None)):
+        try:
+            pooled.stack.__exit__(*exc_info)
+        except Exception as err:
+            logger.warning(f'Unable to close the pooled UI session of {pooled.key[1]}: {err}')
+
+    @contextmanager
+    def lease(self, satellite, testname, user, password):
+        """Yield a logged-in session of the user, reused when one is available"""
+        key = (satellite.hostname, user)
+        self.stats['leases'] += 1
+        pooled = self.available.pop(key, None)
+        if pooled is None:
+            pooled = self._start(satellite, key, testname, user, password)
+        else:
+            self.stats['reuses'] += 1
+            # airgun names the screenshots of the session after it
+            pooled.session.name = testname
+        pooled.uses += 1
+        self._leased[id(pooled.session)] = pooled
+        try:
+            yield pooled.session
+        except BaseException as err:
+            # the session state is unknown, it is closed with the error to take a screenshot
+            self.stats['recycled'] += 1
+            self._close(pooled, (type(err), err, err.__traceback__))
+            raise
+        finally:
+            del self._leased[id(pooled.session)]
+        if pooled.discarded:
+            self.stats['recycled'] += 1
+            self._close(pooled)
+            return
+        if pooled.uses >= self.max_uses or key in self.available:
+            self._close(pooled)
+            return
+        try:
+            self._reset(pooled, satellite)
+        except Exception as err:
+            logger.warning(f'Unable to reset the pooled UI session of {user}: {err}')
+            self.stats['recycled'] += 1
+            self._close(pooled)
+            return
+        self.available[key] = pooled
+
+    def close(self):
+        """Close all the available sessions"""
+        while self.available:
+            _, pooled = self.available.popitem()
+            self._close(pooled)
+
+    def report(self):
+        """Return the statistics of the pool, with the estimated time saved by the reuses"""
+        starts = self.stats['starts']
+        mean_startup = self.stats['startup_time'] / starts if starts else 0.0
+        return {**self.stats, 'saved_time': mean_startup * self.stats['reuses']}
+
+
+def get_ui_session_pool():
+    """Return the active session pool, or None"""
+    return _active['pool']
+
+
+@contextmanager
+def activate_ui_session_pool(name=None):
+    """Activate a session pool for the duration of the context, when it is enabled
+
+    The statistics of the pool are recorded in the shared state of the run when the context exits.
+    """
+    if not settings.ui.session_pool.enabled or settings.ui.record_video:
+        yield None
+        return
+    pool = UISessionPool(name=name)
+    _active['pool'] = pool
+    try:
+        yield pool
+    finally:
+        _active['pool'] = None
+        pool.close()
+        report = pool.report()
+        if report['leases']:
+            logger.info(
+                f'UI session pool of {name}: {report["reuses"]} of {report["leases"]} sessions '
+                f'reused, {report["saved_time"]:.1f}s of startup and login saved'
+            )
+            with get_report_state().update() as data:
+                data[name or 'unnamed'] = report
+
+
+def get_report_state():
+    return SharedState('ui_session_pool', per_run=True)
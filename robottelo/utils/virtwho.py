@@ -1,8 +1,11 @@
 """Utility module to handle the virtwho configure UI/CLI/API testing"""
 
 import json
+import random
 import re
+import time
 import uuid
+import zlib
 
 from fauxfactory import gen_integer, gen_string, gen_url
 from nailgun import entities
@@ -502,7 +505,41 @@ def add_configure_option(option, value, config_file):
         raise VirtWhoError(f"option {option} is already exist in {config_file}")
 
 
-def hypervisor_json_create(hypervisors, guests):
+# size of the chunks of the streamed hypervisor reports
+HYPERVISOR_REPORT_CHUNK_SIZE = 64 * 1024
+
+
+def _seeded_uuid(rng):
+    """Return a random version 4 UUID string, drawn from ``rng``"""
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def hypervisor_records(hypervisors, guests, seed=None, fake=False):
+    """
+    Generate the hypervisor records of a hypervisor guest json data, one at a time.
+    :param hypervisors: how many hypervisors will be created
+    :param guests: how many guests will be created
+    :param seed: seed of the generated UUIDs, the same seed generates the same records
+    :param fake: generate the records for fake config usages, see hypervisor_fake_json_create
+    """
+    rng = random.Random(seed)
+    for _ in range(hypervisors):
+        guest_list = [
+            {
+                "guestId": _seeded_uuid(rng),
+                "state": 1,
+                "attributes": {"active": 1, "virtWhoType": "esx"},
+            }
+            for _ in range(guests)
+        ]
+        if fake:
+            yield {'guests': guest_list, 'name': _seeded_uuid(rng), 'uuid': _seeded_uuid(rng)}
+        else:
+            name = _seeded_uuid(rng)
+            yield {"guestIds": guest_list, "name": name, "hypervisorId": {"hypervisorId": name}}
+
+
+def hypervisor_json_create(hypervisors, guests, seed=None):
     """
     Create a hypervisor guest json data. For example:
     {'hypervisors': [{'hypervisorId': '820b5143-3885-4dba-9358-4ce8c30d934e',
@@ -510,25 +547,12 @@ def hypervisor_json_create(hypervisors, guests):
     'attributes': {'active': 1, 'virtWhoType': 'esx'}}]}]}
     :param hypervisors: how many hypervisors will be created
     :param guests: how many guests will be created
+    :param seed: seed of the generated UUIDs, random by default
     """
-    hypervisors_list = []
-    for _ in range(hypervisors):
-        guest_list = []
-        for _ in range(guests):
-            guest_list.append(
-                {
-                    "guestId": str(uuid.uuid4()),
-                    "state": 1,
-                    "attributes": {"active": 1, "virtWhoType": "esx"},
-                }
-            )
-        name = str(uuid.uuid4())
-        hypervisor = {"guestIds": guest_list, "name": name, "hypervisorId": {"hypervisorId": name}}
-        hypervisors_list.append(hypervisor)
-    return {"hypervisors": hypervisors_list}
-
-
-def hypervisor_fake_json_create(hypervisors, guests):
+    return {"hypervisors": list(hypervisor_records(hypervisors, guests, seed=seed))}
+
+
+def hypervisor_fake_json_create(hypervisors, guests, seed=None):
     """
     Create a hypervisor guest json data for fake config usages. For example:
     {'hypervisors': [{'uuid': '820b5143-3885-4dba-9358-4ce8c30d934e',
@@ -536,39 +560,135 @@ def hypervisor_fake_json_create(hypervisors, guests):
     'attributes': {'active': 1, 'virtWhoType': 'esx'}}]}]}
     :param hypervisors: how many hypervisors will be created
     :param guests: how many guests will be created
+    :param seed: seed of the generated UUIDs, random by default
     """
-    hypervisors_list = [
-        {
-            'guests': [
-                {
-                    "guestId": str(uuid.uuid4()),
-                    "state": 1,
-                    "attributes": {"active": 1, "virtWhoType": "esx"},
-                }
-                for _ in range(guests)
-            ],
-            'name': str(uuid.uuid4()),
-            'uuid': str(uuid.uuid4()),
-        }
-        for _ in range(hypervisors)
-    ]
-    return {"hypervisors": hypervisors_list}
+    return {"hypervisors": list(hypervisor_records(hypervisors, guests, seed=seed, fake=True))}
 
 
-def create_fake_hypervisor_content(org_label, hypervisors, guests):
+def hypervisor_json_stream(
+    hypervisors,
+    guests,
+    seed=None,
+    fake=False,
+    compress=False,
+    chunk_size=HYPERVISOR_REPORT_CHUNK_SIZE,
+):
+    """
+    Generate a hypervisor guest json data incrementally, without building it in memory.
+    The decoded stream is the json of hypervisor_json_create (or hypervisor_fake_json_create
+    when fake is set) for the same seed.
+    :param hypervisors: how many hypervisors will be created
+    :param guests: how many guests will be created
+    :param seed: seed of the generated UUIDs, random by default
+    :param fake: generate the data for fake config usages
+    :param compress: gzip compress the stream
+    :param chunk_size: approximate size of the yielded chunks, in bytes
+    :return: a generator of bytes chunks
+    """
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS) if compress else None
+    buffer = []
+    size = 0
+
+    def _flush():
+        data = ''.join(buffer).encode()
+        buffer.clear()
+        return compressor.compress(data) if compressor else data
+
+    buffer.append('{"hypervisors": [')
+    records = hypervisor_records(hypervisors, guests, seed=seed, fake=fake)
+    for index, record in enumerate(records):
+        part = (', ' if index else '') + json.dumps(record)
+        buffer.append(part)
+        size += len(part)
+        if size >= chunk_size:
+            if chunk := _flush():
+                yield chunk
+            size = 0
+    buffer.append(']}')
+    chunk = _flush()
+    if compressor:
+        chunk += compressor.flush()
+    yield chunk
+
+
+def create_fake_hypervisor_content(
+    org_label, hypervisors, guests, seed=None, stream=False, compress=False
+):
     """
     Post the fake hypervisor content to satellite server
     :param hypervisors: how many hypervisors will be created
     :param guests: how many guests will be created
     :param org_label: the label of the Organization
-    :return data: the hypervisor content
+    :param seed: seed of the generated UUIDs, random by default
+    :param stream: generate and post the content incrementally, with chunked transfer encoding
+    :param compress: gzip compress the streamed content
+    :return data: the hypervisor content, or when streaming, a generator of the posted
+        hypervisor records, regenerated from the seed
     """
-    data = hypervisor_json_create(hypervisors, guests)
     url = f"https://{settings.server.hostname}/rhsm/hypervisors/{org_label}"
     auth = (settings.server.admin_username, settings.server.admin_password)
-    result = requests.post(url, auth=auth, verify=False, json=data)
+    if not stream:
+        data = hypervisor_json_create(hypervisors, guests, seed=seed)
+        result = requests.post(url, auth=auth, verify=False, json=data)
+        assert result.status_code == 200
+        return data
+    if seed is None:
+        seed = random.getrandbits(64)
+    headers = {'Content-Type': 'application/json'}
+    if compress:
+        headers['Content-Encoding'] = 'gzip'
+    result = requests.post(
+        url,
+        auth=auth,
+        verify=False,
+        headers=headers,
+        data=hypervisor_json_stream(hypervisors, guests, seed=seed, compress=compress),
+    )
     assert result.status_code == 200
-    return data
+    return hypervisor_records(hypervisors, guests, seed=seed)
+
+
+def benchmark_fake_hypervisor_content(
+    hypervisors, guests, org_label=None, seed=None, compress=False
+):
+    """
+    Measure the generation throughput of a streamed hypervisor guest json data, and its upload
+    throughput when an Organization label is given.
+    :param hypervisors: how many hypervisors will be created
+    :param guests: how many guests will be created
+    :param org_label: the label of the Organization to post the content to, no upload if None
+    :param seed: seed of the generated UUIDs, random by default
+    :param compress: gzip compress the stream
+    :return: a dict with the size, durations and throughputs of the generation and upload
+    """
+    start = time.perf_counter()
+    size = sum(
+        len(chunk)
+        for chunk in hypervisor_json_stream(hypervisors, guests, seed=seed, compress=compress)
+    )
+    generation_time = time.perf_counter() - start
+    results = {
+        'hypervisors': hypervisors,
+        'guests': hypervisors * guests,
+        'bytes': size,
+        'generation_time': generation_time,
+        'generation_guests_per_second': hypervisors * guests / generation_time,
+        'generation_bytes_per_second': size / generation_time,
+    }
+    if org_label:
+        start = time.perf_counter()
+        create_fake_hypervisor_content(
+            org_label, hypervisors, guests, seed=seed, stream=True, compress=compress
+        )
+        upload_time = time.perf_counter() - start
+        results.update(
+            {
+                'upload_time': upload_time,
+                'upload_guests_per_second': hypervisors * guests / upload_time,
+                'upload_bytes_per_second': size / upload_time,
+            }
+        )
+    return results
 
 
 def get_hypervisor_info(hypervisor_type):
@@ -1,27 +1,46 @@
 """Generate hammer command tree in json format by inspecting every command's
-help.
+help, and the index of the tree used to validate hammer commands locally.
+
+The help of the commands is fetched concurrently over a pool of SSH clients.
+The tree can also be indexed offline from an existing json file::
+
+    python scripts/hammer_command_tree.py --workers 16
+    python scripts/hammer_command_tree.py --from-file tests/foreman/data/hammer_commands.json \
+        --version 6.17.0
 
 """
 
+import argparse
 import json
+from pathlib import Path
 
-from robottelo import ssh
-from robottelo.cli import hammer
+from robottelo.cli.command_tree import generate_command_tree, write_index
 from robottelo.config import settings
 
 
-def generate_command_tree(command):
-    """Recursively walk through the hammer commands and subcommands and fetch
-    their help. Return a dictionary with the contents.
-    """
-    output = ssh.command(f'{command} --help', hostname=settings.server.hostnames[0]).stdout
-    contents = hammer.parse_help(output)
-    if len(contents['subcommands']) > 0:
-        for subcommand in contents['subcommands']:
-            subcommand.update(generate_command_tree('{} {}'.format(command, subcommand['name'])))
-    return contents
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--hostname', help='the Satellite, defaults to server.hostnames[0]')
+    parser.add_argument('--workers', type=int, default=8, help='number of concurrent SSH clients')
+    parser.add_argument('--output', default='hammer_commands.json', help='the tree json file')
+    parser.add_argument('--from-file', help='index an existing tree instead of generating it')
+    parser.add_argument('--version', help='the Satellite version of the index')
+    args = parser.parse_args()
+
+    if args.from_file:
+        tree = json.loads(Path(args.from_file).read_text())
+        version = args.version or settings.server.version.release
+    else:
+        from robottelo.hosts import Satellite
+
+        hostname = args.hostname or settings.server.hostnames[0]
+        tree = generate_command_tree(hostname=hostname, workers=args.workers)
+        version = args.version or Satellite(hostname).version
+        # Generate the json file in the working directory
+        with open(args.output, 'w') as f:
+            f.write(json.dumps(tree, indent=2, sort_keys=True))
+    print(f'Hammer command index written to {write_index(tree, str(version))}')
 
 
-# Generate the json file in the working directory
-with open('hammer_commands.json', 'w') as f:
-    f.write(json.dumps(generate_command_tree('hammer'), indent=2, sort_keys=True))
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+"""Benchmark the generation and upload of fake virt-who hypervisor reports.
+
+The report is streamed by ``robottelo.utils.virtwho.hypervisor_json_stream``. Without an
+Organization label, only the generation is measured, so no Satellite is needed.
+
+Usage:
+    python scripts/virtwho_report_benchmark.py --hypervisors 5000 --guests 50
+    python scripts/virtwho_report_benchmark.py --hypervisors 100 --guests 10 --org-label ACME
+"""
+
+import click
+
+from robottelo.utils.virtwho import benchmark_fake_hypervisor_content
+
+
+@click.command()
+@click.option('--hypervisors', default=1000, show_default=True, help='Number of hypervisors.')
+@click.option('--guests', default=50, show_default=True, help='Number of guests per hypervisor.')
+@click.option('--seed', type=int, default=None, help='Seed of the generated UUIDs.')
+@click.option('--compress', is_flag=True, help='Gzip compress the report.')
+@click.option(
+    '--org-label',
+    default=None,
+    help='Post the report to this Organization of settings.server.hostname.',
+)
+def benchmark(hypervisors, guests, seed, compress, org_label):
+    """Report the generation and upload throughput of fake hypervisor reports."""
+    results = benchmark_fake_hypervisor_content(
+        hypervisors, guests, org_label=org_label, seed=seed, compress=compress
+    )
+    click.echo(
+        f'{results["hypervisors"]} hypervisors, {results["guests"]} guests, '
+        f'{results["bytes"] / 2**20:.1f} MiB{" (gzip)" if compress else ""}'
+    )
+    for step in ('generation', 'upload'):
+        if f'{step}_time' in results:
+            click.echo(
+                f'{step}: {results[f"{step}_time"]:.2f}s, '
+                f'{results[f"{step}_guests_per_second"]:.0f} guests/s, '
+                f'{results[f"{step}_bytes_per_second"] / 2**20:.1f} MiB/s'
+            )
+
+
+if __name__ == '__main__':
+    benchmark()
@@ -0,0 +1,65 @@
+"""Tests for module ``robottelo.host_helpers.api_factory``."""
+
+from unittest import mock
+
+from nailgun.entity_mixins import TaskFailedError
+import pytest
+
+from robottelo.host_helpers.api_factory import APIFactory
+
+
+def task(task_id, result='success', output=None, state='stopped'):
+    return mock.Mock(id=task_id, state=state, result=result, output=output)
+
+
+@pytest.fixture
+def satellite():
+    satellite = mock.MagicMock()
+    satellite.api.ContentViewVersion.side_effect = lambda id: mock.Mock(
+        id=id, **{'promote.return_value': {'id': f'promote-{id}'}, 'read.return_value': id}
+    )
+    return satellite
+
+
+def content_view(cv_id):
+    return mock.Mock(id=cv_id, **{'publish.return_value': {'id': f'publish-{cv_id}'}})
+
+
+def test_publish_promote_pipeline(satellite):
+    cv1, cv2 = content_view(1), content_view(2)
+    cv2.read.return_value.version = [mock.Mock(id=20), mock.Mock(id=21)]
+    searches = iter(
+        [
+            # cv1 is published first, and promoted while cv2 is still publishing
+            {'publish-1': task('publish-1', output={'content_view_version_id': 10})},
+            {'publish-2': task('publish-2'), 'promote-10': task('promote-10')},
+            {},
+            {'promote-21': task('promote-21')},
+        ]
+    )
+    satellite.finished_tasks.side_effect = lambda task_ids: next(searches)
+    with mock.patch('robottelo.host_helpers.api_factory.time.sleep') as sleep:
+        versions = APIFactory(satellite).publish_promote(
+            [cv1, cv2], [mock.Mock(id=5), 6], poll_rate=1
+        )
+    assert versions == [10, 21]
+    cv1.publish.assert_called_once_with(synchronous=False)
+    cv1.read.assert_not_called()
+    assert sleep.call_count == 3
+    assert [call.args[0] for call in satellite.finished_tasks.call_args_list][-1] == ['promote-21']
+
+
+def test_publish_promote_failure(satellite):
+    cv = content_view(1)
+    satellite.finished_tasks.return_value = {'publish-1': task('publish-1', result='error')}
+    with pytest.raises(TaskFailedError):
+        APIFactory(satellite).publish_promote(cv, [5])
+
+
+def test_publish_promote_paused(satellite):
+    cv = content_view(1)
+    satellite.finished_tasks.return_value = {
+        'publish-1': task('publish-1', result='pending', state='paused')
+    }
+    with pytest.raises(TaskFailedError, match='state: paused'):
+        APIFactory(satellite).publish_promote(cv, [5])
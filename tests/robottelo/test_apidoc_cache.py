@@ -0,0 +1,76 @@
+"""Tests for the apidoc cache of ``robottelo.utils.apidoc_cache``."""
+
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from robottelo.utils import apidoc_cache
+
+APIDOC = {'docs': {'resources': {'organizations': {'methods': [{'name': 'index'}]}}}}
+
+
+@pytest.fixture
+def server(monkeypatch):
+    """Answer the checksum and apidoc requests, and count them"""
+    server = SimpleNamespace(checksum='abc123', downloads=0)
+
+    def fetch_apidoc(satellite):
+        server.downloads += 1
+        return {**APIDOC, 'version': satellite.version}
+
+    monkeypatch.setattr(apidoc_cache, 'fetch_checksum', lambda satellite: server.checksum)
+    monkeypatch.setattr(apidoc_cache, 'fetch_apidoc', fetch_apidoc)
+    monkeypatch.setattr(apidoc_cache, '_loaded', {})
+    return server
+
+
+def make_satellite(hostname='sat1.example.com', version='6.17.0'):
+    return SimpleNamespace(hostname=hostname, version=version, url=f'https://{hostname}')
+
+
+def test_shared_between_satellites_and_processes(server, tmp_path, monkeypatch):
+    apidoc = apidoc_cache.load_apidoc(make_satellite(), tmp_path)
+    assert apidoc['docs'] == APIDOC['docs']
+    # another Satellite object of the same version loads the apidoc of the process
+    assert apidoc_cache.load_apidoc(make_satellite('sat2.example.com'), tmp_path) is apidoc
+    # another process loads it from the disk
+    monkeypatch.setattr(apidoc_cache, '_loaded', {})
+    assert apidoc_cache.load_apidoc(make_satellite(), tmp_path) == apidoc
+    assert server.downloads == 1
+    assert [path.name for path in tmp_path.glob('*.pickle')] == ['6.17.0-abc123.pickle']
+
+
+def test_invalidated_by_version_and_checksum(server, tmp_path):
+    apidoc_cache.load_apidoc(make_satellite(), tmp_path)
+    upgraded = apidoc_cache.load_apidoc(make_satellite(version='6.18.0'), tmp_path)
+    assert upgraded['version'] == '6.18.0'
+    server.checksum = 'def456'
+    apidoc_cache.load_apidoc(make_satellite(version='6.18.0'), tmp_path)
+    assert server.downloads == 3
+
+
+def test_without_checksum(server, tmp_path):
+    server.checksum = None
+    apidoc_cache.load_apidoc(make_satellite(), tmp_path)
+    apidoc_cache.load_apidoc(make_satellite('sat2.example.com'), tmp_path)
+    # without checksum, the apidoc of a Satellite is not shared with other Satellites
+    assert server.downloads == 2
+
+
+def test_corrupted_and_pruned_entries(server, tmp_path, monkeypatch):
+    satellite = make_satellite()
+    path = tmp_path / f'{apidoc_cache.cache_key(satellite, server.checksum)}.pickle'
+    path.write_bytes(b'corrupted')
+    stale = tmp_path / 'old-version.pickle'
+    stale.write_bytes(b'')
+    os.utime(stale, (0, 0))
+    assert apidoc_cache.load_apidoc(satellite, tmp_path)['docs'] == APIDOC['docs']
+    assert server.downloads == 1
+    assert path.exists()
+    assert not stale.exists()
+    # an entry written by an interpreter with a newer pickle protocol is downloaded again
+    path.write_bytes(b'\x80\x09.')
+    monkeypatch.setattr(apidoc_cache, '_loaded', {})
+    assert apidoc_cache.load_apidoc(satellite, tmp_path)['docs'] == APIDOC['docs']
+    assert server.downloads == 2
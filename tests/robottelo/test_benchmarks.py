@@ -0,0 +1,148 @@
+"""Offline benchmarks of the robottelo CLI and API layers.
+
+The commands and requests are answered by the local Satellite simulator, so that only the
+robottelo overhead (command construction, parsing, factories) is measured. The throughput of every
+benchmark is recorded as a junit-xml property, to follow it across runs. The benchmarks check the
+commands and requests sent to the simulator for every call instead of their duration, which
+depends on the machine running them, so that an extra round trip to the Satellite fails them.
+"""
+
+from pathlib import Path
+import time
+
+import pytest
+
+from robottelo.cli import hammer
+from robottelo.cli.org import Org
+from robottelo.utils.satellite_simulator import (
+    SIMULATOR_HOSTNAME,
+    SatelliteSimulator,
+    render_csv,
+    render_info,
+    render_json,
+)
+
+FIXTURES = Path(__file__).parent / 'data' / 'satellite_simulator.yaml'
+# attributes of the cli classes sent to the simulator, other tests may change them on Base
+SIMULATED = {'hostname': SIMULATOR_HOSTNAME, 'command_requires_org': False}
+ITERATIONS = 200
+# latency injected to check that it is separated from the overhead, in seconds
+LATENCY = 0.002
+
+RECORDS = [
+    {
+        'Id': str(num),
+        'Name': f'repository-{num}',
+        'Product': 'product, with a comma',
+        'Content Type': 'yum',
+        'Url': f'https://fixtures.example.com/repos/{num}/',
+    }
+    for num in range(2000)
+]
+INFO = {
+    'Id': 1,
+    'Name': 'content-view',
+    'Organizations': [f'org-{num}' for num in range(200)],
+    'Lifecycle Environments': [{'Id': num, 'Name': f'lce-{num}'} for num in range(200)],
+    'Content': {'Repositories': 20, 'Packages': 14000},
+}
+
+
+def run_benchmark(record_property, name, func, iterations=ITERATIONS):
+    """Call ``func`` ``iterations`` times and record its throughput
+
+    :return: the result of the last call
+    """
+    start = time.perf_counter()
+    for _ in range(iterations):
+        result = func()
+    elapsed = time.perf_counter() - start
+    record_property(f'{name}_per_second', round(iterations / elapsed, 1))
+    record_property(f'{name}_overhead_ms', round(elapsed / iterations * 1000, 3))
+    return result
+
+
+def round_trips(simulator):
+    """Return the number of commands and requests answered by the simulator"""
+    return sum(simulator.calls.values())
+
+
+@pytest.fixture
+def simulator():
+    simulator = SatelliteSimulator(fixtures=FIXTURES)
+    with simulator.patch():
+        yield simulator
+
+
+@pytest.mark.parametrize(
+    ('parser', 'output', 'parsed'),
+    [
+        (hammer.parse_csv, render_csv(RECORDS), len(RECORDS)),
+        (hammer.parse_json, render_json(RECORDS), len(RECORDS)),
+        (hammer.parse_info, render_info(INFO), len(INFO)),
+    ],
+    ids=['csv', 'json', 'info'],
+)
+def test_benchmark_parsers(record_property, parser, output, parsed):
+    result = run_benchmark(record_property, parser.__name__, lambda: parser(output), 20)
+    assert len(result) == parsed
+
+
+@pytest.mark.parametrize(
+    ('method', 'commands'),
+    [
+        ('list', ['list']),
+        ('info', ['info']),
+        # create reads the created organization back
+        ('create', ['create', 'info']),
+    ],
+)
+def test_benchmark_base(record_property, simulator, method, commands):
+    org = type('Org', (Org,), SIMULATED)
+    calls = {
+        'list': org.list,
+        'info': lambda: org.info({'id': 1}),
+        'create': lambda: org.create({'name': 'benchmark'}),
+    }
+    run_benchmark(record_property, f'base_{method}', calls[method])
+    for command in commands:
+        assert simulator.calls[f'hammer organization {command}'] == ITERATIONS
+    assert round_trips(simulator) == len(commands) * ITERATIONS
+
+
+def test_benchmark_base_with_latency(record_property):
+    simulator = SatelliteSimulator(fixtures=FIXTURES, latency=LATENCY, jitter=LATENCY, seed=0)
+    org = type('Org', (Org,), SIMULATED)
+    with simulator.patch():
+        start = time.perf_counter()
+        for _ in range(50):
+            org.list()
+        elapsed = time.perf_counter() - start
+    overhead = (elapsed - simulator.injected_latency) / 50
+    record_property('base_list_latency_overhead_ms', round(overhead * 1000, 3))
+    # the latency is injected once per round trip, and is separated from the overhead
+    assert round_trips(simulator) == 50
+    assert 50 * LATENCY <= simulator.injected_latency <= 50 * 2 * LATENCY
+
+
+def test_benchmark_cli_factory(record_property, simulator):
+    satellite = simulator.satellite()
+    run_benchmark(record_property, 'cli_factory_make_org', satellite.cli_factory.make_org)
+    # make_org creates the organization, then reads it back
+    assert simulator.calls['hammer organization create'] == ITERATIONS
+    assert simulator.calls['hammer organization info'] == ITERATIONS
+    assert round_trips(simulator) == 2 * ITERATIONS
+
+
+def test_benchmark_api_factory(record_property, simulator):
+    satellite = simulator.satellite()
+    run_benchmark(
+        record_property,
+        'api_factory_check_create_os',
+        lambda: satellite.api_factory.check_create_os_with_title('RedHat 9.4'),
+        50,
+    )
+    # the operating systems of the simulator have no title, every call searches and creates one
+    assert simulator.calls['GET /api/v2/operatingsystems'] == 50
+    assert simulator.calls['POST /api/v2/operatingsystems'] == 50
+    assert all(call.split()[1].startswith('/api/v2/operatingsystems') for call in simulator.calls)
@@ -268,21 +268,34 @@ class BaseCliTestCase(unittest.TestCase):
     @mock.patch('robottelo.cli.base.Base._handle_response')
     @mock.patch('robottelo.cli.base.ssh.command')
     @mock.patch('robottelo.cli.base.settings')
-    def test_execute_with_performance(self, settings, command, handle_resp):
-        """Check executed build ssh method and delegate response handling"""
+    @mock.patch('robottelo.cli.base.timing.record')
+    def test_execute_with_performance(self, record, settings, command, handle_resp):
+        """Check executed build ssh method, records timing and delegate response handling"""
         settings.robottelo.locale = 'en_US'
-        settings.performance.timer_hammer = True
+        settings.performance.time_hammer = True
         settings.server.admin_username = 'admin'
         settings.server.admin_password = 'password'
+        command.return_value.status = 0
+        command.return_value.stdout = '[{"ID": 1}]'
+        command.return_value.stderr = 'real 1.50\nuser 0.90\nsys 0.10\n'
         response = Base.execute('some_cmd', hostname=None, output_format='json')
         ssh_cmd = 'LANG=en_US time -p hammer -v -u admin -p password --output=json some_cmd'
         command.assert_called_once_with(
             ssh_cmd,
             hostname=mock.ANY,
-            output_format='json',
+            output_format=None,
             timeout=None,
         )
+        record.assert_called_once_with(
+            Base.command_base,
+            Base.command_sub,
+            {'real': 1.5, 'user': 0.9, 'sys': 0.1},
+            mock.ANY,
+            len('[{"ID": 1}]'),
+        )
         handle_resp.assert_called_once_with(command.return_value, ignore_stderr=None)
+        assert command.return_value.stdout == [{'id': '1'}]
+        assert command.return_value.stderr == ''
         assert response is handle_resp.return_value
 
     @mock.patch('robottelo.cli.base.Base.list')
@@ -0,0 +1,53 @@
+"""Tests for module ``robottelo.cli.timing``."""
+
+import json
+
+import pytest
+
+from robottelo.cli import timing
+
+
+def test_percentile():
+    values = list(range(1, 101))
+    assert timing.percentile(values, 50) == 50
+    assert timing.percentile(values, 95) == 95
+    assert timing.percentile(values, 99) == 99
+    assert timing.percentile([3], 99) == 3
+    assert timing.percentile([], 50) is None
+
+
+def test_summarize():
+    records = [
+        {'command': 'host list', 'real': 1.0, 'latency': 1.5, 'output_size': 10},
+        {'command': 'host list', 'real': 3.0, 'latency': 3.5, 'output_size': 30},
+        {'command': 'org create', 'real': None, 'latency': 2.0, 'output_size': 0},
+    ]
+    summary = timing.summarize(records)
+    assert list(summary) == ['host list', 'org create']
+    assert summary['host list']['count'] == 2
+    assert summary['host list']['real'] == {
+        'min': 1.0,
+        'max': 3.0,
+        'mean': 2.0,
+        'p50': 1.0,
+        'p95': 3.0,
+        'p99': 3.0,
+    }
+    assert 'real' not in summary['org create']
+    assert summary['org create']['latency']['p50'] == 2.0
+
+
+def test_dump_load_and_report(tmp_path, monkeypatch):
+    monkeypatch.setattr(timing, '_records', [])
+    monkeypatch.setattr(timing, 'get_timing_dir', lambda: tmp_path)
+    timing.record('host', 'list', {'real': 1.0, 'user': 0.5, 'sys': 0.1}, 1.2, 42)
+    timing.dump_records('gw0')
+    tmp_path.joinpath('gw1.json').write_text(
+        json.dumps([{'command': 'host list', 'real': 2.0, 'latency': 2.4, 'output_size': 8}])
+    )
+    summary = timing.summarize(timing.load_records())
+    assert summary['host list']['count'] == 2
+    assert summary['host list']['latency']['max'] == pytest.approx(2.4)
+    timing.write_report(summary, tmp_path.joinpath('report'))
+    assert json.loads(tmp_path.joinpath('report.json').read_text()) == summary
+    assert '<td>host list</td><td>2</td>' in tmp_path.joinpath('report.html').read_text()
@@ -0,0 +1,144 @@
+"""Tests for the hammer command tree and index of ``robottelo.cli.command_tree``."""
+
+import json
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from robottelo import ssh
+from robottelo.cli import command_tree
+from robottelo.cli.contentview import ContentView
+from robottelo.cli.org import Org
+from robottelo.config import settings
+from robottelo.constants import DataFile
+from robottelo.exceptions import CLIReturnCodeError, CLIUsageError
+
+HELP = {
+    'hammer': '\n'.join(
+        [
+            'Subcommands:',
+            ' organization                  Manipulate organizations',
+            ' ping                          Get the status of the server',
+            'Options:',
+            ' -v, --[no-]verbose            Be verbose',
+        ]
+    ),
+    'hammer organization': '\n'.join(
+        [
+            'Subcommands:',
+            ' list, index                   List all organizations',
+            ' info, show                    Show an organization',
+        ]
+    ),
+    'hammer organization list': '\n'.join(
+        [
+            'Options:',
+            ' --per-page NUM                Number of results per page',
+            ' --search SEARCH               Filter results',
+            ' --location[-id|-title]        Set the current location context',
+        ]
+    ),
+    'hammer organization info': '\n'.join(
+        [
+            'Options:',
+            ' --id ID                       Organization ID',
+            ' --name, --title NAME          Organization name',
+        ]
+    ),
+    'hammer ping': 'Options:\n --timeout SECONDS             Timeout',
+}
+
+
+class FakeClient:
+    def __init__(self, clients):
+        clients.append(threading.get_ident())
+
+    def execute(self, cmd):
+        return SimpleNamespace(stdout=HELP[cmd.removesuffix(' --help')], status=0)
+
+
+@pytest.fixture
+def tree(monkeypatch):
+    clients = []
+    monkeypatch.setattr(ssh, 'get_client', lambda hostname: FakeClient(clients))
+    tree = command_tree.generate_command_tree('sat.example.com', workers=2)
+    # a client is created per thread, and reused for its commands
+    assert len(clients) == len(set(clients)) <= 2
+    return tree
+
+
+@pytest.fixture
+def validate(monkeypatch):
+    monkeypatch.setattr(settings.performance, 'validate_hammer_options', True, raising=False)
+
+
+def test_generate_command_tree(tree):
+    assert [sub['name'] for sub in tree['subcommands']] == ['organization', 'ping']
+    organization = tree['subcommands'][0]
+    assert organization['subcommand_aliases'] == ['index', 'show']
+    assert [option['name'] for option in organization['subcommands'][0]['options']] == [
+        'per-page',
+        'search',
+        'location',
+        'location-id',
+        'location-title',
+    ]
+    assert tree['option_aliases'] == ['no-verbose']
+
+
+def test_index(tree, tmp_path):
+    path = command_tree.write_index(tree, '6.17.0', tmp_path)
+    assert path == tmp_path / '6.17.0.json'
+    index = command_tree.load_index('6.17.0', tmp_path)
+    assert index['organization info']['options'] == {'id', 'name', 'title'}
+    assert index['organization']['subcommands'] == {'list', 'index', 'info', 'show'}
+    assert index[''] == {
+        'subcommands': {'organization', 'ping'},
+        'options': {'verbose', 'no-verbose'},
+    }
+    assert command_tree.load_index('6.18.0', tmp_path) is None
+    path.write_text(json.dumps({'format': 0}))
+    command_tree.load_index.cache_clear()
+    assert command_tree.load_index('6.17.0', tmp_path) is None
+
+
+def test_validate_command(tree):
+    index = command_tree.build_index(tree)
+    command_tree.validate_command('organization list', {'per-page': 10, 'search': None}, index)
+    # options and arguments embedded in the command are not validated
+    command_tree.validate_command('organization list --full', {}, index)
+    command_tree.validate_command('ping argument', {'timeout': 10}, index)
+    with pytest.raises(CLIUsageError):
+        command_tree.validate_command('unknown list', {}, index)
+    with pytest.raises(CLIUsageError) as err:
+        command_tree.validate_command('organization lsit', {}, index)
+    assert err.value.stderr.startswith("Error: No such sub-command 'lsit'.")
+    with pytest.raises(CLIReturnCodeError) as err:
+        command_tree.validate_command('organization info', {'id': 1, 'lable': 'x'}, index)
+    assert err.value.status == command_tree.USAGE_ERROR_STATUS
+    assert "'--lable'" in err.value.stderr
+    assert "'hammer organization info --help'" in err.value.stderr
+
+
+def test_construct_command_validation(tree, validate, monkeypatch):
+    monkeypatch.setattr(command_tree, 'load_index', lambda: command_tree.build_index(tree))
+    org = type('Org', (Org,), {'command_sub': 'info'})
+    assert org._construct_command({'id': 1}).split() == ['organization', 'info', '--id="1"']
+    with pytest.raises(CLIUsageError):
+        org._construct_command({'organization-id': 1})
+    # without an index, the commands are not validated
+    monkeypatch.setattr(command_tree, 'load_index', lambda: None)
+    assert '--organization-id="1"' in org._construct_command({'organization-id': 1})
+
+
+def test_recorded_command_tree():
+    """The cli classes use the subcommands and options of the recorded command tree"""
+    index = command_tree.build_index(json.loads(DataFile.HAMMER_COMMANDS_JSON.read_text()))
+    for command, options in [
+        (f'{Org.command_base} list', {'per-page': 10000, 'search': 'name=org'}),
+        (f'{Org.command_base} create', {'name': 'org', 'label': 'org', 'description': 'desc'}),
+        (f'{ContentView.command_base} publish', {'id': 1, 'organization-id': 1, 'async': True}),
+        ('ping', {}),
+    ]:
+        command_tree.validate_command(command, options, index)
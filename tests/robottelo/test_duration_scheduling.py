@@ -0,0 +1,67 @@
+"""Tests for the duration_scheduling pytest plugin"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from pytest_plugins.duration_scheduling import (
+    estimate_makespan,
+    merge_durations,
+    order_items,
+)
+
+
+def make_items(*nodeids):
+    return [SimpleNamespace(nodeid=nodeid) for nodeid in nodeids]
+
+
+def test_modules_ordered_longest_first():
+    items = make_items(
+        'test_a.py::test_1',
+        'test_a.py::test_2',
+        'test_b.py::test_1',
+        'test_c.py::test_2',
+        'test_c.py::test_1',
+    )
+    durations = {
+        'test_a.py::test_1': {'setup': 1, 'call': 1, 'teardown': 0},
+        'test_a.py::test_2': {'call': 1},
+        'test_b.py::test_1': {'setup': 30, 'call': 10},
+        'test_c.py::test_2': {'call': 5},
+        'test_c.py::test_1': {'call': 4},
+    }
+    ordered, costs = order_items(items, durations)
+    assert [item.nodeid for item in ordered] == [
+        'test_b.py::test_1',
+        'test_c.py::test_2',
+        'test_c.py::test_1',
+        'test_a.py::test_1',
+        'test_a.py::test_2',
+    ]
+    assert costs == {'test_a.py': 3, 'test_b.py': 40, 'test_c.py': 9}
+
+
+def test_unknown_tests_use_median_duration():
+    items = make_items('test_a.py::test_1', 'test_b.py::test_new', 'test_c.py::test_1')
+    durations = {
+        'test_a.py::test_1': {'call': 1},
+        'test_c.py::test_1': {'call': 9},
+        'test_d.py::test_1': {'call': 6},
+    }
+    ordered, costs = order_items(items, durations)
+    assert costs['test_b.py'] == 6
+    assert [item.nodeid for item in ordered][0] == 'test_c.py::test_1'
+
+
+def test_estimate_makespan():
+    assert estimate_makespan([40, 9, 3], 2) == 40
+    assert estimate_makespan([10, 8, 7, 5], 2) == 15
+    assert estimate_makespan([10, 8], 0) == 18
+
+
+def test_merge_durations():
+    recorded = {'test_a.py::test_1': {'call': 10}, 'test_b.py::test_1': {'call': 1}}
+    latest = {'test_a.py::test_1': {'setup': 2, 'call': 20}}
+    merged = merge_durations(recorded, latest)
+    assert merged['test_a.py::test_1'] == {'setup': 2, 'call': pytest.approx(15)}
+    assert merged['test_b.py::test_1'] == {'call': 1}
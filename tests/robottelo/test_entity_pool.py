@@ -0,0 +1,248 @@
+"""Tests for the entity pool of ``robottelo.utils.entity_pool``."""
+
+from collections import Counter
+import itertools
+from types import SimpleNamespace
+
+from box import Box
+import pytest
+
+from robottelo.constants import DEFAULT_CV, ENVIRONMENT
+from robottelo.utils import entity_pool
+from robottelo.utils.entity_pool import EntityPool, collect_entity_pools, pooled_entity
+
+
+class FakeEntity:
+    """A nailgun like entity, stored by :class:`FakeApi`"""
+
+    api = None
+
+    def __init__(self, **fields):
+        self.__dict__['fields'] = fields
+
+    def __getattr__(self, name):
+        try:
+            return self.fields[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __setattr__(self, name, value):
+        self.fields[name] = value
+
+    @property
+    def key(self):
+        return type(self).__name__, self.fields['id']
+
+    def get_values(self):
+        return {name: value for name, value in self.fields.items() if name != 'id'}
+
+    def create(self):
+        self.fields['id'] = next(self.api.ids)
+        self.fields.setdefault('name', f'{type(self).__name__}-{self.fields["id"]}')
+        self.api.store[self.key] = dict(self.fields)
+        self.api.calls['create', type(self).__name__] += 1
+        if type(self).__name__ == 'Organization':
+            self.api.LifecycleEnvironment(name=ENVIRONMENT, organization=self, prior=None).create()
+            self.api.ContentView(name=DEFAULT_CV, organization=self).create()
+        return self.read()
+
+    def read(self):
+        fields = dict(self.api.store[self.key])
+        if type(self).__name__ in ('Organization', 'Location'):
+            # like Foreman, the title of a taxonomy follows its name
+            fields['title'] = fields['name']
+        if type(self).__name__ == 'Organization':
+            fields['location'] = self.api.Location(organization=[self]).search()
+        return type(self)(**fields)
+
+    def update(self, fields):
+        self.api.store[self.key].update({name: self.fields[name] for name in fields})
+        return self.read()
+
+    def delete(self):
+        del self.api.store[self.key]
+        self.api.deleted.append(self.key)
+
+    def search(self, query=None):
+        filters = {name: getattr(value, 'id', value) for name, value in self.fields.items()}
+        for name, value in (query or {}).items():
+            if name == 'search':
+                name, value = value.split('=')
+            if name.endswith('_id'):
+                filters[name[: -len('_id')]] = int(value)
+        return [
+            type(self)(**fields)
+            for (entity_type, _), fields in self.api.store.items()
+            if entity_type == type(self).__name__
+            and all(
+                value in [getattr(item, 'id', item) for item in fields[name]]
+                if isinstance(fields.get(name), list)
+                else getattr(fields.get(name), 'id', fields.get(name)) == value
+                for name, value in filters.items()
+            )
+        ]
+
+
+class FakeApi:
+    def __init__(self):
+        self.store = {}
+        self.ids = itertools.count(1)
+        self.calls = Counter()
+        self.deleted = []
+        self._classes = {}
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        if name not in self._classes:
+            self._classes[name] = type(name, (FakeEntity,), {'api': self})
+        return self._classes[name]
+
+
+@pytest.fixture
+def satellite():
+    return SimpleNamespace(hostname='sat.example.com', api=FakeApi())
+
+
+@pytest.fixture
+def enabled(monkeypatch):
+    settings = Box({'performance': {'entity_pool': {'enabled': True, 'size': 3}}})
+    monkeypatch.setattr(entity_pool, 'settings', settings)
+    monkeypatch.setattr(entity_pool, '_pools', {})
+
+
+def make_request(*markers):
+    return SimpleNamespace(
+        node=SimpleNamespace(get_closest_marker=lambda name: name if name in markers else None)
+    )
+
+
+def test_recycle_clean_entities(enabled, satellite):
+    request = make_request()
+    with (
+        pooled_entity(request, satellite, 'organization') as org,
+        pooled_entity(request, satellite, 'product', org) as product,
+    ):
+        pass
+    # the organizations are created in bulk, its product is created when it is first leased
+    assert satellite.api.calls['create', 'Organization'] == 3
+    # the organizations created in bulk are leased before the recycled ones
+    for _ in range(2):
+        with pooled_entity(request, satellite, 'organization') as other:
+            assert other.id != org.id
+    # the product was deleted when its organization was released
+    assert product.key in satellite.api.deleted
+    with pooled_entity(request, satellite, 'organization') as recycled:
+        assert recycled.id == org.id
+        assert recycled.name != org.name
+        with pooled_entity(request, satellite, 'product', recycled) as new_product:
+            assert new_product.id != product.id
+        # the products are recycled while their organization is leased
+        with pooled_entity(request, satellite, 'product', recycled) as recycled_product:
+            assert recycled_product.id == new_product.id
+            assert recycled_product.name != new_product.name
+    assert satellite.api.calls['create', 'Organization'] == 3
+    assert satellite.api.calls['create', 'Product'] == 2
+    stats = entity_pool.get_entity_pool(satellite).stats
+    assert stats['organization'] == {'leases': 4, 'recycled': 3, 'discarded': 0}
+    assert stats['product'] == {'leases': 3, 'recycled': 1, 'discarded': 0}
+
+
+def test_recycle_taxonomies_many_times(enabled, satellite):
+    request = make_request()
+    pool = entity_pool.get_entity_pool(satellite)
+    pool.size = 1
+    # the title of the organization follows its name, and the organization lists the location
+    with (
+        pooled_entity(request, satellite, 'organization') as org,
+        pooled_entity(request, satellite, 'location', org) as location,
+    ):
+        pass
+    for _ in range(3):
+        with (
+            pooled_entity(request, satellite, 'organization') as recycled,
+            pooled_entity(request, satellite, 'location', recycled) as recycled_location,
+        ):
+            assert recycled.id == org.id
+            assert recycled.title == recycled.name
+            assert recycled_location.id == location.id
+    assert pool.stats['organization'] == {'leases': 4, 'recycled': 3, 'discarded': 0}
+    assert pool.stats['location'] == {'leases': 4, 'recycled': 3, 'discarded': 0}
+
+
+def test_discard_used_entities(enabled, satellite):
+    request = make_request()
+    pool = entity_pool.get_entity_pool(satellite)
+    with (
+        pooled_entity(request, satellite, 'organization') as org,
+        pooled_entity(request, satellite, 'product', org) as product,
+    ):
+        satellite.api.Repository(product=product).create()
+    # the product holds a repository, and the organization an unpooled product
+    assert pool.stats['product']['discarded'] == 1
+    assert pool.stats['organization']['discarded'] == 1
+    with pooled_entity(request, satellite, 'organization') as other:
+        assert other.id != org.id
+        other.description = 'changed'
+        other.update(['description'])
+    assert pool.stats['organization']['discarded'] == 2
+    with pooled_entity(request, satellite, 'organization') as other:
+        satellite.api.ActivationKey(organization=other).create()
+    assert pool.stats['organization']['discarded'] == 3
+
+
+def test_discarded_organization_children(enabled, satellite):
+    request = make_request()
+    pool = entity_pool.get_entity_pool(satellite)
+    pool.size = 1
+    with pooled_entity(request, satellite, 'organization') as org:
+        with pooled_entity(request, satellite, 'lifecycle_environment', org):
+            pass
+        satellite.api.Host(organization=org).create()
+    assert not pool.available_children(org)
+    with pooled_entity(request, satellite, 'organization') as other:
+        assert other.id != org.id
+
+
+def test_fresh_entities(enabled, satellite):
+    request = make_request('fresh_entities')
+    # the product of an organization that is not pooled is not pooled either
+    with (
+        pooled_entity(request, satellite, 'organization') as org,
+        pooled_entity(make_request(), satellite, 'product', org) as product,
+    ):
+        pass
+    assert satellite.api.calls['create', 'Organization'] == 1
+    assert not entity_pool.get_entity_pool(satellite).owned
+    assert product.key in satellite.api.store
+
+
+def test_disabled(satellite):
+    with pooled_entity(make_request(), satellite, 'location') as location:
+        assert location.key in satellite.api.store
+    assert satellite.hostname not in entity_pool._pools
+
+
+def test_collect(enabled, satellite):
+    request = make_request()
+    with pooled_entity(request, satellite, 'organization') as org:
+        with pooled_entity(request, satellite, 'location', org):
+            pass
+        with pooled_entity(request, satellite, 'product', org):
+            pass
+    report = collect_entity_pools()
+    # the products are deleted when their organization is released, and the pooled locations
+    # before the organizations
+    assert report[satellite.hostname]['deleted'] == 4
+    assert [key[0] for key in satellite.api.deleted] == ['Product', 'Location'] + [
+        'Organization'
+    ] * 3
+    assert not entity_pool._pools
+
+
+def test_bulk_size(satellite):
+    pool = EntityPool(satellite, size=2)
+    first = pool.acquire('location')
+    second = pool.acquire('location')
+    assert first.id != second.id
+    assert satellite.api.calls['create', 'Location'] == 2
@@ -0,0 +1,169 @@
+"""Tests for the entity tracker of ``robottelo.utils.entity_tracker``."""
+
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+from pytest_plugins.entity_tracker import _keeps_entities
+from robottelo.config import settings
+from robottelo.utils import entity_tracker
+
+
+class FakeEntity:
+    """A nailgun entity, created with the next id and recording its deletion"""
+
+    ids = iter(range(1, 1000))
+    deleted = []
+
+    def __init__(self, organization=None, fail=None, server_config='admin'):
+        self.organization = organization
+        self.fail = fail
+        self._server_config = server_config
+
+    def create(self):
+        self.id = next(FakeEntity.ids)
+        return self
+
+    def delete(self):
+        if self.fail:
+            raise self.fail
+        assert self._server_config == 'admin'
+        FakeEntity.deleted.append((type(self).__name__, self.id))
+
+
+class Organization(FakeEntity):
+    pass
+
+
+class Product(FakeEntity):
+    pass
+
+
+class Host(FakeEntity):
+    pass
+
+
+class Org:
+    """A CLI class of a Satellite"""
+
+    hostname = 'sat.example.com'
+    deleted = []
+
+    @classmethod
+    def delete(cls, options):
+        cls.deleted.append(options)
+
+
+@pytest.fixture
+def api(monkeypatch):
+    monkeypatch.setattr(
+        settings.performance, 'entity_tracker', {'enabled': True, 'db_growth': False}, raising=False
+    )
+    monkeypatch.setattr(entity_tracker, '_trackers', {})
+    monkeypatch.setitem(entity_tracker._state, 'module', None)
+    monkeypatch.setattr(FakeEntity, 'deleted', [])
+    satellite = SimpleNamespace(hostname='sat.example.com', nailgun_cfg='admin')
+    return SimpleNamespace(
+        **{
+            cls.__name__: type(
+                cls.__name__,
+                (cls,),
+                {'create': entity_tracker.tracked_create(satellite, cls.__name__, cls.create)},
+            )
+            for cls in (Organization, Product, Host)
+        }
+    )
+
+
+def test_collect_module(api):
+    entity_tracker.set_module('test_a.py')
+    org = api.Organization().create()
+    api.Product(organization=org).create()
+    host = api.Host().create()
+    with entity_tracker.fixture_scope('session'):
+        session_org = api.Organization().create()
+    with entity_tracker.untracked():
+        api.Organization().create()
+    entity_tracker.set_module('test_b.py')
+    api.Product(organization=session_org).create()
+    (tracker,) = entity_tracker.get_entity_trackers()
+    tracker.collect('test_a.py')
+    # the product is deleted with its organization, hosts are deleted before organizations
+    assert FakeEntity.deleted == [('Host', host.id), ('Organization', org.id)]
+    report = tracker.report('test_a.py')
+    assert report == {'created': 4, 'deleted': 3, 'gone': 0, 'failed': 0, 'db_growth': None}
+    tracker.collect()
+    assert FakeEntity.deleted[2:] == [('Organization', session_org.id)]
+    assert tracker.records == []
+
+
+def test_delete_as_admin(api):
+    entity_tracker.set_module('test_a.py')
+    product = api.Product(server_config='user').create()
+    (tracker,) = entity_tracker.get_entity_trackers()
+    tracker.collect()
+    # the product of a user is deleted as admin, the user may be deleted before it
+    assert FakeEntity.deleted == [('Product', product.id)]
+    assert product._server_config == 'user'
+
+
+def test_delete_failures(api):
+    entity_tracker.set_module('test_a.py')
+    not_found = requests.HTTPError(response=SimpleNamespace(status_code=404))
+    api.Product(fail=not_found).create()
+    api.Product(fail=requests.HTTPError(response=SimpleNamespace(status_code=500))).create()
+    (tracker,) = entity_tracker.get_entity_trackers()
+    tracker.collect()
+    assert tracker.report('test_a.py') == {
+        'created': 2,
+        'deleted': 0,
+        'gone': 1,
+        'failed': 1,
+        'db_growth': None,
+    }
+
+
+def test_failed_organization_deletion(api):
+    entity_tracker.set_module('test_a.py')
+    org = api.Organization(fail=requests.HTTPError(response=SimpleNamespace(status_code=500)))
+    org = org.create()
+    api.Product(organization=org).create()
+    (tracker,) = entity_tracker.get_entity_trackers()
+    tracker.collect()
+    # the product was not deleted with its organization
+    assert tracker.report('test_a.py') == {
+        'created': 2,
+        'deleted': 0,
+        'gone': 0,
+        'failed': 2,
+        'db_growth': None,
+    }
+
+
+def test_upgrade_entities_not_tracked():
+    def item(marker=None, fixturenames=()):
+        return SimpleNamespace(
+            get_closest_marker=lambda name: name if name == marker else None,
+            fixturenames=fixturenames,
+        )
+
+    assert _keeps_entities(item(marker='pre_upgrade'))
+    assert _keeps_entities(item(fixturenames=('target_sat', 'save_test_data')))
+    assert not _keeps_entities(item(marker='post_upgrade', fixturenames=('target_sat',)))
+
+
+def test_cli_entities(api, monkeypatch):
+    monkeypatch.setattr(Org, 'deleted', [])
+    entity_tracker.record_cli_entity(Org, {'name': 'org'}, {'id': '5', 'name': 'org'})
+    entity_tracker.record_cli_entity(Org, {'organization-id': 5}, 'not an entity')
+    (tracker,) = entity_tracker.get_entity_trackers()
+    assert [(record['kind'], record['id']) for record in tracker.records] == [('Organization', '5')]
+    tracker.collect()
+    assert Org.deleted == [{'id': '5'}]
+
+
+def test_disabled(api, monkeypatch):
+    monkeypatch.setattr(settings.performance.entity_tracker, 'enabled', False)
+    api.Organization().create()
+    assert entity_tracker.get_entity_trackers() == []
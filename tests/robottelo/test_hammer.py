@@ -24,6 +24,20 @@ class TestParseCSV:
         ]
 
 
+class TestParseTime:
+    """Tests for parsing ``time -p`` output of hammer commands"""
+
+    def test_parse_time(self):
+        stderr = 'Warning: some warning\nreal 12.04\nuser 3.51\nsys 0.42\n'
+        assert hammer.parse_time(stderr) == (
+            {'real': 12.04, 'user': 3.51, 'sys': 0.42},
+            'Warning: some warning\n',
+        )
+
+    def test_parse_time_without_timing(self):
+        assert hammer.parse_time('Warning: some warning\n') == ({}, 'Warning: some warning\n')
+
+
 class TestParseJSON:
     """Tests for parsing JSON hammer output"""
 
@@ -0,0 +1,208 @@
+"""Tests for module ``robottelo.hosts``."""
+
+import os
+import subprocess
+import time
+from types import SimpleNamespace
+from unittest import mock
+
+from broker.hosts import Host
+import pytest
+
+from robottelo.exceptions import CLIReturnCodeError, ContentHostError
+from robottelo.hosts import (
+    DB_QUERY_DELIMITER,
+    Capsule,
+    ContentHost,
+    clear_registration_commands,
+    generate_registration_command,
+    register_many,
+)
+
+
+def fact_output(**facts):
+    """Build the output of the facts gathering script from (status, stdout) tuples"""
+    return ''.join(
+        f'<<<robottelo-fact:{name}>>>\n{stdout}<<<robottelo-status:{status}>>>\n'
+        for name, (status, stdout) in facts.items()
+    )
+
+
+@pytest.fixture
+def host():
+    with mock.patch.object(Host, '__init__', return_value=None):
+        host = ContentHost('host.example.com')
+    host.hostname = 'host.example.com'
+    return host
+
+
+def test_gather_facts(host):
+    output = fact_output(
+        _os_release=(0, 'NAME="Red Hat Enterprise Linux"\nID="rhel"\nVERSION_ID="9.4"\n'),
+        _redhat_release=(0, 'Red Hat Enterprise Linux release 9.4 (Plow)\n'),
+        arch=(0, 'x86_64\n'),
+        is_el=(0, '  File: /etc/redhat-release\n'),
+    )
+    with mock.patch.object(ContentHost, 'execute') as execute:
+        execute.return_value.stdout = output
+        facts = host.gather_facts()
+        assert execute.call_count == 1
+        assert host.os_version.major == 9
+        assert host.os_distro == 'Red Hat Enterprise Linux'
+        assert host.arch == 'x86_64'
+        assert host.is_el is True
+        assert execute.call_count == 1
+    assert set(facts) == {'_os_release', '_redhat_release', 'arch', 'is_el'}
+
+
+def test_gather_facts_fallbacks(host):
+    output = fact_output(
+        _os_release=(1, ''),
+        _redhat_release=(0, 'CentOS Stream release 9\n'),
+        is_el=(0, ''),
+    )
+    with mock.patch.object(ContentHost, 'execute') as execute:
+        execute.return_value.stdout = output
+        host.gather_facts(['_os_release', '_redhat_release', 'is_el'])
+    assert host._os_release == host._redhat_release
+    assert host._os_release['ID'] == 'centos'
+    assert host._os_release['VERSION_ID'] == '9'
+
+
+def test_gather_facts_selective_refresh(host):
+    host.__dict__.update(arch='aarch64', is_el=False)
+    with mock.patch.object(ContentHost, 'execute') as execute:
+        execute.return_value.stdout = fact_output(arch=(0, 'x86_64\n'))
+        host.gather_facts(['arch'])
+        assert 'uname -m' in execute.call_args.args[0]
+        assert 'os-release' not in execute.call_args.args[0]
+    assert host.arch == 'x86_64'
+    assert host.is_el is False
+
+
+def run_locally(self, command, timeout=None):
+    result = subprocess.run(['bash', '-c', command], capture_output=True, text=True)
+    return SimpleNamespace(status=result.returncode, stdout=result.stdout, stderr=result.stderr)
+
+
+def test_execute_many(host):
+    commands = [
+        'echo one; echo err >&2',
+        'printf "no newline"',
+        'cd /tmp; false',
+        'pwd',
+    ]
+    with mock.patch.object(ContentHost, 'execute', run_locally):
+        results = host.execute_many(commands)
+    assert [(r.status, r.stdout, r.stderr) for r in results] == [
+        (0, 'one\n', 'err\n'),
+        (0, 'no newline', ''),
+        (1, '', ''),
+        # the commands do not share their working directory
+        (0, f'{os.getcwd()}\n', ''),
+    ]
+    with mock.patch.object(ContentHost, 'execute', run_locally):
+        results = host.execute_many(commands, stop_on_failure=True)
+        assert [r.status for r in results] == [0, 0, 1]
+        assert host.execute_many([]) == []
+
+
+@pytest.fixture
+def target():
+    # register() only accepts Satellite and Capsule objects
+    target = type('Satellite', (mock.MagicMock,), {})()
+    target.satellite.hostname = 'satellite.example.com'
+    target.satellite.cli.HostRegistration.generate_command.side_effect = lambda options: (
+        f'curl {options["activation-keys"]}\n'
+    )
+    yield target
+    clear_registration_commands()
+
+
+def test_generate_registration_command_cache(target):
+    generate = target.satellite.cli.HostRegistration.generate_command
+    options = {'activation-keys': 'ak', 'insecure': 'true'}
+    assert generate_registration_command(target, options, cache=True) == 'curl ak\n'
+    assert generate_registration_command(target, dict(options), cache=True) == 'curl ak\n'
+    assert generate.call_count == 1
+    generate_registration_command(target, {**options, 'activation-keys': 'ak2'}, cache=True)
+    generate_registration_command(target, options)
+    assert generate.call_count == 3
+    with mock.patch('robottelo.hosts.time.time', return_value=time.time() + 3600):
+        generate_registration_command(target, options, cache=True)
+    assert generate.call_count == 4
+
+
+def test_register_many(target):
+    hosts = []
+    for name in ('host1', 'host2', 'host3'):
+        with mock.patch.object(Host, '__init__', return_value=None):
+            host = ContentHost(f'{name}.example.com')
+        host.hostname = f'{name}.example.com'
+        hosts.append(host)
+    executed = []
+
+    def execute(self, cmd):
+        if self.hostname == 'host2.example.com':
+            raise ContentHostError('connection lost')
+        executed.append((self.hostname, cmd))
+        return f'registered {self.hostname}'
+
+    with mock.patch.object(ContentHost, 'execute', execute):
+        results = register_many(hosts, None, None, 'ak', target, max_workers=2)
+    assert results[0] == 'registered host1.example.com'
+    assert isinstance(results[1], ContentHostError)
+    assert results[2] == 'registered host3.example.com'
+    assert sorted(executed) == [
+        ('host1.example.com', 'curl ak'),
+        ('host3.example.com', 'curl ak'),
+    ]
+    assert target.satellite.cli.HostRegistration.generate_command.call_count == 1
+
+
+@pytest.fixture
+def capsule():
+    capsule = Capsule.__new__(Capsule)
+    with mock.patch.object(Capsule, 'execute') as execute:
+        execute.return_value = SimpleNamespace(status=0, stdout='', stderr='')
+        yield capsule
+
+
+def test_query_db_batch(capsule):
+    # json_agg prints nothing for an empty result, psql ends every output with a new line
+    capsule.execute.return_value.stdout = (
+        f'[{{"id": 1, "name": "a"}}, {{"id": 2, "name": "b"}}]\n{DB_QUERY_DELIMITER}\n'
+        f'\n{DB_QUERY_DELIMITER}\n'
+    )
+    results = capsule.query_db_batch(['SELECT id, name FROM hosts', 'SELECT id FROM users'])
+    assert results == [[{'id': 1, 'name': 'a'}, {'id': 2, 'name': 'b'}], []]
+    # all the queries are run by a single psql process
+    capsule.execute.assert_called_once()
+
+
+def test_query_db_quoting(capsule):
+    capsule.execute.return_value.stdout = f'[{{"name": "a"}}]\n{DB_QUERY_DELIMITER}\n'
+    query = '''SELECT "name" FROM hosts WHERE name = 'a';'''
+    assert capsule.query_db(query) == [{'name': 'a'}]
+    (command,), _ = capsule.execute.call_args
+    # the query is passed verbatim through a quoted heredoc, without its trailing semicolon
+    assert '''FROM (SELECT "name" FROM hosts WHERE name = 'a') t;''' in command
+    assert "<<'ROBOTTELO_SQL'" in command
+
+
+def test_query_db_failure(capsule):
+    capsule.execute.return_value = SimpleNamespace(
+        status=3, stdout='', stderr='ERROR:  relation "nope" does not exist'
+    )
+    with pytest.raises(CLIReturnCodeError, match='does not exist'):
+        capsule.query_db('SELECT * FROM nope')
+
+
+def test_query_db_rows(capsule):
+    capsule.execute.return_value.stdout = '{"id": 1}\n{"id": 2}\n\n'
+    assert list(capsule.query_db_rows('SELECT id FROM hosts', fetch_count=50)) == [
+        {'id': 1},
+        {'id': 2},
+    ]
+    (command,), _ = capsule.execute.call_args
+    assert '\\set FETCH_COUNT 50' in command
@@ -0,0 +1,77 @@
+"""Import time benchmark of ``robottelo.hosts``.
+
+Importing ``robottelo.hosts`` must not load the settings, configure nailgun, nor import airgun. All
+are deferred to their first use, so that every xdist worker and script does not pay for them at
+import time. The ``-X importtime`` output of the import is checked for the heavy modules only the
+UI and apidoc tests need, and against a generous budget, ``ROBOTTELO_IMPORT_TIME_BUDGET`` seconds.
+"""
+
+import os
+import subprocess
+import sys
+
+from robottelo.logging import robottelo_root_dir
+
+# cumulative import time budget of robottelo.hosts, in seconds, generous for slow CI machines
+IMPORT_TIME_BUDGET = float(os.environ.get('ROBOTTELO_IMPORT_TIME_BUDGET', 10.0))
+# the packages robottelo.hosts must not import, they are imported on first use
+DEFERRED_PACKAGES = ('airgun', 'selenium', 'widgetastic', 'apypie')
+
+CHECK_LAZY_IMPORT = '''
+import sys
+import robottelo.hosts
+from robottelo.config import settings
+entity_mixins = sys.modules.get('nailgun.entity_mixins')
+print(
+    settings.configured,
+    'airgun' in sys.modules,
+    getattr(entity_mixins, 'CREATE_MISSING', False),
+)
+'''
+
+
+def run_python(*args):
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=robottelo_root_dir,
+        env=os.environ,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def parse_importtime(stderr):
+    """Return the cumulative import time of each module, in seconds, from -X importtime output"""
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, module = line.split('|')
+        times[module.strip()] = int(cumulative) / 1e6
+    return times
+
+
+def test_parse_importtime():
+    stderr = (
+        'import time: self [us] | cumulative | imported package\n'
+        'import time:       120 |        120 |   robottelo.enums\n'
+        'import time:     35034 |    1116683 | robottelo.hosts\n'
+    )
+    assert parse_importtime(stderr) == {'robottelo.enums': 0.00012, 'robottelo.hosts': 1.116683}
+
+
+def test_import_time_budget():
+    result = run_python('-X', 'importtime', '-c', 'import robottelo.hosts')
+    times = parse_importtime(result.stderr)
+    deferred = sorted(module for module in times if module.split('.')[0] in DEFERRED_PACKAGES)
+    assert not deferred, f'import robottelo.hosts imports {", ".join(deferred)}'
+    import_time = times['robottelo.hosts']
+    assert import_time < IMPORT_TIME_BUDGET, (
+        f'import robottelo.hosts took {import_time:.2f}s, over the {IMPORT_TIME_BUDGET}s budget'
+    )
+
+
+def test_import_is_lazy():
+    result = run_python('-c', CHECK_LAZY_IMPORT)
+    assert result.stdout.split() == ['False', 'False', 'False']
@@ -0,0 +1,64 @@
+"""Tests for the queue logging pipeline of ``robottelo.logging``"""
+
+import logging
+from logging.handlers import RotatingFileHandler
+import queue
+
+import pytest
+
+from robottelo.logging import (
+    OverflowQueueHandler,
+    disable_queue_logging,
+    enable_queue_logging,
+    get_queue_logging_stats,
+)
+
+
+@pytest.fixture
+def test_logger(tmp_path):
+    _logger = logging.getLogger('robottelo.test_queue_logging')
+    _logger.propagate = False
+    _logger.setLevel(logging.DEBUG)
+    file_handler = logging.FileHandler(tmp_path / 'worker.log', delay=True)
+    rotating_handler = RotatingFileHandler(tmp_path / 'rotating.log')
+    rotating_handler.setLevel(logging.INFO)
+    for handler in (file_handler, rotating_handler):
+        handler.setFormatter(logging.Formatter('%(levelname)s %(message)s'))
+        _logger.addHandler(handler)
+    yield _logger
+    disable_queue_logging()
+    for handler in _logger.handlers[:]:
+        handler.close()
+        _logger.removeHandler(handler)
+
+
+def test_queue_logging(test_logger, tmp_path):
+    handlers = test_logger.handlers[:]
+    enable_queue_logging([test_logger], size=1000, batch_size=10)
+    assert isinstance(test_logger.handlers[0], OverflowQueueHandler)
+    for index in range(25):
+        test_logger.debug('debug %s', index)
+    test_logger.info('info')
+    try:
+        raise ValueError('boom')
+    except ValueError:
+        test_logger.exception('failed')
+    disable_queue_logging()
+    assert test_logger.handlers == handlers
+    worker_log = (tmp_path / 'worker.log').read_text().splitlines()
+    assert worker_log[:2] == ['DEBUG debug 0', 'DEBUG debug 1']
+    assert 'INFO info' in worker_log
+    assert 'ValueError: boom' in worker_log
+    assert (tmp_path / 'rotating.log').read_text().startswith('INFO info\nERROR failed\n')
+
+
+def test_overflow_accounting():
+    handler = OverflowQueueHandler(queue.Queue(1), route='test', block_timeout=0.01)
+    for level in (logging.DEBUG, logging.INFO, logging.ERROR):
+        handler.handle(logging.LogRecord('test', level, __file__, 1, 'message', None, None))
+    assert handler.dropped == 2
+    assert handler.queue.get_nowait().queue_route == 'test'
+
+
+def test_stats_when_disabled():
+    assert get_queue_logging_stats() == {'queued': 0, 'dropped': 0}
@@ -0,0 +1,123 @@
+"""Tests for the manifest pool of ``robottelo.utils.manifest_pool``."""
+
+from pathlib import Path
+import threading
+import time
+
+import pytest
+
+from robottelo.utils.manifest_pool import ManifestPool
+
+
+class FakeManifester:
+    """Generate and delete manifest files, instead of subscription allocations"""
+
+    def __init__(self):
+        self.generated = []
+        self.deleted = []
+        self.lock = threading.Lock()
+
+    def generate(self, category, pool_dir):
+        with self.lock:
+            self.generated.append(category)
+            num = len(self.generated)
+        path = Path(pool_dir, f'{category}-{num}.zip')
+        path.write_bytes(f'{category}-{num}'.encode())
+        return {'uuid': f'{category}-{num}', 'name': f'manifest-{num}', 'path': str(path)}
+
+    def delete(self, entry):
+        self.deleted.append(entry['uuid'])
+        Path(entry['path']).unlink()
+
+
+@pytest.fixture
+def manifester():
+    return FakeManifester()
+
+
+@pytest.fixture
+def make_pool(tmp_path, manifester):
+    def make_pool(**kwargs):
+        options = {'size': 1, 'max_age': 3600, 'lease_timeout': 60, 'refill': False}
+        return ManifestPool(
+            pool_dir=tmp_path,
+            generate=manifester.generate,
+            delete=manifester.delete,
+            **{**options, **kwargs},
+        )
+
+    return make_pool
+
+
+def test_lease_reuse_per_satellite(make_pool, manifester):
+    pool = make_pool()
+    with pool.lease('golden_ticket', 'sat1.example.com') as manifest:
+        assert manifest.content == b'golden_ticket-1'
+        # a leased manifest is not leased again
+        with pool.lease('golden_ticket', 'sat2.example.com') as other:
+            assert other.uuid == 'golden_ticket-2'
+    # the manifest was imported to sat1, it can only be leased for another Satellite
+    assert pool.acquire('golden_ticket', 'sat2.example.com').uuid == 'golden_ticket-1'
+    # the refills run concurrently, either of their manifests may be the oldest
+    assert pool.acquire('golden_ticket', 'sat1.example.com').uuid != 'golden_ticket-1'
+    assert pool.acquire('els_rhel_manifest', 'sat1.example.com').content == b'els_rhel_manifest-3'
+    assert manifester.generated == ['golden_ticket', 'golden_ticket', 'els_rhel_manifest']
+    report = pool.report()
+    assert report['golden_ticket']['leases'] == 4
+    assert report['golden_ticket']['hits'] == 2
+    assert report['golden_ticket']['hit_rate'] == 0.5
+    assert report['els_rhel_manifest']['generated'] == 1
+
+
+def test_release_not_imported(make_pool, manifester):
+    pool = make_pool()
+    manifest = pool.acquire('golden_ticket', 'sat1.example.com')
+    pool.release(manifest, 'sat1.example.com', imported=False)
+    assert pool.acquire('golden_ticket', 'sat1.example.com').uuid == manifest.uuid
+    assert manifester.generated == ['golden_ticket']
+
+
+def test_pool_shared_between_instances(make_pool):
+    with make_pool().lease('golden_ticket', 'sat1.example.com') as manifest:
+        pass
+    assert make_pool().acquire('golden_ticket', 'sat2.example.com').uuid == manifest.uuid
+
+
+def test_refill(make_pool, manifester):
+    pool = make_pool(size=2, refill=True)
+    pool.acquire('golden_ticket', 'sat1.example.com')
+    pool.join(10)
+    # the leased manifest is not available, the refill generates two more
+    assert manifester.generated == ['golden_ticket'] * 3
+    # the refills run concurrently, either of their manifests may be the oldest
+    assert pool.acquire('golden_ticket', 'sat1.example.com').uuid != 'golden_ticket-1'
+    pool.join(10)
+    assert len(manifester.generated) == 4
+    assert not pool.state.read()['generating']
+
+
+def test_wait_for_generation(make_pool, manifester, monkeypatch):
+    monkeypatch.setattr('robottelo.utils.manifest_pool.WAIT_POLL_RATE', 0.01)
+    pool = make_pool()
+    with pool.state.update() as data:
+        data['generating'] = {'other-worker': ('golden_ticket', time.time())}
+    generator = make_pool()
+    timer = threading.Timer(0.2, generator._generate, args=('golden_ticket', 'other-worker'))
+    timer.start()
+    manifest = pool.acquire('golden_ticket', 'sat1.example.com')
+    timer.join()
+    assert manifest.uuid == 'golden_ticket-1'
+    assert manifester.generated == ['golden_ticket']
+    assert pool.report()['golden_ticket']['wait_max'] >= 0.1
+
+
+def test_retire_expired(make_pool, manifester):
+    pool = make_pool()
+    leased = pool.acquire('golden_ticket', 'sat1.example.com')
+    expired = pool.acquire('golden_ticket', 'sat1.example.com')
+    pool.release(expired, 'sat1.example.com')
+    pool.max_age = 0
+    assert pool.retire_expired() == 1
+    assert manifester.deleted == [expired.uuid]
+    assert not expired.path.exists()
+    assert list(pool.state.read()['manifests']) == [leased.uuid]
@@ -0,0 +1,78 @@
+"""Tests for the Ohsnap client of ``robottelo.utils.ohsnap``."""
+
+from types import SimpleNamespace
+
+from box import Box
+import pytest
+
+from robottelo.utils import ohsnap as ohsnap_module
+
+HOST = 'https://ohsnap.example.com'
+STREAMS = [{'id': '6.17', 'release_ids': ['6.17.0', '6.17.1']}]
+REPOSITORIES = [{'label': 'satellite', 'baseurl': f'{HOST}/repos/$basearch'}]
+
+
+class FakeSession:
+    """Answer the Ohsnap requests, with an ETag, and record them"""
+
+    def __init__(self):
+        self.requests = []
+        self.etag = '"v1"'
+
+    def get(self, url, params=None, headers=None):
+        self.requests.append((url, params, headers))
+        data = STREAMS if url.endswith('/api/streams') else REPOSITORIES
+        status = 304 if headers.get('If-None-Match') == self.etag else 200
+        return SimpleNamespace(
+            url=url, status_code=status, json=lambda: data, headers={'ETag': self.etag}
+        )
+
+
+@pytest.fixture
+def ohsnap(monkeypatch, tmp_path):
+    ohsnap = Box(
+        host=HOST,
+        request_retry={'timeout': 10, 'delay': 1},
+        cache={'ttl': 3600, 'directory': str(tmp_path)},
+    )
+    monkeypatch.setattr(ohsnap_module, '_clients', {})
+    client = ohsnap_module.get_ohsnap_client(ohsnap)
+    client.session = FakeSession()
+    client.url_status = lambda url: 200
+    return ohsnap
+
+
+def test_repo_url_cached(ohsnap):
+    for _ in range(3):
+        url = ohsnap_module.ohsnap_repo_url(ohsnap, 'repo_file', 'satellite', '6.17', '9')
+    assert url == f'{HOST}/api/releases/6.17.1/el9/satellite/repo_file'
+    repository = ohsnap_module.dogfood_repository(ohsnap, 'satellite', 'satellite', '6.17', '9')
+    assert repository.baseurl == f'{HOST}/repos/x86_64'
+    # the cached response is not modified by the caller
+    repository = ohsnap_module.dogfood_repository(
+        ohsnap, 'satellite', 'satellite', '6.17', '9', arch='aarch64'
+    )
+    assert repository.baseurl == f'{HOST}/repos/aarch64'
+    assert len(ohsnap_module.get_ohsnap_client(ohsnap).session.requests) == 2
+
+
+def test_disk_cache_and_conditional_refresh(ohsnap, tmp_path):
+    session = ohsnap_module.get_ohsnap_client(ohsnap).session
+    ohsnap_module.ohsnap_repo_url(ohsnap, 'repo_file', 'satellite', '6.17', '9')
+    # another process uses the responses cached on disk
+    other = ohsnap_module.OhsnapClient(ohsnap)
+    other.session = session
+    assert other.get_json(f'{HOST}/api/streams') == STREAMS
+    assert len(session.requests) == 1
+    # an expired entry is refreshed with a conditional request
+    expired = ohsnap_module.OhsnapClient(ohsnap, ttl=0)
+    expired.session = session
+    assert expired.get_json(f'{HOST}/api/streams') == STREAMS
+    assert session.requests[-1][2] == {'If-None-Match': '"v1"'}
+    session.etag = '"v2"'
+    expired.get_json(f'{HOST}/api/streams')
+    assert [entry['etag'] for entry in expired._memory.values()] == ['"v2"']
+    # the parameters are part of the cache key
+    other.get_json(f'{HOST}/api/streams', params={'all': 'true'})
+    assert len(session.requests) == 4
+    assert len(list(tmp_path.glob('*.json'))) == 2
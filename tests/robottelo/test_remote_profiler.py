@@ -0,0 +1,73 @@
+"""Tests for the remote_profiler pytest plugin"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from pytest_plugins.remote_profiler import (
+    RemoteCallProfiler,
+    result_size,
+    stats_to_properties,
+)
+
+
+class Remote:
+    def execute(self, command):
+        return SimpleNamespace(stdout=command, stderr='err')
+
+    @classmethod
+    def hammer(cls, command):
+        # hammer calls run their command over SSH
+        cls().execute(command)
+        return [{'id': '1'}]
+
+
+class RemoteChild(Remote):
+    pass
+
+
+@pytest.fixture
+def profiler():
+    profiler = RemoteCallProfiler()
+    profiler.patch(RemoteChild, 'execute', 'ssh')
+    profiler.patch(Remote, 'execute', 'ssh')
+    profiler.patch(Remote, 'hammer', 'hammer')
+    yield profiler
+    profiler.uninstall()
+
+
+def test_result_size():
+    assert result_size('abc') == 3
+    assert result_size(SimpleNamespace(content=b'abcd')) == 4
+    assert result_size(SimpleNamespace(stdout='abc', stderr='de')) == 5
+    assert result_size([{'id': '1'}]) is None
+
+
+def test_calls_are_accounted_to_outermost_channel(profiler):
+    RemoteChild().execute('1234')
+    Remote.hammer('123456')
+    stats = profiler.reset()
+    assert stats['ssh']['count'] == 1
+    assert stats['ssh']['bytes'] == 7
+    assert stats['hammer']['count'] == 1
+    # the size of the nested SSH call is used when the hammer result size is unknown
+    assert stats['hammer']['bytes'] == 9
+    assert profiler.reset() == {}
+
+
+def test_uninstall_restores_functions(profiler):
+    profiler.uninstall()
+    assert 'execute' not in vars(RemoteChild)
+    assert Remote.execute.__qualname__ == 'Remote.execute'
+    assert isinstance(vars(Remote)['hammer'], classmethod)
+    Remote.hammer('1')
+    assert profiler.reset() == {}
+
+
+def test_stats_to_properties():
+    stats = {'rest': {'count': 2, 'time': 1.23456, 'bytes': 100}}
+    assert stats_to_properties(stats) == [
+        ('remote_rest_count', 2),
+        ('remote_rest_time', 1.235),
+        ('remote_rest_bytes', 100),
+    ]
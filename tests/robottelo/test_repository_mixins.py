@@ -0,0 +1,100 @@
+"""Tests for module ``robottelo.host_helpers.repository_mixins``."""
+
+from unittest import mock
+
+from box import Box
+import pytest
+
+from robottelo.exceptions import RepositorySyncError
+from robottelo.host_helpers.repository_mixins import initiate_repo_helpers
+
+
+@pytest.fixture
+def satellite():
+    satellite = mock.MagicMock()
+    calls = []
+    repo_ids = iter(range(1, 10))
+
+    def make_repository(options):
+        calls.append(('create', options['url']))
+        return {'id': str(next(repo_ids)), 'red-hat-repository': 'no'}
+
+    def synchronize(options, **kwargs):
+        calls.append(('synchronize', options['id'], options.get('async', False)))
+        return [{'id': f'task-{options["id"]}'}]
+
+    def wait_for_task_ids(task_ids, **kwargs):
+        calls.append(('wait', list(task_ids)))
+        return {
+            task_id: mock.Mock(
+                id=task_id,
+                result='warning' if task_id == 'task-2' else 'success',
+                humanized={'errors': ['404 Not Found']},
+            )
+            for task_id in task_ids
+        }
+
+    satellite.cli_factory.make_product_wait.return_value = Box(id='10', organization='org')
+    satellite.cli_factory.make_repository.side_effect = make_repository
+    satellite.cli.Repository.synchronize.side_effect = synchronize
+    satellite.wait_for_task_ids.side_effect = wait_for_task_ids
+    satellite.calls = calls
+    return satellite
+
+
+def collection(satellite, *urls):
+    helpers = dict(initiate_repo_helpers(satellite))
+    return helpers['RepositoryCollection'](
+        repositories=[helpers['YumRepository'](url=url) for url in urls]
+    )
+
+
+def test_setup_synchronizes_concurrently(satellite):
+    repos = collection(satellite, 'http://repo1', 'http://repo3')
+    satellite.wait_for_task_ids.side_effect = lambda task_ids, **kwargs: {
+        task_id: mock.Mock(id=task_id, result='success') for task_id in task_ids
+    }
+    product, repos_info = repos.setup('1')
+    assert product.id == '10'
+    assert [repo_info['id'] for repo_info in repos_info] == ['1', '2']
+    assert satellite.calls == [
+        ('create', 'http://repo1'),
+        ('create', 'http://repo3'),
+        ('synchronize', '1', True),
+        ('synchronize', '2', True),
+    ]
+    satellite.wait_for_task_ids.assert_called_once()
+
+
+def test_setup_reports_failed_repositories(satellite):
+    repos = collection(satellite, 'http://repo1', 'http://repo2', 'http://repo3')
+    with pytest.raises(RepositorySyncError) as err:
+        repos.setup('1')
+    (failed_repo,) = err.value.failures
+    assert failed_repo.url == 'http://repo2'
+    assert err.value.failures[failed_repo] == 'task task-2 warning: 404 Not Found'
+    assert satellite.calls[-1] == ('wait', ['task-1', 'task-2', 'task-3'])
+
+
+def test_setup_reports_paused_repositories(satellite):
+    repos = collection(satellite, 'http://repo1', 'http://repo2')
+    satellite.wait_for_task_ids.side_effect = lambda task_ids, **kwargs: {
+        task_id: mock.Mock(
+            id=task_id,
+            state='paused' if task_id == 'task-1' else 'stopped',
+            result='pending' if task_id == 'task-1' else 'success',
+            humanized={'errors': []},
+        )
+        for task_id in task_ids
+    }
+    with pytest.raises(RepositorySyncError) as err:
+        repos.setup('1')
+    assert [(repo.url, failure) for repo, failure in err.value.failures.items()] == [
+        ('http://repo1', 'task task-1 paused')
+    ]
+
+
+def test_setup_without_synchronize(satellite):
+    repos = collection(satellite, 'http://repo1')
+    repos.setup('1', synchronize=False)
+    assert satellite.calls == [('create', 'http://repo1')]
@@ -0,0 +1,67 @@
+"""Tests for the load-aware Satellite alignment of xdist workers"""
+
+import pytest
+
+from robottelo.utils.satellite_load import SatelliteLoadBalancer
+from robottelo.utils.shared_state import SharedState
+
+HOSTNAMES = ['sat1.example.com', 'sat2.example.com', 'sat3.example.com']
+
+
+def probe_results(results):
+    """Return a probe function answering with the given results per hostname"""
+
+    def probe(hostname):
+        return {'probed_at': 1e12, **results.get(hostname, {})}
+
+    return probe
+
+
+@pytest.fixture
+def state(tmp_path):
+    return SharedState('satellite_load', state_dir=tmp_path)
+
+
+def test_workers_are_spread_across_satellites(state):
+    balancer = SatelliteLoadBalancer(HOSTNAMES, state=state, probe=probe_results({}))
+    assigned = [balancer.assign(f'gw{pos}') for pos in range(6)]
+    assert assigned == HOSTNAMES * 2
+
+
+def test_busy_satellite_is_avoided(state):
+    probe = probe_results(
+        {
+            'sat1.example.com': {'running_tasks': 50, 'latency': 0.1},
+            'sat2.example.com': {'running_tasks': 0, 'latency': 5},
+            'sat3.example.com': {'running_tasks': 0, 'latency': 0.2},
+        }
+    )
+    balancer = SatelliteLoadBalancer(HOSTNAMES, state=state, probe=probe)
+    assert balancer.assign('gw0') == 'sat3.example.com'
+
+
+def test_in_flight_tests_and_rebalance(state):
+    balancer = SatelliteLoadBalancer(HOSTNAMES[:2], state=state, probe=probe_results({}))
+    assert balancer.assign('gw0') == 'sat1.example.com'
+    assert balancer.assign('gw1') == 'sat2.example.com'
+    assert balancer.assign('gw2') == 'sat1.example.com'
+    balancer.test_started('gw1')
+    # gw2 is not counted against its own Satellite when it is rebalanced
+    assert balancer.assign('gw2') == 'sat1.example.com'
+    balancer.test_finished('gw1')
+    balancer.release('gw0')
+    assert balancer.assign('gw2') == 'sat1.example.com'
+    assert set(state.read()['workers']) == {'gw1', 'gw2'}
+
+
+def test_probes_are_cached(state):
+    calls = []
+
+    def probe(hostname):
+        calls.append(hostname)
+        return {'latency': 0.1, 'running_tasks': 0, 'probed_at': 1e12}
+
+    balancer = SatelliteLoadBalancer(HOSTNAMES, state=state, probe=probe)
+    balancer.assign('gw0')
+    balancer.assign('gw1')
+    assert calls == HOSTNAMES
@@ -0,0 +1,56 @@
+"""Tests for module ``robottelo.host_helpers.satellite_mixins``."""
+
+import hashlib
+import subprocess
+from types import SimpleNamespace
+
+import pytest
+
+from robottelo.host_helpers.satellite_mixins import ContentInfo
+
+
+class LocalContent(ContentInfo):
+    """Run the commands locally instead of on a Satellite"""
+
+    def __init__(self):
+        self.commands = []
+
+    def execute(self, command):
+        self.commands.append(command)
+        result = subprocess.run(command, shell=True, capture_output=True, text=True)
+        return SimpleNamespace(status=result.returncode, stdout=result.stdout, stderr=result.stderr)
+
+
+@pytest.fixture
+def files(tmp_path):
+    files = {}
+    for name, content in [('a.rpm', b'a' * 3000000), ('b.rpm', b'b')]:
+        (tmp_path / name).write_bytes(content)
+        files[(tmp_path / name).as_uri()] = content
+    return files
+
+
+def test_checksums_by_url(files):
+    content = LocalContent()
+    checksums = content.checksums_by_url(list(files), sum_types=['md5sum', 'sha256sum'])
+    assert checksums == {
+        url: {
+            'md5sum': hashlib.md5(data).hexdigest(),
+            'sha256sum': hashlib.sha256(data).hexdigest(),
+        }
+        for url, data in files.items()
+    }
+    # all the files are checksummed in a single command
+    assert len(content.commands) == 1
+    url, data = next(iter(files.items()))
+    assert content.checksum_by_url(url, sum_type='sha512sum') == hashlib.sha512(data).hexdigest()
+
+
+def test_checksums_by_url_failure(files, tmp_path):
+    content = LocalContent()
+    missing = (tmp_path / 'missing.rpm').as_uri()
+    with pytest.raises(AssertionError, match='missing.rpm'):
+        content.checksums_by_url([*files, missing])
+    with pytest.raises(AssertionError, match='Failed to calculate'):
+        content.checksums_by_url(list(files), sum_types=['nosuchsum'])
+    assert content.checksums_by_url([]) == {}
@@ -0,0 +1,139 @@
+"""Tests for the local Satellite simulator of ``robottelo.utils.satellite_simulator``."""
+
+from pathlib import Path
+import time
+
+import pytest
+import requests
+
+from robottelo import ssh
+from robottelo.cli import hammer
+from robottelo.cli.base import CLIReturnCodeError
+from robottelo.cli.capsule import Capsule
+from robottelo.cli.location import Location
+from robottelo.cli.org import Org
+from robottelo.utils.satellite_simulator import (
+    SIMULATOR_HOSTNAME,
+    SatelliteSimulator,
+    render_csv,
+    render_info,
+    render_json,
+)
+
+FIXTURES = Path(__file__).parent / 'data' / 'satellite_simulator.yaml'
+# attributes of the cli classes sent to the simulator, other tests may change them on Base
+SIMULATED = {'hostname': SIMULATOR_HOSTNAME, 'command_requires_org': False}
+
+
+@pytest.fixture
+def simulator():
+    simulator = SatelliteSimulator(fixtures=FIXTURES)
+    with simulator.patch():
+        yield simulator
+
+
+@pytest.fixture
+def sim_org():
+    return type('Org', (Org,), SIMULATED)
+
+
+def test_render_parse_round_trip():
+    records = [{'Id': '1', 'Name': 'a, b'}, {'Id': '2', 'Name': 'c "d"'}]
+    assert hammer.parse_csv(render_csv(records)) == [
+        {'id': '1', 'name': 'a, b'},
+        {'id': '2', 'name': 'c "d"'},
+    ]
+    assert hammer.parse_json(render_json(records)) == [
+        {'id': '1', 'name': 'a, b'},
+        {'id': '2', 'name': 'c "d"'},
+    ]
+    info = {
+        'Id': 1,
+        'Name': 'org',
+        'Locations': ['loc1', 'loc2'],
+        'Content view': {'Id': 5, 'Name': 'cv'},
+        'Repositories': [{'Id': 7, 'Name': 'repo1'}, {'Id': 8, 'Name': 'repo2'}],
+    }
+    assert hammer.parse_info(render_info(info)) == {
+        'id': '1',
+        'name': 'org',
+        'locations': ['loc1', 'loc2'],
+        'content-view': {'id': '5', 'name': 'cv'},
+        'repositories': [{'id': '7', 'name': 'repo1'}, {'id': '8', 'name': 'repo2'}],
+    }
+
+
+def test_parse_hammer():
+    words, options, output_format = SatelliteSimulator.parse_hammer(
+        'LANG=en_US.UTF-8 time -p hammer -v -u admin -p changeme --output=csv '
+        'content-view version list --organization-id="3" --search="name = \\"cv\\"" --full extra'
+    )
+    assert words == ['content-view', 'version', 'list']
+    assert options == {'organization-id': '3', 'search': 'name = "cv"', 'full': True}
+    assert output_format == 'csv'
+
+
+def test_recorded_hammer_commands(simulator, sim_org):
+    orgs = sim_org.list()
+    assert [org['name'] for org in orgs] == ['Default Organization', 'ACME']
+    info = sim_org.info({'id': 1})
+    assert info['label'] == 'Default_Organization'
+    assert info['locations'] == ['Default Location']
+    assert info['compute-resources'] == [
+        {'id': '2', 'name': 'libvirt'},
+        {'id': '4', 'name': 'vmware'},
+    ]
+    assert sim_org.info({'id': 1}, output_format='json')['title'] == 'Default Organization'
+    capsule = type('Capsule', (Capsule,), SIMULATED)
+    with pytest.raises(CLIReturnCodeError) as err:
+        capsule.refresh_features({'id': 1})
+    assert err.value.status == 70
+    assert simulator.calls['hammer organization list'] == 1
+
+
+def test_stored_hammer_entities(simulator, sim_org):
+    org = sim_org.create({'name': 'simulated', 'description': 'an org'})
+    assert org['name'] == 'simulated'
+    assert org['description'] == 'an org'
+    sim_org.update({'id': org['id'], 'description': 'updated'})
+    assert sim_org.info({'id': org['id']})['description'] == 'updated'
+    assert [org['name'] for org in sim_org.list()][-1] == 'simulated'
+    sim_org.delete({'id': org['id']})
+    assert org['id'] not in [org['id'] for org in sim_org.list()]
+    location = type('Location', (Location,), SIMULATED)
+    with pytest.raises(CLIReturnCodeError) as err:
+        location.info({'id': org['id']})
+    assert err.value.status == 65
+
+
+def test_simulated_commands(simulator):
+    result = ssh.command('rpm -q satellite', hostname=SIMULATOR_HOSTNAME)
+    assert result.status == 0
+    assert result.stdout == 'satellite-6.17.0-1.el9sat.noarch\n'
+    assert ssh.command('unknown', hostname=SIMULATOR_HOSTNAME).status == 127
+
+
+def test_simulated_rest_api(simulator):
+    url = f'https://{SIMULATOR_HOSTNAME}'
+    assert requests.get(f'{url}/api/v2/status').json()['version'] == '3.14.0'
+    response = requests.post(
+        f'{url}/katello/api/v2/organizations', json={'organization': {'name': 'org1'}}
+    )
+    assert response.status_code == 201
+    org_id = response.json()['id']
+    requests.put(f'{url}/api/v2/organizations/{org_id}', json={'organization': {'label': 'l1'}})
+    assert requests.get(f'{url}/api/v2/organizations/{org_id}').json()['label'] == 'l1'
+    search = requests.get(f'{url}/api/v2/organizations', params={'search': 'name="org1"'})
+    assert [org['id'] for org in search.json()['results']] == [org_id]
+    requests.delete(f'{url}/api/v2/organizations/{org_id}')
+    assert requests.get(f'{url}/api/v2/organizations/{org_id}').status_code == 404
+
+
+def test_injected_latency(sim_org):
+    simulator = SatelliteSimulator(fixtures=FIXTURES, latency=0.01, jitter=0.01, seed=42)
+    with simulator.patch():
+        start = time.monotonic()
+        for _ in range(5):
+            sim_org.list()
+        requests.get(f'https://{SIMULATOR_HOSTNAME}/api/v2/ping')
+    assert time.monotonic() - start >= 0.06
@@ -0,0 +1,53 @@
+"""Tests for the settings snapshot shared with the xdist workers"""
+
+import pickle
+
+import pytest
+
+from robottelo.config import SETTINGS_SNAPSHOT_ENV, get_settings, settings
+
+
+@pytest.fixture
+def snapshot(tmp_path, monkeypatch):
+    path = tmp_path / 'settings_snapshot.pickle'
+    settings.write_snapshot(path)
+    monkeypatch.setenv(SETTINGS_SNAPSHOT_ENV, str(path))
+    monkeypatch.setenv('PYTEST_XDIST_WORKER', 'gw1')
+    return path
+
+
+def test_worker_loads_snapshot(snapshot):
+    worker_settings = get_settings(lazy=True)
+    assert worker_settings.as_dict() == settings.as_dict()
+    # no settings file was loaded, and validators are still available
+    assert not worker_settings._loaded_files
+    assert worker_settings.validators
+
+
+def test_worker_override(snapshot):
+    worker_settings = get_settings(lazy=True)
+    worker_settings.set('server.hostname', 'worker.example.com')
+    assert worker_settings.server.hostname == 'worker.example.com'
+    assert settings.server.get('hostname') != 'worker.example.com'
+
+
+def test_controller_ignores_snapshot(snapshot, monkeypatch):
+    monkeypatch.delenv('PYTEST_XDIST_WORKER')
+    assert get_settings(lazy=True)._loaded_files
+
+
+@pytest.mark.parametrize(
+    'content',
+    [
+        b'not a pickle',
+        # truncated
+        pickle.dumps({'server': {}})[:2],
+        # a class robottelo does not define anymore
+        b'crobottelo.config\nMissingSettings\n.',
+        b'cmissing_module\nMissingSettings\n.',
+    ],
+    ids=['garbage', 'truncated', 'missing_class', 'missing_module'],
+)
+def test_invalid_snapshot(snapshot, content):
+    snapshot.write_bytes(content)
+    assert get_settings(lazy=True)._loaded_files
@@ -0,0 +1,170 @@
+"""Tests for the UI session pool of ``robottelo.utils.ui_session_pool``."""
+
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+from box import Box
+import pytest
+
+from pytest_fixtures.core.ui import _ui_session
+from pytest_plugins.ui_session_pool import pytest_runtest_makereport
+from robottelo.utils import ui_session_pool
+from robottelo.utils.shared_state import SharedState
+
+
+class FakeSelenium:
+    def __init__(self, fail=False):
+        self.calls = []
+        self.fail = fail
+
+    def execute_script(self, script):
+        if self.fail:
+            raise RuntimeError('browser is gone')
+        self.calls.append(('script', script))
+
+    def get(self, url):
+        self.calls.append(('get', url))
+
+
+class FakeSatellite:
+    def __init__(self, hostname='sat.example.com'):
+        self.hostname = hostname
+        self.url = f'https://{hostname}'
+        self.started = []
+        self.closed = []
+        user = SimpleNamespace(default_organization=SimpleNamespace(id=1), default_location=None)
+        self.api = SimpleNamespace(
+            User=lambda: SimpleNamespace(search=lambda query: [user]),
+        )
+
+    @contextmanager
+    def _start_ui_session(self, testname=None, user=None, password=None):
+        session = SimpleNamespace(
+            name=testname, user=user, browser=SimpleNamespace(selenium=FakeSelenium())
+        )
+        self.started.append(session)
+        try:
+            yield session
+        except Exception as err:
+            self.closed.append((session, err))
+            raise
+        self.closed.append((session, None))
+
+
+@pytest.fixture
+def settings(monkeypatch):
+    settings = Box(ui={'record_video': False, 'session_pool': {'enabled': True, 'max_uses': 2}})
+    monkeypatch.setattr(ui_session_pool, 'settings', settings)
+    return settings
+
+
+@pytest.fixture
+def report_state(monkeypatch, tmp_path):
+    state = SharedState('ui_session_pool', state_dir=tmp_path)
+    monkeypatch.setattr(ui_session_pool, 'get_report_state', lambda: state)
+    return state
+
+
+def test_reuse_and_recycle(settings):
+    satellite = FakeSatellite()
+    pool = ui_session_pool.UISessionPool()
+    sessions = []
+    for testname in ['test_1', 'test_2', 'test_3']:
+        with pool.lease(satellite, testname, 'admin', 'changeme') as session:
+            sessions.append(session)
+            assert session.name == testname
+    # the session is reset between the tests, to the default organization and any location of
+    # the user, and closed after max_uses tests
+    assert sessions[0] is sessions[1] is not sessions[2]
+    assert sessions[0].browser.selenium.calls == [
+        ('script', ui_session_pool.RESET_SCRIPT),
+        ('get', 'https://sat.example.com/organizations/1/select'),
+        ('get', 'https://sat.example.com/locations/clear'),
+        ('get', 'https://sat.example.com/'),
+    ]
+    assert satellite.closed == [(sessions[0], None)]
+    # another user gets its own session
+    with pool.lease(satellite, 'test_4', 'viewer', 'changeme') as session:
+        assert session is not sessions[2]
+    pool.close()
+    assert len(satellite.closed) == 3
+    assert pool.report()['reuses'] == 1
+
+
+def test_closed_on_error(settings):
+    satellite = FakeSatellite()
+    pool = ui_session_pool.UISessionPool()
+    error = ValueError('test failed')
+    with (
+        pytest.raises(ValueError, match='test failed'),
+        pool.lease(satellite, 'test_1', 'admin', 'changeme') as session,
+    ):
+        raise error
+    # the session is closed with the error, for airgun to take a screenshot
+    assert satellite.closed == [(session, error)]
+    assert not pool.available
+    # a session that can not be reset is not reused
+    with pool.lease(satellite, 'test_2', 'admin', 'changeme') as session:
+        session.browser.selenium.fail = True
+    assert not pool.available
+    assert pool.report()['recycled'] == 2
+
+
+def make_report(item, when, failed):
+    """Run the report hook of the plugin on a test phase"""
+    hook = pytest_runtest_makereport(item, None)
+    next(hook)
+    with pytest.raises(StopIteration):
+        hook.send(SimpleNamespace(get_result=lambda: SimpleNamespace(when=when, failed=failed)))
+
+
+def test_discard_failed_fixture_session(settings, monkeypatch):
+    satellite = FakeSatellite()
+    pool = ui_session_pool.UISessionPool(max_uses=5)
+    monkeypatch.setitem(ui_session_pool._active, 'pool', pool)
+    satellite.ui_session = lambda testname, user, password: pool.lease(
+        satellite, testname, user, password
+    )
+    ui_user = SimpleNamespace(login='admin', password='changeme')
+    sessions = []
+    for testname, failed in [('test_1', False), ('test_2', True), ('test_3', False)]:
+        item = SimpleNamespace(stash=pytest.Stash())
+        fixture = _ui_session(SimpleNamespace(node=item), satellite, testname, ui_user)
+        sessions.append(next(fixture))
+        # pytest reports the test call, then resumes the fixture without the test exception
+        make_report(item, 'setup', False)
+        make_report(item, 'call', failed)
+        with pytest.raises(StopIteration):
+            next(fixture)
+    # the session of the failed test is closed instead of being reused by the next test
+    assert sessions[0] is sessions[1] is not sessions[2]
+    assert satellite.closed == [(sessions[1], None)]
+    assert pool.report()['recycled'] == 1
+    assert pool.available['sat.example.com', 'admin'].session is sessions[2]
+
+
+def test_activate(settings, report_state):
+    satellite = FakeSatellite()
+    with ui_session_pool.activate_ui_session_pool('tests.foreman.ui.test_org') as pool:
+        assert ui_session_pool.get_ui_session_pool() is pool
+        for testname in ['test_1', 'test_2']:
+            with pool.lease(satellite, testname, 'admin', 'changeme'):
+                pass
+    assert ui_session_pool.get_ui_session_pool() is None
+    assert len(satellite.closed) == 1
+    report = report_state.read()['tests.foreman.ui.test_org']
+    assert report['leases'] == 2
+    assert report['reuses'] == 1
+    assert report['saved_time'] == report['startup_time']
+
+
+@pytest.mark.parametrize('setting', ['enabled', 'record_video'])
+def test_disabled(settings, report_state, setting):
+    if setting == 'enabled':
+        settings.ui.session_pool.enabled = False
+    else:
+        settings.ui.record_video = True
+    with ui_session_pool.activate_ui_session_pool('tests.foreman.ui.test_org') as pool:
+        assert pool is None
+        assert ui_session_pool.get_ui_session_pool() is None
+    assert report_state.read() == {}
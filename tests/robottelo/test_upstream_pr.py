@@ -0,0 +1,87 @@
+"""Tests for the upstream_pr pytest plugin"""
+
+from types import SimpleNamespace
+
+from box import Box
+import pytest
+
+from pytest_plugins.upstream_pr import RuleMatcher, compile_rules, fetch_pr_files
+
+REPO_CONFIG = Box(org='theforeman', repo='foreman')
+
+
+class FakeGithub:
+    """Answer the PR requests with pages of files, and count the listings"""
+
+    def __init__(self, filenames, sha='abc123'):
+        self.filenames = filenames
+        self.sha = sha
+        self.listings = 0
+
+    def get_repo(self, full_name, lazy=False):
+        assert full_name == 'theforeman/foreman'
+        return self
+
+    def get_pull(self, pr_id):
+        def get_files():
+            self.listings += 1
+            return (SimpleNamespace(filename=filename) for filename in self.filenames)
+
+        return SimpleNamespace(
+            state='open',
+            head=SimpleNamespace(sha=self.sha),
+            changed_files=len(self.filenames),
+            get_files=get_files,
+        )
+
+
+def test_rule_matcher():
+    rules = [
+        Box(path='app/(controllers|models)/hosts', component='Hosts'),
+        Box(path='^app/', component='Foreman'),
+        Box(path='[', component='Invalid'),
+        Box(path='lib/'),
+    ]
+    matcher = RuleMatcher('foreman', rules)
+    # the first matching rule wins
+    assert matcher.match('app/models/hosts/base.rb') == 'Hosts'
+    assert matcher.match('App/Views/hosts.erb') == 'Foreman'
+    components, unmatched = matcher.map(['app/controllers/hosts.rb', 'lib/app/x.rb', 'README'])
+    assert components == {'hosts'}
+    assert unmatched == {'lib/app/x.rb', 'README'}
+    assert compile_rules('foreman', rules) is compile_rules('foreman', rules)
+    assert RuleMatcher('foreman', []).map(['README']) == (set(), {'README'})
+
+
+@pytest.mark.parametrize(
+    ('lib_path', 'lib_files'),
+    [
+        # the same group name as the first rule
+        ('(?P<dir>lib)/', ['lib/x.rb']),
+        # a numbered backreference, shifted in the combined regex
+        ('(lib)/\\1/', ['lib/lib/x.rb']),
+    ],
+    ids=['group_names', 'backreference'],
+)
+def test_rule_matcher_one_by_one(lib_path, lib_files):
+    rules = [Box(path='(?P<dir>app)/hosts', component='Hosts'), Box(path=lib_path, component='Lib')]
+    matcher = RuleMatcher('foreman', rules)
+    assert matcher.regex is None
+    assert matcher.map(['app/hosts/base.rb', *lib_files, 'README']) == (
+        {'hosts', 'lib'},
+        {'README'},
+    )
+
+
+def test_fetch_pr_files_cached(tmp_path):
+    github = FakeGithub(['app/models/host.rb', 'README'])
+    for _ in range(2):
+        files = fetch_pr_files(github, 'foreman', REPO_CONFIG, 1234, cache_dir=tmp_path)
+        assert files == {'app/models/host.rb', 'README'}
+    assert github.listings == 1
+    assert (tmp_path / 'theforeman/foreman/1234-abc123.json').exists()
+    # a new commit in the PR invalidates the cache
+    github.sha = 'def456'
+    github.filenames = ['README']
+    assert fetch_pr_files(github, 'foreman', REPO_CONFIG, 1234, cache_dir=tmp_path) == {'README'}
+    assert github.listings == 2
@@ -0,0 +1,67 @@
+"""Tests for the video_cleanup pytest plugin"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from pytest_plugins import video_cleanup
+
+
+class FakeHost:
+    instances = []
+
+    def __init__(self, hostname):
+        self.hostname = hostname
+        self.commands = []
+        self.closed = False
+        FakeHost.instances.append(self)
+
+    def execute(self, command):
+        self.commands.append(command)
+        if FakeHost.fail:
+            FakeHost.fail -= 1
+            raise ConnectionError('connection reset')
+        return SimpleNamespace(status=0, stdout='', stderr='')
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture(autouse=True)
+def host(monkeypatch):
+    FakeHost.instances = []
+    FakeHost.fail = 0
+    monkeypatch.setattr(video_cleanup, 'Host', FakeHost)
+    monkeypatch.setattr(video_cleanup, 'CLEANUP_RETRY_DELAY', 0)
+
+
+def test_batched_cleanup():
+    cleanup = video_cleanup.VideoCleanup('grid.example.com', batch_size=2)
+    for session_id in ['s1', 's2', 's3', 's4']:
+        cleanup.add(session_id)
+    assert cleanup.close(timeout=10)
+    assert cleanup.cleaned == 4
+    assert cleanup.failed == []
+    # a single connection is used for all the batches
+    (host,) = FakeHost.instances
+    assert host.closed
+    commands = [command.split()[2:] for command in host.commands]
+    assert all(len(paths) <= 2 for paths in commands)
+    assert sorted(path for paths in commands for path in paths) == [
+        f'/var/www/html/videos/{session_id}' for session_id in ['s1', 's2', 's3', 's4']
+    ]
+
+
+def test_retries():
+    FakeHost.fail = 1
+    cleanup = video_cleanup.VideoCleanup('grid.example.com')
+    cleanup.add('s1')
+    assert cleanup.close(timeout=10)
+    assert cleanup.cleaned == 1
+    # the connection is reopened after a failure
+    assert len(FakeHost.instances) == 2
+    FakeHost.fail = video_cleanup.CLEANUP_RETRIES
+    cleanup = video_cleanup.VideoCleanup('grid.example.com')
+    cleanup.add('s2')
+    assert cleanup.close(timeout=10)
+    assert cleanup.failed == ['s2']
@@ -0,0 +1,49 @@
+"""Tests for module ``robottelo.utils.virtwho``."""
+
+import gzip
+import json
+from unittest import mock
+
+import pytest
+
+from robottelo.utils import virtwho
+
+
+@pytest.mark.parametrize(
+    ('fake', 'create'),
+    [(False, virtwho.hypervisor_json_create), (True, virtwho.hypervisor_fake_json_create)],
+)
+def test_hypervisor_json_stream(fake, create):
+    chunks = list(virtwho.hypervisor_json_stream(20, 5, seed=42, fake=fake, chunk_size=1024))
+    assert len(chunks) > 1
+    assert json.loads(b''.join(chunks)) == create(20, 5, seed=42)
+
+
+def test_hypervisor_json_stream_compress():
+    data = b''.join(virtwho.hypervisor_json_stream(10, 3, seed=1, compress=True))
+    assert json.loads(gzip.decompress(data)) == virtwho.hypervisor_json_create(10, 3, seed=1)
+
+
+def test_hypervisor_json_stream_empty():
+    assert json.loads(b''.join(virtwho.hypervisor_json_stream(0, 3))) == {'hypervisors': []}
+
+
+def test_hypervisor_records_seed():
+    first = virtwho.hypervisor_json_create(3, 2, seed=7)
+    assert first == virtwho.hypervisor_json_create(3, 2, seed=7)
+    assert first != virtwho.hypervisor_json_create(3, 2, seed=8)
+    guest_ids = [g['guestId'] for h in first['hypervisors'] for g in h['guestIds']]
+    assert len(set(guest_ids)) == 6
+    assert all(guest_id[14] == '4' for guest_id in guest_ids)
+
+
+def test_create_fake_hypervisor_content_stream():
+    with (
+        mock.patch.object(virtwho, 'settings'),
+        mock.patch.object(virtwho.requests, 'post') as post,
+    ):
+        post.return_value.status_code = 200
+        records = virtwho.create_fake_hypervisor_content('ACME', 4, 2, seed=3, stream=True)
+        body = b''.join(post.call_args.kwargs['data'])
+    assert post.call_args.args[0].endswith('/rhsm/hypervisors/ACME')
+    assert json.loads(body) == {'hypervisors': list(records)}
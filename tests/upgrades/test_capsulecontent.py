@@ -178,8 +178,8 @@ class TestCapsuleSync:
             assert pkg in sat_files, f'{pkg=} is not in the {repo=} on satellite'
             assert pkg in cap_files, f'{pkg=} is not in the {repo=} on capsule'
 
-        sat_files_md5 = [target_sat.checksum_by_url(url) for url in sat_files_urls]
-        cap_files_md5 = [target_sat.checksum_by_url(url) for url in cap_files_urls]
+        sat_files_md5 = list(target_sat.checksums_by_url(sat_files_urls).values())
+        cap_files_md5 = list(target_sat.checksums_by_url(cap_files_urls).values())
         assert sat_files_md5 == cap_files_md5, 'satellite and capsule rpm md5sums are differrent'
 
 
@@ -256,6 +256,6 @@ class TestCapsuleSyncNewRepo:
             assert pkg in sat_files, f'{pkg=} is not in the {repo=} on satellite'
             assert pkg in cap_files, f'{pkg=} is not in the {repo=} on capsule'
 
-        sat_files_md5 = [target_sat.checksum_by_url(url) for url in sat_files_urls]
-        cap_files_md5 = [target_sat.checksum_by_url(url) for url in cap_files_urls]
+        sat_files_md5 = list(target_sat.checksums_by_url(sat_files_urls).values())
+        cap_files_md5 = list(target_sat.checksums_by_url(cap_files_urls).values())
         assert sat_files_md5 == cap_files_md5, 'satellite and capsule rpm md5sums are differrent'